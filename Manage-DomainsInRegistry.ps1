@@ -1,79 +1,3 @@
-# Global variables to store user action history
-$global:userActionHistory = @()
-$global:undoStack = @()
-$global:redoStack = @()
-
-# Function to add an action to the user action history
-function Add-UserAction {
-    param (
-        [string]$action,
-        [string[]]$parameters,
-        [string]$result
-    )
-    $userAction = @{
-        Action = $action
-        Parameters = $parameters
-        Result = $result
-    }
-    $global:userActionHistory += $userAction
-}
-
-# Function to undo the last action
-function Undo-Action {
-    if ($userActionHistory.Count -gt 0) {
-        $lastAction = $userActionHistory[-1]
-        $action = $lastAction.Action
-        $parameters = $lastAction.Parameters
-
-        # Remove the last action from the history
-        $global:userActionHistory = $userActionHistory[0..($userActionHistory.Count - 2)]
-
-        # Add the action to the redo stack
-        $global:redoStack += $lastAction
-
-        # Undo the action
-        if ($action -eq "Add-DomainToRegistry") {
-            Remove-DomainFromRegistry -indexToRemove $parameters[0]
-        } elseif ($action -eq "Add-DomainsFromFileToRegistry") {
-            Remove-DomainsFromFileFromRegistry -filePath $parameters[0]
-        } elseif ($action -eq "Remove-DomainFromRegistry") {
-            Add-DomainToRegistry -domainToAdd $parameters[0]
-        }
-
-        Write-Output "Undo: $action"
-    } else {
-        Write-Output "No actions to undo."
-    }
-}
-
-# Function to redo the last undone action
-function Redo-Action {
-    if ($redoStack.Count -gt 0) {
-        $lastRedo = $global:redoStack[-1]
-        $action = $lastRedo.Action
-        $parameters = $lastRedo.Parameters
-
-        # Remove the last redo from the redo stack
-        $global:redoStack = $redoStack[0..($redoStack.Count - 2)]
-
-        # Add the redo action back to the user action history
-        $global:userActionHistory += $lastRedo
-
-        # Redo the action
-        if ($action -eq "Add-DomainToRegistry") {
-            Add-DomainToRegistry -domainToAdd $parameters[0]
-        } elseif ($action -eq "Add-DomainsFromFileToRegistry") {
-            Add-DomainsFromFileToRegistry -filePath $parameters[0]
-        } elseif ($action -eq "Remove-DomainFromRegistry") {
-            Remove-DomainFromRegistry -indexToRemove $parameters[0]
-        }
-
-        Write-Output "Redo: $action"
-    } else {
-        Write-Output "No actions to redo."
-    }
-}
-
 # Function to check if the registry path exists
 function Test-RegistryPath {
     $path = "HKLM:\SOFTWARE\Policies\BraveSoftware\Brave\URLBlocklist"
@@ -288,6 +212,108 @@ function Remove-DomainsFromFileFromRegistry {
     }
 }
 
+# Function to add a batch of domains listed one per line in a file, reading the registry once
+function Add-DomainsBatchToRegistry {
+    param (
+        [string]$listPath
+    )
+
+    if (-not ([Security.Principal.WindowsPrincipal][Security.Principal.WindowsIdentity]::GetCurrent()).IsInRole([Security.Principal.WindowsBuiltInRole]::Administrator)) {
+        Write-Output (@{ error = "This script needs to be run with administrative privileges to modify the registry. Please run the script as an administrator." } | ConvertTo-Json -Compress)
+        return
+    }
+
+    try {
+        $key = [Microsoft.Win32.Registry]::LocalMachine.CreateSubKey("SOFTWARE\Policies\BraveSoftware\Brave\URLBlocklist")
+        $existingValues = New-Object 'System.Collections.Generic.HashSet[string]' ([StringComparer]::OrdinalIgnoreCase)
+        $usedNames = New-Object 'System.Collections.Generic.HashSet[int]'
+        foreach ($name in $key.GetValueNames()) {
+            [void]$existingValues.Add([string]$key.GetValue($name))
+            if ($name -match '^\d+$') {
+                [void]$usedNames.Add([int]$name)
+            }
+        }
+
+        $added = New-Object 'System.Collections.Generic.List[string]'
+        $skipped = New-Object 'System.Collections.Generic.List[string]'
+        $nextName = 1
+        foreach ($line in [System.IO.File]::ReadAllLines($listPath)) {
+            $domain = $line.Trim()
+            if (-not $domain) {
+                continue
+            }
+            if (-not $existingValues.Add($domain)) {
+                $skipped.Add($domain)
+                continue
+            }
+            while ($usedNames.Contains($nextName)) {
+                $nextName++
+            }
+            $key.SetValue($nextName.ToString(), $domain, [Microsoft.Win32.RegistryValueKind]::String)
+            [void]$usedNames.Add($nextName)
+            $added.Add($domain)
+        }
+        $key.Close()
+
+        Write-Output (@{ added = @($added); skipped = @($skipped) } | ConvertTo-Json -Compress)
+    } catch {
+        Write-Output (@{ error = "Failed to add domains to the registry: $_" } | ConvertTo-Json -Compress)
+    }
+}
+
+# Function to remove a batch of domains listed one per line in a file, reading the registry once
+function Remove-DomainsBatchFromRegistry {
+    param (
+        [string]$listPath
+    )
+
+    if (-not ([Security.Principal.WindowsPrincipal][Security.Principal.WindowsIdentity]::GetCurrent()).IsInRole([Security.Principal.WindowsBuiltInRole]::Administrator)) {
+        Write-Output (@{ error = "This script needs to be run with administrative privileges to modify the registry. Please run the script as an administrator." } | ConvertTo-Json -Compress)
+        return
+    }
+
+    try {
+        $removed = New-Object 'System.Collections.Generic.List[string]'
+        $missing = New-Object 'System.Collections.Generic.List[string]'
+        $key = [Microsoft.Win32.Registry]::LocalMachine.OpenSubKey("SOFTWARE\Policies\BraveSoftware\Brave\URLBlocklist", $true)
+
+        # Map each domain to the value names holding it (case-insensitive, duplicates included)
+        $namesByValue = New-Object 'System.Collections.Generic.Dictionary[string,System.Collections.Generic.List[string]]' ([StringComparer]::OrdinalIgnoreCase)
+        if ($key) {
+            foreach ($name in $key.GetValueNames()) {
+                $value = [string]$key.GetValue($name)
+                if (-not $namesByValue.ContainsKey($value)) {
+                    $namesByValue[$value] = New-Object 'System.Collections.Generic.List[string]'
+                }
+                $namesByValue[$value].Add($name)
+            }
+        }
+
+        foreach ($line in [System.IO.File]::ReadAllLines($listPath)) {
+            $domain = $line.Trim()
+            if (-not $domain) {
+                continue
+            }
+            if ($namesByValue.ContainsKey($domain)) {
+                foreach ($name in $namesByValue[$domain]) {
+                    $key.DeleteValue($name)
+                }
+                [void]$namesByValue.Remove($domain)
+                $removed.Add($domain)
+            } else {
+                $missing.Add($domain)
+            }
+        }
+        if ($key) {
+            $key.Close()
+        }
+
+        Write-Output (@{ removed = @($removed); missing = @($missing) } | ConvertTo-Json -Compress)
+    } catch {
+        Write-Output (@{ error = "Failed to remove domains from the registry: $_" } | ConvertTo-Json -Compress)
+    }
+}
+
 # Function to check if Brave is installed
 function Test-BraveInstallation {
     $braveRegistryPath = "HKLM:\SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"
@@ -343,7 +369,17 @@ switch ($action) {
         $filePath = $args[1]
         Remove-DomainsFromFileFromRegistry $filePath
     }
+    "8" {
+        # Add a batch of domains (one per line in the given file) to the registry
+        $listPath = $args[1]
+        Add-DomainsBatchToRegistry $listPath
+    }
+    "9" {
+        # Remove a batch of domains (one per line in the given file) from the registry
+        $listPath = $args[1]
+        Remove-DomainsBatchFromRegistry $listPath
+    }
     default {
-        return "Invalid action parameter. Please provide a valid action: 1 (Fetch), 2 (Add), 3 (Remove), 4 (Check Brave installation), or 5 (Check registry path)."
+        return "Invalid action parameter. Please provide a valid action: 1 (Fetch), 2 (Add), 3 (Remove), 4 (Check Brave installation), or 5 (Check registry path), 6/7 (Add/Remove from file), or 8/9 (Add/Remove batch)."
     }
 }
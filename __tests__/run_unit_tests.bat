@@ -5,5 +5,28 @@ python -m unittest test_domain_manager_gui_part1.py
 python -m unittest test_domain_manager_gui_part2.py
 python -m unittest test_domain_manager_gui_part3.py
 python -m unittest test_domain_manager_gui_part4.py
+python -m unittest test_domain_manager_gui_part5.py
+python -m unittest test_domain_manager_gui_part6.py
+python -m unittest test_domain_manager_gui_part7.py
+python -m unittest test_domain_manager_gui_part8.py
+python -m unittest test_domain_manager_gui_part9.py
+python -m unittest test_domain_manager_gui_part10.py
+python -m unittest test_domain_manager_gui_part11.py
+python -m unittest test_domain_manager_gui_part12.py
+python -m unittest test_domain_manager_gui_part13.py
+python -m unittest test_domain_manager_gui_part14.py
+python -m unittest test_domain_manager_gui_part15.py
+python -m unittest test_domain_manager_gui_part16.py
+python -m unittest test_domain_manager_gui_part17.py
+python -m unittest test_domain_manager_gui_part18.py
+python -m unittest test_domain_manager_gui_part19.py
+python -m unittest test_domain_manager_gui_part20.py
+python -m unittest test_domain_manager_gui_part21.py
+python -m unittest test_domain_manager_gui_part22.py
+python -m unittest test_domain_manager_gui_part23.py
+python -m unittest test_domain_manager_gui_part24.py
+python -m unittest test_domain_manager_gui_part25.py
+python -m unittest test_domain_manager_gui_part26.py
+python -m unittest test_domain_manager_gui_part27.py
 echo All tests completed.
 pause
@@ -9,6 +9,7 @@ This test suite covers the initialization of the DomainManagerGUI and basic func
 import unittest
 import sys
 import os
+import tempfile
 from unittest.mock import patch
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtTest import QTest
@@ -26,6 +27,15 @@ class TestDomainManagerGUIInitialization(unittest.TestCase):
         cls.app = QApplication(sys.argv)
 
     def setUp(self):
+        # A config with both prompts switched off, so no modal dialog blocks the suite on a fresh checkout
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        config_file = os.path.join(temp_dir.name, 'config.ini')
+        with open(config_file, 'w') as file:
+            file.write("[Theme]\nshow_prompt = False\n\n[Logging]\nshow_prompt = False\n")
+        config_patch = patch.object(domain_manager_gui, 'CONFIG_FILE', config_file)
+        config_patch.start()
+        self.addCleanup(config_patch.stop)
         self.gui = domain_manager_gui.DomainManagerGUI()
 
     def tearDown(self):
@@ -42,21 +52,30 @@ class TestDomainManagerGUIInitialization(unittest.TestCase):
             with patch.object(dm_functions, 'add_domain', return_value='Domain example.com added.') as mock_add:
                 QTest.keyClicks(self.gui.add_entry, 'example.com')
                 QTest.keyClick(self.gui.add_entry, Qt.Key_Return)
+                self.assertTrue(self.gui.backend_executor.wait_for_idle())
                 self.assertTrue(mock_clean.called)
                 self.assertTrue(mock_add.called)
+                self.gui.feedback_text.flush()
                 self.assertIn('Domain example.com added.', self.gui.feedback_text.toPlainText())
 
     def test_remove_domain_functionality(self):
         with patch.object(dm_functions, 'clean_domain', return_value='example.com'):
             with patch.object(dm_functions, 'add_domain', return_value='Domain example.com added.'):
-                QTest.keyClicks(self.gui.add_entry, 'example.com')
-                QTest.keyClick(self.gui.add_entry, Qt.Key_Return)
+                with patch.object(dm_functions, 'fetch_existing_domains', return_value=['example.com']):
+                    QTest.keyClicks(self.gui.add_entry, 'example.com')
+                    QTest.keyClick(self.gui.add_entry, Qt.Key_Return)
+                    self.assertTrue(self.gui.backend_executor.wait_for_idle())
 
         with patch.object(dm_functions, 'remove_domain', return_value='Domain example.com removed.') as mock_remove:
-            item = self.gui.existing_domains_list.findItems('example.com', Qt.MatchExactly)[0]
-            item.setSelected(True)
+            self.gui.show()
+            self.gui.activateWindow()
+            QTest.qWaitForWindowActive(self.gui)
+            self.gui.existing_domains_list.setFocus()
+            self.assertEqual(self.gui.existing_domains_list.select_domains(['example.com']), 1)
             QTest.keyClick(self.gui, Qt.Key_Delete)
+            self.assertTrue(self.gui.backend_executor.wait_for_idle())
             self.assertTrue(mock_remove.called)
+            self.gui.feedback_text.flush()
             self.assertIn('Domain example.com removed.', self.gui.feedback_text.toPlainText())
 
 if __name__ == '__main__':
@@ -0,0 +1,103 @@
+# test_domain_manager_gui_part10.py
+
+"""
+Test Suite Part 10: Command-Line Interface
+
+This test suite covers the headless CLI against the simulated registry: batched mutations, output formats, exit codes and the Qt-free import.
+"""
+
+import unittest
+import sys
+import os
+import io
+import json
+import subprocess
+import tempfile
+from unittest.mock import patch
+
+# Adjust the path to import domain_manager_cli
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import bulk_jobs
+import domain_manager_cli as cli
+import domain_manager_functions as dm_functions
+from simulated_registry import SIMULATED_REGISTRY_ENV
+
+class TestDomainManagerCLI(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry_path = os.path.join(self.temp_dir.name, 'registry.json')
+        self.patchers = [
+            patch.dict(os.environ, {SIMULATED_REGISTRY_ENV: self.registry_path}),
+            patch.object(dm_functions, 'JOURNAL_FILE', os.path.join(self.temp_dir.name, 'operations.journal')),
+            patch.object(dm_functions, 'CATALOG_FILE', os.path.join(self.temp_dir.name, 'domains.catalog')),
+            patch.object(cli, 'CONFIG_FILE', os.path.join(self.temp_dir.name, 'config.ini'))
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        dm_functions.close_catalog()
+        self.working_dir = os.getcwd()
+        os.chdir(self.temp_dir.name)  # Bulk jobs are written to jobs/ under the working directory
+
+    def tearDown(self):
+        os.chdir(self.working_dir)
+        dm_functions.close_journal()
+        dm_functions.close_catalog()
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.temp_dir.cleanup()
+
+    def run_cli(self, *argv, stdin=''):
+        stdout = io.StringIO()
+        exit_code = cli.main(list(argv), stdin=io.StringIO(stdin), stdout=stdout)
+        return exit_code, stdout.getvalue()
+
+    def test_add_from_stdin_is_one_batch_and_reports_invalid_lines(self):
+        with patch.object(dm_functions, 'execute_powershell_script', wraps=dm_functions.execute_powershell_script) as mock_execute:
+            exit_code, output = self.run_cli('add', 'c.com', '-', stdin="a.com\nnot a domain\nA.com\n\nb.com\n")
+        self.assertEqual(exit_code, cli.EXIT_INVALID_INPUT)
+        self.assertEqual(mock_execute.call_count, 1)
+        result = json.loads(output)
+        self.assertEqual(result['added'], ['c.com', 'a.com', 'b.com'])
+        self.assertEqual(result['invalid'], [{'source': '-', 'entry': 'not a domain'}])
+
+    def test_list_as_ndjson(self):
+        self.run_cli('add', 'a.com', 'b.com')
+        exit_code, output = self.run_cli('list', '--format', 'ndjson')
+        self.assertEqual(exit_code, cli.EXIT_OK)
+        self.assertEqual([json.loads(line) for line in output.splitlines()], [{'domain': 'a.com'}, {'domain': 'b.com'}])
+
+    def test_sync_dry_run_then_apply(self):
+        self.run_cli('add', 'a.com', 'b.com')
+        target_path = os.path.join(self.temp_dir.name, 'target.txt')
+        with open(target_path, 'w') as target_file:
+            target_file.write("b.com\nc.com\n")
+
+        exit_code, output = self.run_cli('sync', target_path, '--dry-run')
+        self.assertEqual(exit_code, cli.EXIT_OK)
+        self.assertEqual(json.loads(output)['removed'], ['a.com'])
+        self.assertEqual(json.loads(self.run_cli('list')[1])['domains'], ['a.com', 'b.com'])
+
+        with patch.object(bulk_jobs.BulkJob, 'checkpoint', autospec=True, side_effect=bulk_jobs.BulkJob.checkpoint) as mock_checkpoint:
+            exit_code, output = self.run_cli('sync', target_path)
+        self.assertEqual(exit_code, cli.EXIT_OK)
+        self.assertEqual((json.loads(output)['added'], json.loads(output)['removed']), (['c.com'], ['a.com']))
+        self.assertEqual(mock_checkpoint.call_count, 2)  # Applied as a job: one committed chunk per operation
+        self.assertEqual(bulk_jobs.find_unfinished_jobs(), [])
+        self.assertEqual(sorted(json.loads(self.run_cli('list')[1])['domains']), ['b.com', 'c.com'])
+
+    def test_backend_error_exit_code(self):
+        with patch.object(dm_functions, 'fetch_existing_domains', return_value="Error executing PowerShell script: denied"):
+            exit_code, output = self.run_cli('list')
+        self.assertEqual(exit_code, cli.EXIT_BACKEND_ERROR)
+        self.assertIn("denied", json.loads(output)['error'])
+
+    def test_cli_does_not_import_qt(self):
+        package_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        code = "import sys, domain_manager_cli; print(any(name.startswith('PyQt5') for name in sys.modules))"
+        clean_env = {key: value for key, value in os.environ.items() if key != 'PYTHONPATH'}  # Nothing preloaded by the runner
+        result = subprocess.run([sys.executable, '-c', code], cwd=package_dir, env=clean_env, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+if __name__ == '__main__':
+    unittest.main()
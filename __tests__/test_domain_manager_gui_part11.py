@@ -0,0 +1,157 @@
+# test_domain_manager_gui_part11.py
+
+"""
+Test Suite Part 11: Domain Service
+
+This test suite covers the local registry service against the simulated registry: merged write batches, the warm in-memory list, change notifications and routing of the backend functions through the service.
+"""
+
+import unittest
+import sys
+import os
+import json
+import socket
+import tempfile
+import threading
+from multiprocessing.connection import Client
+from unittest.mock import patch
+
+# Adjust the path to import domain_service
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import domain_manager_functions as dm_functions
+import domain_service
+from domain_service import DomainService, DomainServiceClient
+from simulated_registry import SIMULATED_REGISTRY_ENV
+
+class CreatesFile:
+    # Unpickling this would create the file, which is how a malicious client would run code in the service
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return (open, (self.path, 'w'))
+
+@unittest.skipIf(sys.platform == 'win32', "Uses a Unix socket; the named pipe transport is exercised on Windows by hand")
+class TestDomainService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry_path = os.path.join(self.temp_dir.name, 'registry.json')
+        self.key_file = os.path.join(self.temp_dir.name, 'service.key')
+        with open(self.registry_path, 'w') as registry_file:
+            json.dump({'1': 'existing.com'}, registry_file)
+        self.env_patcher = patch.dict(os.environ, {SIMULATED_REGISTRY_ENV: self.registry_path})
+        self.env_patcher.start()
+        self.catalog_patcher = patch.object(dm_functions, 'CATALOG_FILE', os.path.join(self.temp_dir.name, 'domains.catalog'))
+        self.catalog_patcher.start()
+        dm_functions.close_catalog()
+
+        self.service = DomainService(
+            os.path.join(self.temp_dir.name, 'service.sock'), self.key_file, os.path.join(self.temp_dir.name, 'service.journal')
+        )
+        self.service.start()
+        self.clients = []
+
+    def tearDown(self):
+        for client in self.clients:
+            client.close()
+        dm_functions.close_service_client()
+        self.service.stop()
+        dm_functions.close_catalog()
+        self.catalog_patcher.stop()
+        self.env_patcher.stop()
+        self.temp_dir.cleanup()
+
+    def connect(self):
+        client = DomainServiceClient(self.service.address, self.key_file)
+        self.clients.append(client)
+        return client
+
+    def registry_values(self):
+        with open(self.registry_path) as registry_file:
+            return sorted(json.load(registry_file).values())
+
+    def test_concurrent_requests_are_merged_into_one_write(self):
+        clients = [self.connect() for _ in range(4)]
+        results = {}
+        barrier = threading.Barrier(len(clients))
+
+        def add(index, client):
+            barrier.wait()
+            results[index] = client.add_domains([f"site{index}.com", "shared.com"], label=f"client {index}")
+
+        threads = [threading.Thread(target=add, args=(index, client)) for index, client in enumerate(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.service.write_batches, 1)
+        self.assertEqual(self.registry_values(), sorted(['existing.com', 'shared.com'] + [f"site{i}.com" for i in range(4)]))
+        self.assertEqual(sum(result['added'].count("shared.com") for result in results.values()), 1)
+
+    def test_list_is_served_from_memory(self):
+        client = self.connect()
+        with patch.object(dm_functions, 'execute_powershell_script') as mock_execute:
+            self.assertEqual(client.list_domains(), ['existing.com'])
+        mock_execute.assert_not_called()
+
+    def test_subscribers_are_notified_of_changes(self):
+        watcher, writer = self.connect(), self.connect()
+        received = threading.Event()
+        events = []
+        watcher.subscribe(lambda event: (events.append(event), received.set()))
+
+        writer.remove_domains(['existing.com'])
+        self.assertTrue(received.wait(5))
+        self.assertEqual(events[0], {'event': 'changed', 'added': [], 'removed': ['existing.com']})
+
+    def test_backend_functions_route_through_service(self):
+        service_env = {domain_service.SERVICE_ADDRESS_ENV: self.service.address, domain_service.SERVICE_KEY_ENV: self.key_file}
+        with patch.dict(os.environ, service_env):
+            self.assertEqual(dm_functions.add_domains(['new.com'], 'test'), {'added': ['new.com'], 'skipped': []})
+            self.assertEqual(dm_functions.fetch_existing_domains(), ['existing.com', 'new.com'])
+            self.assertEqual(dm_functions.undo_action(), "Undo: new.com added (test)")
+        self.assertEqual(self.registry_values(), ['existing.com'])
+
+    def test_pickled_messages_are_never_loaded(self):
+        marker = os.path.join(self.temp_dir.name, 'marker')
+        connection = Client(self.service.address, authkey=domain_service.read_service_key(self.key_file))
+        connection.send({'id': 1, 'op': 'list', 'payload': CreatesFile(marker)})
+        with self.assertRaises(EOFError):
+            connection.recv_bytes()  # The service drops the connection
+        connection.close()
+        self.assertFalse(os.path.exists(marker))
+
+    def test_requests_are_validated(self):
+        client = self.connect()
+        self.assertEqual(client.request('shutdown'), "Unknown service request: shutdown")
+        self.assertTrue(client.add_domains(['not a domain']).startswith("Rejected add request"))
+        self.assertEqual(client.request('add', domains='example.com'), "Malformed add request.")
+        self.assertEqual(client.add_domains(['HTTPS://Example.com/page']), {'added': ['example.com'], 'skipped': []})
+        self.assertEqual(self.registry_values(), ['example.com', 'existing.com'])
+
+    def test_subscription_survives_a_reconnect(self):
+        service_env = {domain_service.SERVICE_ADDRESS_ENV: self.service.address, domain_service.SERVICE_KEY_ENV: self.key_file}
+        events = {'disconnected': threading.Event(), 'changed': threading.Event()}
+
+        with patch.dict(os.environ, service_env):
+            self.assertTrue(dm_functions.subscribe_to_changes(lambda event: events[event['event']].set()))
+            for client in list(self.service.clients.values()):
+                # The connection drops; a shutdown wakes the threads blocked reading it, which a close does not
+                with socket.socket(fileno=os.dup(client.connection.fileno())) as connection_socket:
+                    connection_socket.shutdown(socket.SHUT_RDWR)
+            self.assertTrue(events['disconnected'].wait(5))
+            self.assertEqual(dm_functions.fetch_existing_domains(), ['existing.com'])  # and the next call reconnects
+            self.connect().remove_domains(['existing.com'])
+            self.assertTrue(events['changed'].wait(5))
+
+    def test_wrong_key_is_rejected(self):
+        wrong_key = os.path.join(self.temp_dir.name, 'wrong.key')
+        with open(wrong_key, 'wb') as key_file:
+            key_file.write(b'not the key')
+        with self.assertRaises(Exception):
+            DomainServiceClient(self.service.address, wrong_key)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+# test_domain_manager_gui_part12.py
+
+"""
+Test Suite Part 12: Redundancy Minimizer
+
+This test suite covers the reversed-label suffix trie and the removal of entries already covered by a parent domain.
+"""
+
+import unittest
+import sys
+import os
+
+# Adjust the path to import domain_index
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain_index import SuffixTrie, minimize_domains
+
+class TestRedundancyMinimizer(unittest.TestCase):
+    def test_covering_domain_is_closest_to_root(self):
+        trie = SuffixTrie(['example.com', 'ads.example.com', 'other.net'])
+        self.assertEqual(trie.covering_domain('cdn.ads.example.com'), 'example.com')
+        self.assertEqual(trie.covering_domain('ads.example.com'), 'example.com')
+        self.assertIsNone(trie.covering_domain('example.com'))
+        self.assertIsNone(trie.covering_domain('notexample.com'))
+        self.assertIn('OTHER.net', trie)
+        self.assertEqual(len(trie), 3)
+
+    def test_minimize_keeps_order_and_reports_cover(self):
+        kept, covered = minimize_domains([
+            'ads.example.com', 'tracker.net', 'example.com', 'cdn.ads.example.com', 'Tracker.NET', 'mytracker.net'
+        ])
+        self.assertEqual(kept, ['tracker.net', 'example.com', 'mytracker.net'])
+        self.assertEqual(sorted(covered), sorted([
+            ('Tracker.NET', 'tracker.net'), ('ads.example.com', 'example.com'), ('cdn.ads.example.com', 'example.com')
+        ]))
+
+    def test_exact_host_entries_are_not_a_label(self):
+        trie = SuffixTrie(['.example.com'])
+        self.assertIsNone(trie.covering_domain('ads.example.com'))
+        self.assertNotIn('example.com', trie)
+
+    def test_only_plain_hosts_cover_or_are_covered(self):
+        entries = ['.example.com', 'ads.example.com', 'https://tracker.net', 'cdn.tracker.net', 'site.org/ads',
+                   'a.site.org', '192.168.0.1', '1.192.168.0.1', 'site.org', 'site.org/ads/more']
+        kept, covered = minimize_domains(entries)
+        self.assertEqual(covered, [('a.site.org', 'site.org')])
+        self.assertEqual(kept, [entry for entry in entries if entry != 'a.site.org'])
+
+    def test_minimize_without_redundancy(self):
+        self.assertEqual(minimize_domains(['a.com', 'b.com']), (['a.com', 'b.com'], []))
+
+if __name__ == '__main__':
+    unittest.main()
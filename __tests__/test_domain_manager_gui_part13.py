@@ -0,0 +1,71 @@
+# test_domain_manager_gui_part13.py
+
+"""
+Test Suite Part 13: Public Suffix Validation
+
+This test suite covers the Public Suffix List trie, eTLD+1 computation and domain validation built on it.
+"""
+
+import unittest
+import sys
+import os
+
+# Adjust the path to import public_suffix
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from public_suffix import PublicSuffixList, get_public_suffix_list
+import domain_manager_functions as dm_functions
+
+class TestPublicSuffixList(unittest.TestCase):
+    def setUp(self):
+        self.suffix_list = PublicSuffixList([
+            '// comment', 'com', 'uk', 'co.uk', 'jp', '*.kawasaki.jp', '!city.kawasaki.jp',
+            '// ===BEGIN PRIVATE DOMAINS===', 'blogspot.com'
+        ])
+
+    def test_registrable_domain(self):
+        self.assertEqual(self.suffix_list.registrable_domain('a.b.example.com'), 'example.com')
+        self.assertEqual(self.suffix_list.registrable_domain('shop.example.co.uk'), 'example.co.uk')
+        self.assertEqual(self.suffix_list.registrable_domain('a.b.x.kawasaki.jp'), 'b.x.kawasaki.jp')
+        self.assertEqual(self.suffix_list.registrable_domain('www.city.kawasaki.jp'), 'city.kawasaki.jp')
+        self.assertEqual(self.suffix_list.registrable_domain('me.blogspot.com'), 'blogspot.com')
+        self.assertIsNone(self.suffix_list.registrable_domain('co.uk'))
+
+    def test_public_suffix(self):
+        self.assertTrue(self.suffix_list.is_public_suffix('x.kawasaki.jp'))
+        self.assertFalse(self.suffix_list.is_public_suffix('city.kawasaki.jp'))
+        self.assertEqual(self.suffix_list.public_suffix('example.co.uk'), 'co.uk')
+        self.assertEqual(self.suffix_list.public_suffix('example.unknown'), 'unknown')
+
+    def test_private_section_is_optional(self):
+        private = PublicSuffixList(['com', '// ===BEGIN PRIVATE DOMAINS===', 'blogspot.com'], include_private=True)
+        self.assertTrue(private.is_public_suffix('blogspot.com'))
+
+class TestCleanDomain(unittest.TestCase):
+    def test_accepts_deep_subdomains_and_urls(self):
+        self.assertEqual(dm_functions.clean_domain('a.b.example.com'), 'a.b.example.com')
+        self.assertEqual(dm_functions.clean_domain('cdn.foo.co.uk'), 'cdn.foo.co.uk')
+        self.assertEqual(dm_functions.clean_domain('https://user@www.Ads.Example.com:8080/path?q=1'), 'ads.example.com')
+
+    def test_converts_internationalized_names(self):
+        self.assertEqual(dm_functions.clean_domain('münchen.de'), 'xn--mnchen-3ya.de')
+        self.assertEqual(dm_functions.clean_domain('пример.рф'), 'xn--e1afmkfd.xn--p1ai')
+
+    def test_rejects_public_suffixes_and_bad_names(self):
+        for value in ('co.uk', 'com', 'example.notatld', '-ads.example.com', 'a..com', 'example', ''):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    dm_functions.clean_domain(value)
+
+    def test_clean_domains_batch(self):
+        valid, invalid = dm_functions.clean_domains(['example.com', 'co.uk', 'sub.example.org'])
+        self.assertEqual(valid, ['example.com', 'sub.example.org'])
+        self.assertEqual([entry for entry, _ in invalid], ['co.uk'])
+
+    def test_bundled_snapshot_loads(self):
+        suffix_list = get_public_suffix_list()
+        self.assertIs(suffix_list, get_public_suffix_list())
+        self.assertGreater(suffix_list.rule_count, 5000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# test_domain_manager_gui_part14.py
+
+"""
+Test Suite Part 14: Coverage Index
+
+This test suite covers the "already blocked" lookups used for the badges in the Domains from File list.
+"""
+
+import unittest
+import sys
+import os
+
+# Adjust the path to import domain_index
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain_index import SuffixTrie, CoverageIndex, STATUS_NEW, STATUS_BLOCKED, STATUS_COVERED
+
+class TestCoverageIndex(unittest.TestCase):
+    def test_trie_remove_prunes_branches(self):
+        trie = SuffixTrie(['example.com', 'ads.example.com'])
+        self.assertTrue(trie.remove('ads.example.com'))
+        self.assertFalse(trie.remove('ads.example.com'))
+        self.assertEqual(list(trie.root), ['com'])
+        self.assertEqual(list(trie.root['com']['example'].values()), ['example.com'])  # Only the entry's marker is left
+        self.assertTrue(trie.remove('EXAMPLE.com'))
+        self.assertEqual(trie.root, {})
+        self.assertEqual(len(trie), 0)
+
+    def test_classify_reports_exact_and_covered(self):
+        index = CoverageIndex(['example.com', 'Tracker.net'])
+        self.assertEqual(index.classify(['example.com', 'cdn.example.com', 'tracker.NET', 'other.org']), {
+            'example.com': (STATUS_BLOCKED, 'example.com'),
+            'cdn.example.com': (STATUS_COVERED, 'example.com'),
+            'tracker.NET': (STATUS_BLOCKED, 'Tracker.net'),
+            'other.org': (STATUS_NEW, None)
+        })
+
+    def test_exact_host_and_pattern_entries_do_not_cover(self):
+        index = CoverageIndex(['.example.com', 'https://tracker.net', 'site.org/ads'])
+        self.assertEqual(index.classify(['ads.example.com', 'cdn.tracker.net', 'a.site.org']), {
+            'ads.example.com': (STATUS_NEW, None),
+            'cdn.tracker.net': (STATUS_NEW, None),
+            'a.site.org': (STATUS_NEW, None)
+        })
+        index.apply(removed=['.example.com'])
+        self.assertEqual(len(index), 2)
+
+    def test_incremental_updates(self):
+        index = CoverageIndex(['example.com'])
+        index.apply(added=['other.org'], removed=['example.com'])
+        self.assertEqual(index.status('cdn.example.com'), (STATUS_NEW, None))
+        self.assertEqual(index.status('a.other.org'), (STATUS_COVERED, 'other.org'))
+
+        self.assertEqual(index.sync(['other.org', 'new.net']), (1, 0))
+        self.assertEqual(index.sync(['new.net']), (0, 1))
+        self.assertNotIn('other.org', index)
+        self.assertEqual(len(index), 1)
+
+if __name__ == '__main__':
+    unittest.main()
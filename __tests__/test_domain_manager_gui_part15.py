@@ -0,0 +1,57 @@
+# test_domain_manager_gui_part15.py
+
+"""
+Test Suite Part 15: Domain List Row Index
+
+This test suite covers locating and selecting batches of domains in the list widgets through the domain -> row index.
+"""
+
+import unittest
+import sys
+import os
+import time
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QItemSelectionModel
+
+# Adjust the path to import domain_list_widget
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain_list_widget import DomainListWidget
+
+class TestDomainListWidget(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.domain_list = DomainListWidget()
+        self.domain_list.set_domains(['a.com', 'b.com', 'c.com', 'd.com', 'e.com'])
+
+    def test_row_index_follows_changes(self):
+        self.assertEqual(self.domain_list.row_of('C.com'), 2)
+        self.domain_list.apply_changes(removed=['a.com'])
+        self.assertEqual(self.domain_list.row_of('c.com'), 1)
+        self.domain_list.clear()
+        self.domain_list.set_domains(['z.com'])
+        self.assertEqual(self.domain_list.row_of('c.com'), -1)
+        self.assertEqual(self.domain_list.row_of('z.com'), 0)
+
+    def test_select_domains_in_one_batch(self):
+        self.domain_list.selectionModel().select(self.domain_list.model().index(4, 0), QItemSelectionModel.Select)
+        found = self.domain_list.select_domains(['a.com', 'b.com', 'd.com', 'missing.com'])
+        self.assertEqual(found, 3)
+        self.assertEqual(self.domain_list.selected_domains(), ['a.com', 'b.com', 'd.com', 'e.com'])
+
+        self.domain_list.select_domains(['c.com'], clear=True)
+        self.assertEqual(self.domain_list.selected_domains(), ['c.com'])
+
+    def test_large_batch(self):
+        domains = [f"host{i}.example.com" for i in range(20000)]
+        self.domain_list.set_domains(domains)
+        start = time.perf_counter()
+        self.assertEqual(self.domain_list.select_domains(domains[::2]), 10000)
+        self.assertLess(time.perf_counter() - start, 5.0)
+        self.assertEqual(len(self.domain_list.selectedIndexes()), 10000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# test_domain_manager_gui_part16.py
+
+"""
+Test Suite Part 16: Multi-File Import Staging
+
+This test suite covers staging several files or a directory at once, cross-file deduplication and per-source provenance.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+
+# Adjust the path to import import_staging
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import domain_store
+from import_staging import StagedDomains, expand_paths, parse_sources, split_paths
+
+class TestImportStaging(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.write('a.txt', "example.com\nads.example.com\nnot a domain\n")
+        self.write('nested/b.csv', "example.com\ntracker.net\n")
+        self.write('nested/c.json', '["cdn.tracker.net", "Tracker.net"]')
+        self.write('notes.md', "ignored.com\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(content)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_expand_paths_walks_directories(self):
+        self.assertEqual(expand_paths([self.directory.name, self.path('a.txt')]),
+                         [self.path('a.txt'), self.path('nested/b.csv'), self.path('nested/c.json')])
+        self.assertEqual(split_paths(" a.txt; ;b.csv "), ['a.txt', 'b.csv'])
+
+    def test_parse_sources_concurrently_and_in_order(self):
+        paths = expand_paths([self.directory.name]) + [self.path('missing.txt')]
+        sources = list(parse_sources(paths, workers=3))
+        self.assertEqual([source.name for source in sources], ['a.txt', 'b.csv', 'c.json', 'missing.txt'])
+        self.assertEqual(sources[0].domains, ['example.com', 'ads.example.com'])
+        self.assertEqual(len(sources[0].invalid), 1)
+        self.assertIsNotNone(sources[3].error)
+
+        minimized = list(parse_sources([self.path('a.txt')], minimize=True))[0]
+        self.assertEqual(minimized.domains, ['example.com'])
+        self.assertEqual(minimized.covered, [('ads.example.com', 'example.com')])
+
+    def test_staged_domains_track_sources(self):
+        staged = StagedDomains()
+        self.assertEqual(staged.add_source('a.txt', ['example.com', 'ads.example.com']), 2)
+        self.assertEqual(staged.add_source('b.csv', ['Example.com', 'tracker.net']), 1)
+        self.assertEqual(list(staged.domains_from()), ['example.com', 'ads.example.com', 'tracker.net'])
+        self.assertEqual(list(staged.domains_from('b.csv')), ['example.com', 'tracker.net'])
+        self.assertEqual(staged.sources_of('EXAMPLE.com'), ['a.txt', 'b.csv'])
+        self.assertEqual(staged.label(), '2 files')
+
+        self.assertEqual(staged.remove_source('a.txt'), ['ads.example.com'])
+        self.assertEqual(list(staged.domains_from()), ['example.com', 'tracker.net'])
+        self.assertEqual(staged.sources_of('example.com'), ['b.csv'])
+
+        staged.add_source('b.csv', ['other.org'])
+        self.assertEqual(list(staged.domains_from()), ['other.org'])
+        self.assertEqual(len(staged), 1)
+
+    def test_store_is_rebuilt_once_mostly_dropped(self):
+        staged = StagedDomains()
+        staged.add_source('big.txt', [f"site{i}.com" for i in range(20)])
+        staged.add_source('small.txt', ['site3.com', 'kept.org'])
+        earlier = staged.domains_from('small.txt')
+        with patch.object(domain_store, 'COMPACT_MIN_ROWS', 4):
+            staged.remove_source('big.txt')
+        self.assertEqual(len(staged.store), 2)
+        self.assertEqual(list(staged.domains_from()), ['site3.com', 'kept.org'])
+        self.assertEqual(staged.sources_of('site3.com'), ['small.txt'])
+        self.assertEqual(list(earlier), ['site3.com', 'kept.org'])  # Still reads the old store
+
+if __name__ == '__main__':
+    unittest.main()
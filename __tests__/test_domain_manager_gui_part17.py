@@ -0,0 +1,81 @@
+# test_domain_manager_gui_part17.py
+
+"""
+Test Suite Part 17: Block List Export
+
+This test suite covers streaming the block list to text, CSV, JSON, hosts and .reg files, with optional gzip compression.
+"""
+
+import unittest
+import sys
+import os
+import io
+import gzip
+import json
+import tempfile
+
+# Adjust the path to import domain_manager_functions
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import domain_manager_functions as dm_functions
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.domains = ['example.com', 'ads.example.net']
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+    def test_exports_round_trip_through_the_importers(self):
+        for name in ('list.txt', 'list.csv', 'list.json'):
+            with self.subTest(name=name):
+                self.assertEqual(dm_functions.export_domains(iter(self.domains), self.path(name)), (2, 0))
+                processing_function = dm_functions.get_processing_function(self.path(name))
+                self.assertEqual([domain for _, domain in processing_function(self.path(name))], self.domains)
+
+    def test_hosts_and_reg_formats(self):
+        domains = self.domains + ['.exact.org', 'https://example.org/ads', '*', '10.0.0.1']
+        self.assertEqual(dm_functions.export_domains(domains, self.path('blocked.hosts')), (3, 3))
+        with open(self.path('blocked.hosts')) as hosts_file:
+            self.assertEqual(hosts_file.read().splitlines()[1:], [
+                "0.0.0.0 example.com", "0.0.0.0 ads.example.net", "0.0.0.0 exact.org"
+            ])
+
+        dm_functions.export_domains(self.domains, self.path('blocked.reg'))
+        with open(self.path('blocked.reg'), 'rb') as reg_file:
+            content = reg_file.read()
+        self.assertTrue(content.startswith(b'\xff\xfe'))  # UTF-16 with a byte order mark, as regedit writes
+        text = content.decode('utf-16')
+        self.assertTrue(text.startswith("Windows Registry Editor Version 5.00\r\n"))
+        self.assertLess(text.index(f"[-{dm_functions.REG_FILE_KEY}]\r\n"), text.index(f"[{dm_functions.REG_FILE_KEY}]\r\n"))
+        self.assertIn('"2"="ads.example.net"\r\n', text)
+
+    def test_gzip_and_stream_output(self):
+        self.assertEqual(dm_functions.export_domains(self.domains, self.path('list.json.gz')), (2, 0))
+        with gzip.open(self.path('list.json.gz'), 'rt') as export_file:
+            self.assertEqual(json.load(export_file), self.domains)
+
+        stream = io.StringIO()
+        self.assertEqual(dm_functions.write_domains(stream, [], 'json'), (0, 0))
+        self.assertEqual(json.loads(stream.getvalue()), [])
+
+    def test_failed_export_keeps_previous_file(self):
+        with open(self.path('list.txt'), 'w') as export_file:
+            export_file.write("previous.com\n")
+
+        def failing_domains():
+            yield 'example.com'
+            raise OSError("fetch failed")
+
+        result = dm_functions.export_domains(failing_domains(), self.path('list.txt'))
+        self.assertIsInstance(result, str)
+        with open(self.path('list.txt')) as export_file:
+            self.assertEqual(export_file.read(), "previous.com\n")
+        self.assertEqual(os.listdir(self.temp_dir.name), ['list.txt'])
+
+if __name__ == '__main__':
+    unittest.main()
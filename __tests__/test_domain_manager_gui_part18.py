@@ -0,0 +1,80 @@
+# test_domain_manager_gui_part18.py
+
+"""
+Test Suite Part 18: External Change Detection
+
+This test suite covers the registry watcher against the simulated registry and the incremental refresh of the blocked list.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QPersistentModelIndex
+
+# Adjust the path to import registry_watcher
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from registry_watcher import RegistryWatcher, registry_fingerprint
+from simulated_registry import SIMULATED_REGISTRY_ENV, get_simulated_registry
+from domain_list_widget import DomainListWidget
+from domain_index import diff_domains
+
+class TestRegistryWatcher(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.env_patch = patch.dict(os.environ, {SIMULATED_REGISTRY_ENV: os.path.join(self.temp_dir.name, 'registry.json')})
+        self.env_patch.start()
+        self.registry = get_simulated_registry()
+        self.registry.save({'1': 'example.com'})
+        self.changed = threading.Event()
+        self.watcher = RegistryWatcher(self.changed.set, poll_interval=0.02)
+
+    def tearDown(self):
+        self.watcher.stop()
+        self.env_patch.stop()
+        self.temp_dir.cleanup()
+
+    def test_external_edit_is_reported(self):
+        self.watcher.start()
+        self.assertFalse(self.changed.wait(0.1))
+        self.registry.save({'1': 'example.com', '2': 'ads.example.net'})  # As another process would
+        self.assertTrue(self.changed.wait(5))
+
+    def test_changes_marked_seen_are_not_reported(self):
+        self.watcher.start()
+        fingerprint = registry_fingerprint()
+        self.registry.run("8", self.write_list(['other.org']))
+        self.assertNotEqual(registry_fingerprint(), fingerprint)
+        self.watcher.mark_seen()
+        self.assertFalse(self.changed.wait(0.1))
+
+    def write_list(self, domains):
+        list_path = os.path.join(self.temp_dir.name, 'batch.txt')
+        with open(list_path, 'w') as list_file:
+            list_file.write("\n".join(domains))
+        return list_path
+
+class TestIncrementalRefresh(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def test_apply_changes_keeps_unchanged_rows(self):
+        previous = ['a.com', 'b.com', 'c.com', 'd.com']
+        current = ['a.com', 'c.com', 'e.com']
+        domain_list = DomainListWidget()
+        domain_list.set_domains(previous)
+        kept_index = QPersistentModelIndex(domain_list.model().index(2, 0))
+
+        added, removed = diff_domains(previous, current)
+        self.assertEqual((added, removed), (['e.com'], ['b.com', 'd.com']))
+        domain_list.apply_changes(added, removed)
+        self.assertEqual(list(domain_list.domains()), current)
+        self.assertEqual(kept_index.row(), 1)  # Unchanged rows are moved, not reset
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+# test_domain_manager_gui_part19.py
+
+"""
+Test Suite Part 19: Domain Catalog
+
+This test suite covers the SQLite catalog that records the source, dates and tags of blocked domains, and its search syntax.
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+import time
+
+# Adjust the path to import domain_catalog
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain_catalog import DomainCatalog, is_catalog_query, parse_date_range, day_start
+import datetime
+
+DAY = 86400
+
+class TestDomainCatalog(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.catalog = DomainCatalog(os.path.join(self.temp_dir.name, 'domains.catalog'))
+
+    def tearDown(self):
+        self.catalog.close()
+        self.temp_dir.cleanup()
+
+    def test_record_keeps_the_first_source_and_date(self):
+        self.catalog.record('add', ['Example.com'], 'feed.txt', timestamp=100)
+        self.catalog.record('add', ['example.com'], 'other.txt', timestamp=200)
+        self.assertEqual(self.catalog.describe('example.com'),
+                         {'domain': 'Example.com', 'source': 'feed.txt', 'added_at': 100, 'removed_at': None, 'tags': []})
+
+        # Undo brings the domain back without a source, so it keeps feed.txt; a new import takes over
+        self.catalog.record('remove', ['example.com'], timestamp=300)
+        self.assertEqual(self.catalog.describe('example.com')['removed_at'], 300)
+        self.catalog.record('add', ['example.com'], timestamp=400)
+        self.assertEqual(self.catalog.describe('example.com')['source'], 'feed.txt')
+        self.catalog.record('remove', ['example.com'], timestamp=500)
+        self.catalog.record('add', ['example.com'], 'new.txt', timestamp=600)
+        self.assertEqual(self.catalog.describe('example.com')['source'], 'new.txt')
+        self.assertEqual(self.catalog.describe('example.com')['added_at'], 600)
+
+    def test_sync_records_external_edits(self):
+        self.catalog.record('add', ['example.com', 'ads.example.net'], 'feed.txt')
+        self.assertEqual(self.catalog.sync(['example.com', 'tracker.org']), (1, 1))
+        self.assertEqual(self.catalog.describe('tracker.org')['source'], 'registry')
+        self.assertIsNotNone(self.catalog.describe('ads.example.net')['removed_at'])
+        self.assertEqual(self.catalog.sync(['example.com', 'tracker.org']), (0, 0))
+
+    def test_query_filters(self):
+        now = time.time()
+        self.catalog.record('add', ['ads.example.com', 'tracker.co.uk'], 'feeds/ads.txt', timestamp=now - 30 * DAY)
+        self.catalog.record('add', ['cdn.example.net'], 'manual', timestamp=now - DAY)
+        self.catalog.record('add', ['gone.example.org'], 'manual', timestamp=now - 2 * DAY)
+        self.catalog.record('remove', ['gone.example.org'], timestamp=now - DAY)
+        self.catalog.tag(['cdn.example.net', 'tracker.co.uk'], ['Review'])
+
+        self.assertEqual(self.catalog.query('source:*ads.txt'), ['ads.example.com', 'tracker.co.uk'])
+        self.assertEqual(self.catalog.query('source:manual'), ['cdn.example.net'])
+        self.assertEqual(self.catalog.query('added:7d'), ['cdn.example.net'])
+        self.assertEqual(self.catalog.query('tld:uk'), ['tracker.co.uk'])
+        self.assertEqual(self.catalog.query('tld:co.uk'), ['tracker.co.uk'])
+        self.assertEqual(self.catalog.query('tag:review example'), ['cdn.example.net'])
+        self.assertEqual(self.catalog.query('removed:7d'), ['gone.example.org'])
+        self.assertEqual(self.catalog.query('ex_mple'), [])  # LIKE wildcards in a search are literal
+
+        self.catalog.tag(['cdn.example.net'], ['review'], remove=True)
+        self.assertEqual(self.catalog.query('tag:review'), ['tracker.co.uk'])
+        with self.assertRaises(ValueError):
+            self.catalog.query('added:yesterday')
+
+    def test_tld_comes_from_the_entry_host(self):
+        self.catalog.record('add', ['https://ads.example.co.uk/banner?x=*.com', '192.168.0.1', 'example.com'], 'feed.txt')
+        self.assertEqual(self.catalog.query('tld:co.uk'), ['https://ads.example.co.uk/banner?x=*.com'])
+        self.assertEqual(self.catalog.query('tld:com'), ['example.com'])
+        self.assertEqual(self.catalog.query('tld:1'), [])
+
+    def test_a_failed_batch_records_nothing(self):
+        with self.assertRaises(sqlite3.Error):
+            self.catalog.transaction([
+                ("INSERT INTO tags (tag, domain) VALUES (?, ?)", [('a', 'example.com')]),
+                ("INSERT INTO missing_table VALUES (?)", [(1,)])
+            ])
+        self.assertEqual(self.catalog.describe('example.com'), None)
+        self.assertEqual(self.catalog.connection.execute("SELECT COUNT(*) FROM tags").fetchone(), (0,))
+
+class TestCatalogSearchSyntax(unittest.TestCase):
+    def test_detects_catalog_searches(self):
+        self.assertTrue(is_catalog_query('source:feed.txt'))
+        self.assertTrue(is_catalog_query('example Added:7d'))
+        self.assertFalse(is_catalog_query('example.com'))
+
+    def test_date_ranges(self):
+        may_first = day_start(datetime.date(2024, 5, 1))
+        may_last = day_start(datetime.date(2024, 5, 31))
+        self.assertEqual(parse_date_range('2024-05-01'), (may_first, may_first + DAY))
+        self.assertEqual(parse_date_range('>2024-05-01'), (may_first + DAY, None))
+        self.assertEqual(parse_date_range('<2024-05-01'), (None, may_first))
+        self.assertEqual(parse_date_range('2024-05-01..2024-05-31'), (may_first, may_last + DAY))
+        self.assertEqual(parse_date_range('2w', now=1000000), (1000000 - 14 * DAY, None))
+
+if __name__ == '__main__':
+    unittest.main()
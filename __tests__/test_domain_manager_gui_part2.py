@@ -9,6 +9,7 @@ This test suite covers the theme handling functionality of the DomainManagerGUI,
 import unittest
 import sys
 import os
+import tempfile
 from unittest.mock import patch
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtTest import QTest
@@ -18,6 +19,7 @@ from PyQt5.QtCore import Qt
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import domain_manager_gui
+import domain_manager_functions as dm_functions
 
 class TestDomainManagerGUIThemeHandling(unittest.TestCase):
     @classmethod
@@ -25,26 +27,35 @@ class TestDomainManagerGUIThemeHandling(unittest.TestCase):
         cls.app = QApplication(sys.argv)
 
     def setUp(self):
+        # A config with both prompts switched off, so no modal dialog blocks the suite on a fresh checkout
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        config_file = os.path.join(temp_dir.name, 'config.ini')
+        with open(config_file, 'w') as file:
+            file.write("[Theme]\nshow_prompt = False\n\n[Logging]\nshow_prompt = False\n")
+        config_patch = patch.object(domain_manager_gui, 'CONFIG_FILE', config_file)
+        config_patch.start()
+        self.addCleanup(config_patch.stop)
         self.gui = domain_manager_gui.DomainManagerGUI()
 
     def tearDown(self):
         self.gui.close()
 
     def test_toggle_theme_changes_state(self):
-        initial_state = self.gui.dark_theme_enabled
+        initial_state = domain_manager_gui.theme_manager.theme
         QTest.mouseClick(self.gui.theme_toggle_switch, Qt.LeftButton)
-        self.assertNotEqual(initial_state, self.gui.dark_theme_enabled)
+        self.assertNotEqual(initial_state, domain_manager_gui.theme_manager.theme)
 
     def test_load_theme_preference_from_config(self):
-        with patch('configparser.ConfigParser.read', return_value=None):
-            with patch('configparser.ConfigParser.getboolean', return_value=True):
-                self.gui.load_theme_preference()
-                self.assertTrue(self.gui.dark_theme_enabled)
+        dm_functions.save_preference(domain_manager_gui.CONFIG_FILE, 'Theme', 'theme', True)
+        self.gui.load_preferences()
+        self.assertTrue(domain_manager_gui.theme_manager.theme)
+        self.assertTrue(self.gui.theme_toggle_switch.isChecked())
 
     def test_save_theme_preference_to_config(self):
-        with patch('configparser.ConfigParser.write') as mock_write:
-            self.gui.save_theme_preference()
-            self.assertTrue(mock_write.called)
+        with patch.object(dm_functions, 'save_preference') as mock_save:
+            self.gui.handle_prompt_result('Theme', domain_manager_gui.QDialog.Accepted, False)
+        mock_save.assert_called_once_with(domain_manager_gui.CONFIG_FILE, 'Theme', 'theme', domain_manager_gui.theme_manager.theme)
 
 if __name__ == '__main__':
     unittest.main()
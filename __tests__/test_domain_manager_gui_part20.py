@@ -0,0 +1,105 @@
+# test_domain_manager_gui_part20.py
+
+"""
+Test Suite Part 20: Grouped View
+
+This test suite covers grouping blocked domains by registrable domain and the lazily populated tree model behind the grouped view.
+"""
+
+import unittest
+import sys
+import os
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QModelIndex
+from PyQt5.QtTest import QAbstractItemModelTester
+
+# Adjust the path to import grouped_domain_model
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grouped_domain_model import GroupedDomainModel, group_domains
+
+class TestGroupDomains(unittest.TestCase):
+    def test_groups_by_registrable_domain(self):
+        groups = group_domains(['www.example.com', 'ads.example.com', 'a.b.example.co.uk', 'example.co.uk', 'localhost'])
+        self.assertEqual(groups, {
+            'example.com': ['ads.example.com', 'www.example.com'],
+            'example.co.uk': ['a.b.example.co.uk', 'example.co.uk'],
+            'localhost': ['localhost']
+        })
+
+    def test_url_patterns_group_by_host_and_ips_stand_alone(self):
+        groups = group_domains(['https://ads.example.com/path', '.example.com', 'example.com:8080', '10.0.0.1', '10.0.0.2/x', '*'])
+        self.assertEqual(groups, {
+            'example.com': ['.example.com', 'example.com:8080', 'https://ads.example.com/path'],
+            '10.0.0.1': ['10.0.0.1'],
+            '10.0.0.2': ['10.0.0.2/x'],
+            '*': ['*']
+        })
+
+class TestGroupedDomainModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.model = GroupedDomainModel(fetch_batch=2)
+        self.model.set_domains(['a.one.com', 'b.one.com', 'c.one.com', 'two.com', 'x.three.net', 'four.org'])
+
+    def group_index(self, name):
+        return self.model.index(self.model.names.index(name), 0)
+
+    def test_rows_are_created_on_demand(self):
+        root = QModelIndex()
+        self.assertEqual(self.model.rowCount(root), 0)
+        self.assertTrue(self.model.canFetchMore(root))
+        self.model.fetchMore(root)
+        self.assertEqual([self.model.index(row, 0).data() for row in range(self.model.rowCount(root))], ['four.org', 'one.com'])
+        self.assertEqual(self.model.index(1, 1).data(), '3')
+
+        group = self.group_index('one.com')
+        self.assertEqual(self.model.rowCount(group), 0)
+        self.assertTrue(self.model.hasChildren(group))
+        self.model.fetchMore(group)
+        self.model.fetchMore(group)
+        self.assertFalse(self.model.canFetchMore(group))
+        self.assertEqual([self.model.index(row, 0, group).data() for row in range(3)], ['a.one.com', 'b.one.com', 'c.one.com'])
+        self.assertEqual(self.model.parent(self.model.index(2, 0, group)), group)
+
+    def test_selected_group_stands_for_all_its_domains(self):
+        self.model.fetchMore(QModelIndex())
+        group = self.group_index('one.com')
+        self.model.fetchMore(group)
+        domains = self.model.domains_for([group, self.model.index(0, 0, group), self.group_index('four.org')])
+        self.assertEqual(sorted(domains), ['a.one.com', 'b.one.com', 'c.one.com', 'four.org'])
+
+    def test_apply_changes_updates_loaded_rows(self):
+        root = QModelIndex()
+        self.model.fetchMore(root)
+        group = self.group_index('one.com')
+        self.model.fetchMore(group)
+        self.model.fetchMore(group)
+
+        self.model.apply_changes(added=['b2.one.com', 'new.com', 'zzz.org'], removed=['a.one.com', 'four.org'])
+        group = self.group_index('one.com')
+        self.assertEqual([self.model.index(row, 0, group).data() for row in range(self.model.rowCount(group))],
+                         ['b.one.com', 'b2.one.com', 'c.one.com'])
+        self.assertEqual([self.model.index(row, 0).data() for row in range(self.model.rowCount(root))], ['new.com', 'one.com'])
+        while self.model.canFetchMore(root):
+            self.model.fetchMore(root)
+        self.assertEqual(self.model.names, ['new.com', 'one.com', 'three.net', 'two.com', 'zzz.org'])
+        self.assertEqual(self.model.domain_count, 7)
+        self.assertEqual(sorted(self.model.domains()), sorted(
+            ['b.one.com', 'b2.one.com', 'c.one.com', 'new.com', 'two.com', 'x.three.net', 'zzz.org']
+        ))
+
+    def test_model_stays_consistent(self):
+        # The tester checks every index, parent and row count after each change, fetching rows as a view would
+        tester = QAbstractItemModelTester(self.model, QAbstractItemModelTester.FailureReportingMode.Fatal)
+        self.model.apply_changes(added=['d.one.com', 'five.com'], removed=['two.com', 'b.one.com'])
+        self.model.apply_changes(removed=['x.three.net', 'four.org'])
+        self.model.set_domains(['www.example.com'])
+        self.assertEqual(self.model.domains(), ['www.example.com'])
+        del tester
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# test_domain_manager_gui_part21.py
+
+"""
+Test Suite Part 21: Compact Domain Store
+
+This test suite covers the shared UTF-8 domain store, its hash index and the row views that the lists and searches read from.
+"""
+
+import unittest
+import sys
+import os
+from array import array
+
+# Adjust the path to import domain_store
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain_store import DomainStore, DomainView, domain_view
+
+class TestDomainStore(unittest.TestCase):
+    def test_add_and_lookup(self):
+        store = DomainStore(['example.com', 'bücher.de', 'Ads.Example.net'])
+        self.assertEqual(len(store), 3)
+        self.assertEqual(list(store), ['example.com', 'bücher.de', 'Ads.Example.net'])
+        self.assertEqual(store.index('ads.example.NET'), 2)
+        self.assertEqual(store.index('missing.org'), -1)
+        self.assertEqual(store.add('EXAMPLE.com'), 0)  # The first spelling is kept
+        self.assertEqual(len(store), 3)
+
+    def test_index_survives_growth(self):
+        domains = [f"host{i}.example.com" for i in range(5000)]
+        store = DomainStore(domains)
+        self.assertEqual(len(store), 5000)
+        self.assertTrue(all(store.index(domain) == row for row, domain in enumerate(domains)))
+        self.assertLess(len(store), len(store.slots))
+
+    def test_needs_compaction_once_mostly_dead(self):
+        store = DomainStore(f"host{i}.example.com" for i in range(10000))
+        self.assertFalse(store.needs_compaction(10000))
+        self.assertFalse(store.needs_compaction(6000))  # Dead rows must outnumber the live ones...
+        self.assertTrue(store.needs_compaction(4000))
+        self.assertFalse(DomainStore(f"{i}.com" for i in range(3000)).needs_compaction(10))  # ...and pass COMPACT_MIN_ROWS
+
+class TestDomainView(unittest.TestCase):
+    def setUp(self):
+        self.view = domain_view(['a.com', 'b.com', 'c.com', 'd.com'])
+
+    def test_views_share_the_store(self):
+        filtered = self.view.filter(lambda domain: domain != 'b.com')
+        self.assertIs(filtered.store, self.view.store)
+        self.assertEqual(list(filtered), ['a.com', 'c.com', 'd.com'])
+        self.assertEqual(filtered.position_of('D.com'), 2)
+        self.assertEqual(filtered.position_of('b.com'), -1)
+        self.assertEqual(filtered[1:], ['c.com', 'd.com'])
+        self.assertEqual(list(self.view.select(['d.com', 'x.com', 'a.com'])), ['d.com', 'a.com'])
+        self.assertIs(domain_view(filtered), filtered)
+
+    def test_with_changes_leaves_the_original_view(self):
+        changed = self.view.with_changes(added=['e.com', 'a.com'], removed=['b.com', 'x.com'])
+        self.assertEqual(list(changed), ['a.com', 'c.com', 'd.com', 'e.com'])
+        self.assertEqual(list(self.view), ['a.com', 'b.com', 'c.com', 'd.com'])
+        self.assertEqual(len(self.view.store), 5)
+        self.assertEqual(DomainView(self.view.store, array('I', [4, 0])).position_of('a.com'), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+# test_domain_manager_gui_part22.py
+
+"""
+Test Suite Part 22: Feed Diffing
+
+This test suite covers diffing large feeds against the block list with sorted runs spilled to disk, the Bloom filter pre-check, and applying a diff as a bulk job.
+"""
+
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+from unittest.mock import patch
+
+# Adjust the path to import feed_diff
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import bulk_jobs
+import domain_manager_cli as cli
+import domain_manager_functions as dm_functions
+import feed_diff
+from feed_diff import BloomFilter, SortedRuns, diff_feed
+
+def feed(domains):
+    return (('feed.txt', domain) for domain in domains)
+
+class TestSortedRuns(unittest.TestCase):
+    def test_spilled_runs_merge_sorted_and_unique(self):
+        with tempfile.TemporaryDirectory() as temp_dir, patch.object(feed_diff, 'MIN_RUN_BYTES', 0), \
+                patch.object(feed_diff, 'MERGE_FAN_IN', 3):
+            runs = SortedRuns(temp_dir, 'test', 600)  # About five lines per run
+            lines = [f"host{i % 70}.example.com" for i in range(200)]
+            for line in lines:
+                runs.add(line)
+            self.assertGreater(len(runs.paths), 3)
+            self.assertEqual(list(runs), sorted(set(lines)))
+            self.assertLessEqual(len(runs.paths), 3)
+
+class TestBloomFilter(unittest.TestCase):
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000)
+        domains = [f"site{i}.com" for i in range(1000)]
+        for domain in domains:
+            bloom.add(domain)
+        self.assertTrue(all(domain in bloom for domain in domains))
+        false_positives = sum(f"other{i}.net" in bloom for i in range(10000))
+        self.assertLess(false_positives, 500)
+
+class TestDiffFeed(unittest.TestCase):
+    def setUp(self):
+        self.current = ['Keep.com', 'gone.org', 'shared.net', 'old.example.com']
+        self.entries = ['keep.com', 'https://Shared.net/path', 'new.io', '# comment', '', 'not a domain', 'new.io', 'fresh.dev']
+
+    def check_diff(self, **options):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with diff_feed(feed(self.entries), self.current, temp_dir=temp_dir, **options) as diff:
+                self.assertEqual(list(diff.additions()), ['fresh.dev', 'new.io'])
+                self.assertEqual(list(diff.removals()), ['gone.org', 'old.example.com'])
+                self.assertEqual(
+                    {key: diff.counts[key] for key in ('feed', 'invalid', 'add', 'remove', 'common')},
+                    {'feed': 5, 'invalid': 1, 'add': 2, 'remove': 2, 'common': 2}
+                )
+            self.assertEqual(os.listdir(temp_dir), [])
+
+    def test_diff_in_memory(self):
+        self.check_diff()
+
+    def test_diff_with_bloom_filter(self):
+        self.check_diff(bloom=True)
+
+    def test_diff_spilled_to_disk(self):
+        with patch.object(feed_diff, 'MIN_RUN_BYTES', 0):
+            self.check_diff(memory_mb=0.0003, bloom=True)
+
+class TestFeedJob(unittest.TestCase):
+    def test_sync_job_from_diff(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with diff_feed(feed(['a.com', 'c.com']), ['a.com', 'B.com'], temp_dir=temp_dir) as diff:
+                job = bulk_jobs.create_feed_job(diff, 'feed.txt', sync=True, jobs_dir=temp_dir)
+            self.assertEqual(job.action, 'sync')
+            self.assertEqual([(step['op'], job.step_domains(index)) for index, step in enumerate(job.steps)],
+                             [('remove', ['B.com']), ('add', ['c.com'])])
+            self.assertTrue(os.path.exists(job.job_path))
+
+    def test_import_job_only_adds(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with diff_feed(feed(['a.com', 'c.com']), ['a.com', 'B.com'], temp_dir=temp_dir) as diff:
+                job = bulk_jobs.create_feed_job(diff, 'feed.txt', jobs_dir=temp_dir)
+            self.assertEqual((job.action, [step['op'] for step in job.steps], job.step_domains(0)), ('add', ['add'], ['c.com']))
+
+    def test_job_stores_chunk_offsets_not_domains(self):
+        domains = [f"site{i}.com" for i in range(7)]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with diff_feed(feed(domains), [], temp_dir=temp_dir) as diff:
+                job = bulk_jobs.create_feed_job(diff, 'feed.txt', chunk_size=3, jobs_dir=temp_dir)
+            with open(job.job_path) as job_file:
+                steps = json.load(job_file)['steps']
+            self.assertEqual([(step['offset'], step['count']) for step in steps], [(0, 3), (30, 3), (60, 1)])
+            self.assertNotIn('domains', steps[0])
+
+            changed = []
+            with patch.object(dm_functions, 'add_domains', side_effect=lambda chunk, **kwargs: {'added': chunk, 'skipped': []}), \
+                    patch.object(dm_functions, 'record_batch'):
+                self.assertIsNone(job.run(on_chunk=lambda op, chunk: changed.append(chunk)))
+            self.assertEqual(changed, [sorted(domains)[:3], sorted(domains)[3:6], sorted(domains)[6:]])
+            self.assertEqual((job.changed_count('add'), job.committed_domains), (7, 7))
+            self.assertEqual(os.listdir(temp_dir), [])
+
+class TestDiffCommand(unittest.TestCase):
+    def test_diff_lists_changes_without_applying(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            feed_path = os.path.join(temp_dir, 'feed.txt')
+            with open(feed_path, 'w') as feed_file:
+                feed_file.write("b.com\nc.com\n")
+            with patch.object(dm_functions, 'fetch_existing_domains', return_value=['a.com', 'b.com']), \
+                    patch.object(cli, 'CONFIG_FILE', os.path.join(temp_dir, 'config.ini')):
+                stdout = io.StringIO()
+                exit_code = cli.main(['diff', feed_path, '--format', 'ndjson'], stdin=io.StringIO(), stdout=stdout)
+                self.assertEqual(exit_code, cli.EXIT_OK)
+                self.assertEqual([json.loads(line) for line in stdout.getvalue().splitlines()],
+                                 [{'domain': 'c.com', 'status': 'added'}, {'domain': 'a.com', 'status': 'removed'}])
+                stdout = io.StringIO()
+                cli.main(['diff', feed_path, '--bloom'], stdin=io.StringIO(), stdout=stdout)
+                self.assertEqual(json.loads(stdout.getvalue())['counts']['common'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
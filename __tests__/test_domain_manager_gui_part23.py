@@ -0,0 +1,97 @@
+# test_domain_manager_gui_part23.py
+
+"""
+Test Suite Part 23: URL Policy Checks
+
+This test suite covers matching URLs against block list entries in Brave's URLBlocklist filter format, and the CLI check command.
+"""
+
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+from unittest.mock import patch
+
+# Adjust the path to import url_policy
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import domain_manager_cli as cli
+import domain_manager_functions as dm_functions
+from url_policy import UrlPolicy, parse_entry, split_url
+
+class TestParsing(unittest.TestCase):
+    def test_parse_entry(self):
+        rule = parse_entry('https://.Example.com:8443/ads*?id=1&ref')
+        self.assertEqual((rule.scheme, rule.host, rule.port, rule.path, rule.query, rule.exact),
+                         ('https', 'example.com', 8443, '/ads', (('id', '1'), ('ref', None)), True))
+        self.assertIsNone(parse_entry('*').host)
+        self.assertEqual(parse_entry('bücher.de').host, 'xn--bcher-kva.de')
+        for entry in ('', 'a..com', 'x.com:99999', 'ads.*.com'):
+            with self.assertRaises(ValueError):
+                parse_entry(entry)
+
+    def test_split_url(self):
+        self.assertEqual(split_url('user@WWW.Example.com/a?b=1#top'), ('http', 'www.example.com', 80, '/a', 'b=1'))
+        self.assertEqual(split_url('https://[::1]:8080'), ('https', '::1', 8080, '/', ''))
+        with self.assertRaises(ValueError):
+            split_url('http://:80/')
+
+class TestUrlPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = UrlPolicy([
+            'example.com', '.exact.org', 'https://secure.net', 'site.io/ads', 'site.io/ads/keep', 'http://*:8080',
+            'query.com?id=1', '192.168.0.1', 'bad..entry'
+        ])
+
+    def test_matches_by_host_scheme_port_path_and_query(self):
+        expectations = {
+            'http://www.example.com/x': 'example.com',
+            'EXAMPLE.com': 'example.com',
+            'exact.org/page': '.exact.org',
+            'sub.exact.org': None,
+            'https://a.secure.net/': 'https://secure.net',
+            'http://secure.net': None,
+            'site.io/': None,
+            'site.io/ads/keep/more': 'site.io/ads/keep',
+            'site.io/adsx': 'site.io/ads',
+            'http://anything.test:8080/': 'http://*:8080',
+            'https://anything.test:8080/': None,
+            'query.com/?x=2&id=1': 'query.com?id=1',
+            'query.com/?id=2': None,
+            'http://192.168.0.1/': '192.168.0.1',
+            'http://10.192.168.0.1/': None
+        }
+        self.assertEqual({url: self.policy.match(url) for url in expectations}, expectations)
+        self.assertEqual(len(self.policy), 8)
+        self.assertEqual([entry for entry, _ in self.policy.invalid], ['bad..entry'])
+
+    def test_longest_host_wins(self):
+        policy = UrlPolicy(['*', 'com', 'ads.example.com', 'example.com'])
+        self.assertEqual(policy.match('https://x.ads.example.com/'), 'ads.example.com')
+        self.assertEqual(policy.match('https://www.example.com/'), 'example.com')
+        self.assertEqual(policy.match('https://other.org/'), '*')
+
+class TestCheckCommand(unittest.TestCase):
+    def test_check_log_lines(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_path = os.path.join(temp_dir, 'access.log')
+            with open(log_path, 'w') as log_file:
+                log_file.write("# requests\n1 GET https://ads.example.com/a 200\n2 GET https://other.org/ 200\n3 GET http://:1 400\n")
+            with patch.object(dm_functions, 'fetch_existing_domains', return_value=['example.com']), \
+                    patch.object(cli, 'CONFIG_FILE', os.path.join(temp_dir, 'config.ini')):
+                stdout = io.StringIO()
+                exit_code = cli.main(['check', '-f', log_path, '--column', '3', '--format', 'text'], stdin=io.StringIO(), stdout=stdout)
+                self.assertEqual(exit_code, cli.EXIT_INVALID_INPUT)
+                self.assertEqual(stdout.getvalue().splitlines(), [
+                    'blocked\thttps://ads.example.com/a\texample.com', 'allowed\thttps://other.org/', 'invalid\thttp://:1'
+                ])
+                stdout = io.StringIO()
+                exit_code = cli.main(['check', 'example.com/x'], stdin=io.StringIO(), stdout=stdout)
+                self.assertEqual(exit_code, cli.EXIT_OK)
+                self.assertEqual(json.loads(stdout.getvalue())['results'],
+                                 [{'url': 'example.com/x', 'status': 'blocked', 'entry': 'example.com'}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# test_domain_manager_gui_part24.py
+
+"""
+Test Suite Part 24: Config Service
+
+This test suite covers the in-memory config service: atomic writes, coalesced writes inside batch(), and picking up edits made to config.ini outside the application.
+"""
+
+import unittest
+import sys
+import os
+import configparser
+import tempfile
+from unittest.mock import patch
+
+# Adjust the path to import config_service
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config_service
+from config_service import ConfigService
+
+class TestConfigService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.temp_dir.name, 'config.ini')
+        self.service = ConfigService(self.config_file)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_file(self):
+        config = configparser.ConfigParser()
+        config.read(self.config_file)
+        return config
+
+    def edit_file(self, section, key, value):
+        # An edit made by hand or by another process, with an mtime the service has not seen
+        config = self.read_file()
+        config.set(section, key, value)
+        with open(self.config_file, 'w') as config_file:
+            config.write(config_file)
+        stat = os.stat(self.config_file)
+        os.utime(self.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    def test_writes_replace_the_file_atomically(self):
+        with patch.object(config_service.os, 'replace', wraps=os.replace) as mock_replace:
+            self.service.set('Theme', 'theme', True)
+        mock_replace.assert_called_once()
+        self.assertEqual(mock_replace.call_args[0][1], self.config_file)
+        self.assertEqual(self.read_file().get('Theme', 'theme'), 'True')
+        self.assertEqual(os.listdir(self.temp_dir.name), ['config.ini'])
+
+    def test_batch_coalesces_writes(self):
+        with patch.object(self.service, 'flush', wraps=self.service.flush) as mock_flush:
+            with self.service.batch():
+                self.service.set('Theme', 'theme', True)
+                self.service.set('Logging', 'logging', True)
+                self.assertEqual(self.read_file().get('Theme', 'theme'), 'False')
+        mock_flush.assert_called_once()
+        self.assertEqual((self.read_file().get('Theme', 'theme'), self.read_file().get('Logging', 'logging')), ('True', 'True'))
+
+    def test_external_edit_is_reloaded_before_a_write(self):
+        self.edit_file('Logging', 'logging', 'True')
+        self.service.set('Theme', 'theme', True)
+        self.assertEqual(self.service.get('Logging', 'logging'), 'True')
+        self.assertEqual(self.read_file().get('Logging', 'logging'), 'True')
+
+    def test_external_edit_during_a_batch_is_merged(self):
+        with self.service.batch():
+            self.service.set('Theme', 'theme', True)
+            self.edit_file('Logging', 'logging', 'True')
+        config = self.read_file()
+        self.assertEqual((config.get('Theme', 'theme'), config.get('Logging', 'logging')), ('True', 'True'))
+
+if __name__ == '__main__':
+    unittest.main()
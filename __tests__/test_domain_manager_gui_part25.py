@@ -0,0 +1,43 @@
+# test_domain_manager_gui_part25.py
+
+"""
+Test Suite Part 25: Runtime Counters
+
+This test suite covers the runtime counter snapshot shown on the Diagnostics tab.
+"""
+
+import unittest
+import sys
+import os
+import json
+
+# Adjust the path to import diagnostics
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from diagnostics import RuntimeCounters
+
+class TestRuntimeCounters(unittest.TestCase):
+    def test_snapshot(self):
+        counters = RuntimeCounters()
+        counters.record_backend_call('add_domains', 3.0)
+        counters.record_backend_call('add_domains', 700.0)
+        counters.record_search(1.5)
+        row_count = lambda: 42
+        counters.register_rows("Blocked Domains list", row_count)
+        counters.register_rows("Broken list", lambda: 1 / 0)
+
+        snapshot = json.loads(json.dumps(counters.snapshot()))
+        self.assertEqual(snapshot['backend_calls']['add_domains']['buckets'], {'<=5ms': 1, '<=1000ms': 1})
+        self.assertEqual(snapshot['backend_calls']['add_domains']['max_ms'], 700.0)
+        self.assertEqual(snapshot['search_queries'], 1)
+        self.assertEqual(snapshot['rows']['Blocked Domains list'], 42)
+        self.assertTrue(snapshot['rows']['Broken list'].startswith("unavailable"))
+        self.assertIn('rss_bytes', snapshot['memory'])
+
+        counters.unregister_rows("Blocked Domains list", lambda: 42)  # Another window's counter is left alone
+        self.assertIn("Blocked Domains list", counters.row_counts())
+        counters.unregister_rows("Blocked Domains list", row_count)
+        self.assertNotIn("Blocked Domains list", counters.row_counts())
+
+if __name__ == '__main__':
+    unittest.main()
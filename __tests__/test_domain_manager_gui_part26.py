@@ -0,0 +1,57 @@
+# test_domain_manager_gui_part26.py
+
+"""
+Test Suite Part 26: Logging Pipeline
+
+This test suite covers the per-category log levels of the logging pipeline and the queue listener that writes records to the log file off the calling thread.
+"""
+
+import unittest
+import sys
+import os
+import logging
+import tempfile
+import threading
+
+# Adjust the path to import logging_pipeline
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import logging_pipeline
+
+class TestLoggingPipeline(unittest.TestCase):
+    def setUp(self):
+        self.saved = (logging_pipeline._logging_enabled, dict(logging_pipeline._category_enabled))
+
+    def tearDown(self):
+        logging_pipeline.stop_logging()
+        logging_pipeline.configure(*self.saved)
+
+    def test_category_levels_follow_settings(self):
+        logging_pipeline.configure(True, {"Audit Logs": True, "User Activity Logs": False})
+        self.assertEqual(logging_pipeline.get_logger("Audit Logs").level, logging.WARNING)
+        self.assertEqual(logging_pipeline.get_logger("Success/Error Logs").level, logging.INFO)
+        self.assertFalse(logging_pipeline.get_logger("User Activity Logs").isEnabledFor(logging.CRITICAL))
+
+        logging_pipeline.configure(False)
+        self.assertFalse(logging_pipeline.get_logger("Audit Logs").isEnabledFor(logging.CRITICAL))
+        self.assertFalse(logging_pipeline.is_category_enabled("Audit Logs"))
+
+    def test_queue_listener_writes_records_off_the_calling_thread(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = os.path.join(temp_dir, 'domain_manager.log')
+            logging_pipeline.start_logging(True, {"Success/Error Logs": True}, log_file=log_file)
+            file_handler = logging_pipeline._listener.handlers[0]
+            writer_threads = []
+            real_emit = file_handler.emit
+            file_handler.emit = lambda record: (writer_threads.append(threading.current_thread()), real_emit(record))
+
+            logging_pipeline.get_logger("Success/Error Logs").info("Exported %d domain(s)", 3)
+            logging_pipeline.stop_logging()  # Drains the queue and closes the file
+
+            self.assertEqual(len(writer_threads), 1)
+            self.assertIsNot(writer_threads[0], threading.current_thread())
+            with open(log_file, encoding='utf-8') as log:
+                self.assertIn("domain_manager.results - INFO - Exported 3 domain(s)", log.read())
+
+if __name__ == '__main__':
+    unittest.main()
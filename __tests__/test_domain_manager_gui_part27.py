@@ -0,0 +1,54 @@
+# test_domain_manager_gui_part27.py
+
+"""
+Test Suite Part 27: Performance Tracing
+
+This test suite covers timing spans, the Chrome trace file and the percentile summary written at the end of a session.
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+from unittest.mock import patch
+
+# Adjust the path to import perf_trace
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import perf_trace
+from perf_trace import Tracer, NULL_SPAN
+
+class TestTracer(unittest.TestCase):
+    def test_spans_are_recorded_only_while_enabled(self):
+        tracer = Tracer()
+        self.assertIs(tracer.span("gui.search"), NULL_SPAN)
+
+        tracer.set_enabled(True)
+        with tracer.span("gui.search", rows=10) as search_span:
+            search_span.set(found=2)
+        with self.assertRaises(ZeroDivisionError):
+            with tracer.span("backend.add_domains"):
+                1 / 0
+        self.assertEqual([(event[0], event[4]) for event in tracer.events], [
+            ("gui.search", {'rows': 10, 'found': 2}), ("backend.add_domains", {'error': 'ZeroDivisionError'})
+        ])
+
+    def test_end_session_writes_trace_and_percentiles(self):
+        tracer = Tracer()
+        for duration_ms in range(1, 101):
+            tracer.record("backend.add_domains", 0, duration_ms * 1_000_000, {})
+        summary = tracer.summary()["backend.add_domains"]
+        self.assertEqual((summary['count'], summary['p50_ms'], summary['p95_ms'], summary['max_ms']), (100, 50.0, 95.0, 100.0))
+
+        with tempfile.TemporaryDirectory() as temp_dir, patch.object(perf_trace, 'TRACE_DIR', temp_dir):
+            path = tracer.end_session()
+            self.assertEqual(os.path.dirname(path), temp_dir)
+            with open(path) as trace_file:
+                events = json.load(trace_file)['traceEvents']
+        self.assertEqual(len(events), 100)
+        self.assertEqual((events[-1]['ph'], events[-1]['dur']), ('X', 100000.0))
+        self.assertIsNone(tracer.end_session())  # Nothing recorded since
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,7 @@ This test suite covers the search functionality and display elements of the Doma
 import unittest
 import sys
 import os
+import tempfile
 from unittest.mock import patch
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtTest import QTest
@@ -25,6 +26,15 @@ class TestDomainManagerGUISearchDisplay(unittest.TestCase):
         cls.app = QApplication(sys.argv)
 
     def setUp(self):
+        # A config with both prompts switched off, so no modal dialog blocks the suite on a fresh checkout
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        config_file = os.path.join(temp_dir.name, 'config.ini')
+        with open(config_file, 'w') as file:
+            file.write("[Theme]\nshow_prompt = False\n\n[Logging]\nshow_prompt = False\n")
+        config_patch = patch.object(domain_manager_gui, 'CONFIG_FILE', config_file)
+        config_patch.start()
+        self.addCleanup(config_patch.stop)
         self.gui = domain_manager_gui.DomainManagerGUI()
 
     def tearDown(self):
@@ -35,16 +45,20 @@ class TestDomainManagerGUISearchDisplay(unittest.TestCase):
         QTest.keyClicks(self.gui.search_entry, 'example')
         self.gui.search_domains()
         self.assertEqual(self.gui.existing_domains_list.count(), 1)
-        self.assertEqual(self.gui.existing_domains_list.item(0).text(), 'example.com')
+        self.assertEqual(self.gui.existing_domains_list.domain(0), 'example.com')
 
     def test_display_brave_status(self):
         with patch.object(dm_functions, 'check_brave_installation', return_value=True):
             self.gui.display_brave_status()
+            self.assertTrue(self.gui.backend_executor.wait_for_idle())
+            self.gui.feedback_text.flush()
             self.assertIn('Brave is installed on this system.', self.gui.feedback_text.toPlainText())
 
     def test_display_registry_path(self):
         with patch.object(dm_functions, 'check_registry_path', return_value='Registry path is correct.'):
             self.gui.display_registry_path()
+            self.assertTrue(self.gui.backend_executor.wait_for_idle())
+            self.gui.feedback_text.flush()
             self.assertIn('Registry path is correct.', self.gui.feedback_text.toPlainText())
 
 if __name__ == '__main__':
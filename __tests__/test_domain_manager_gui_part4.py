@@ -9,12 +9,14 @@ This test suite covers the file handling and domain processing functionalities o
 import unittest
 import sys
 import os
+import tempfile
 from unittest.mock import patch
 from PyQt5.QtWidgets import QApplication, QFileDialog, QMessageBox
 
 # Adjust the path to import domain_manager_gui and domain_manager_functions
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import bulk_jobs
 import domain_manager_gui
 import domain_manager_functions as dm_functions
 
@@ -24,6 +26,15 @@ class TestDomainManagerGUIFileHandling(unittest.TestCase):
         cls.app = QApplication(sys.argv)
 
     def setUp(self):
+        # A config with both prompts switched off, so no modal dialog blocks the suite on a fresh checkout
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        config_file = os.path.join(temp_dir.name, 'config.ini')
+        with open(config_file, 'w') as file:
+            file.write("[Theme]\nshow_prompt = False\n\n[Logging]\nshow_prompt = False\n")
+        config_patch = patch.object(domain_manager_gui, 'CONFIG_FILE', config_file)
+        config_patch.start()
+        self.addCleanup(config_patch.stop)
         self.gui = domain_manager_gui.DomainManagerGUI()
 
     def tearDown(self):
@@ -45,17 +56,21 @@ class TestDomainManagerGUIFileHandling(unittest.TestCase):
         file_name = 'test.txt'
         with patch.object(dm_functions, 'process_text_file', return_value=[('1', 'example.com')]) as mock_process:
             self.gui.populate_file_domains_list(file_path, file_name)
+            self.assertTrue(self.gui.backend_executor.wait_for_idle())
             self.assertTrue(mock_process.called)
             self.assertEqual(self.gui.file_domains_list.count(), 1)
-            self.assertEqual(self.gui.file_domains_list.item(0).text(), 'example.com')
+            self.assertEqual(self.gui.file_domains_list.domain(0), 'example.com')
 
     def test_process_domains_from_list(self):
-        self.gui.file_cached_domains = [('test.txt', ['example.com'])]
+        self.gui.staged_domains.add_source('test.txt', ['example.com'])
         with patch.object(QMessageBox, 'question', return_value=QMessageBox.Yes):
-            with patch.object(dm_functions, 'add_domain', return_value='Domain example.com added.') as mock_add:
+            with patch.object(dm_functions, 'add_domains', return_value={'added': ['example.com'], 'skipped': []}) as mock_add:
                 self.gui.process_domains_from_list('Add')
-                self.assertTrue(mock_add.called)
-                self.assertIn('Domain example.com added.', self.gui.feedback_text.toPlainText())
+                self.assertTrue(self.gui.backend_executor.wait_for_idle())
+                mock_add.assert_called_once_with(['example.com'], 'test.txt')  # One call, journaled, with no job file
+                self.assertEqual(bulk_jobs.find_unfinished_jobs(), [])
+                self.gui.feedback_text.flush()
+                self.assertIn("Domain 'example.com' added successfully to the registry.", self.gui.feedback_text.toPlainText())
 
 if __name__ == '__main__':
     unittest.main()
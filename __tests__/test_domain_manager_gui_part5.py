@@ -0,0 +1,59 @@
+# test_domain_manager_gui_part5.py
+
+"""
+Test Suite Part 5: Feedback Console
+
+This test suite covers the batched feedback console, including repeated message collapsing, tallies and the line cap.
+"""
+
+import unittest
+import sys
+import os
+from PyQt5.QtWidgets import QApplication, QLabel
+
+# Adjust the path to import feedback_console
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from feedback_console import FeedbackConsole
+
+class TestFeedbackConsole(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.console = FeedbackConsole()
+
+    def test_repeated_messages_are_collapsed(self):
+        for _ in range(3):
+            self.console.post("Domain already exists.")
+        self.console.flush()
+        self.assertEqual(self.console.toPlainText(), "Domain already exists. (x3)")
+
+    def test_tallies_are_summarised_when_batch_ends(self):
+        with self.console.batch():
+            for _ in range(1204):
+                self.console.tally("invalid", "{count:,} invalid lines skipped")
+            self.console.flush()
+            self.assertEqual(self.console.toPlainText(), "")
+        self.console.flush()
+        self.assertEqual(self.console.toPlainText(), "1,204 invalid lines skipped")
+
+    def test_line_count_is_capped(self):
+        console = FeedbackConsole(max_lines=10)
+        for i in range(25):
+            console.post(f"line {i}")
+            console.flush()
+        self.assertEqual(console.document().blockCount(), 10)
+        self.assertTrue(console.toPlainText().endswith("line 24"))
+
+    def test_status_label_gets_latest_text_only(self):
+        label = QLabel()
+        for i in range(100):
+            self.console.set_status(label, f"Adding domain{i}.com")
+        self.assertEqual(label.text(), "")
+        self.console.flush()
+        self.assertEqual(label.text(), "Adding domain99.com")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# test_domain_manager_gui_part6.py
+
+"""
+Test Suite Part 6: Batched Backend Calls and the Operation Journal
+
+This test suite covers batched add/remove against the simulated registry and journaled undo/redo, including history that survives a restart.
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+from unittest.mock import patch
+
+# Adjust the path to import domain_manager_functions
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import domain_manager_functions as dm_functions
+import operation_journal
+from simulated_registry import SIMULATED_REGISTRY_ENV
+
+class TestBatchedJournal(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry_path = os.path.join(self.temp_dir.name, 'registry.json')
+        journal_path = os.path.join(self.temp_dir.name, 'operations.journal')
+        self.patchers = [
+            patch.dict(os.environ, {SIMULATED_REGISTRY_ENV: self.registry_path}),
+            patch.object(dm_functions, 'JOURNAL_FILE', journal_path),
+            patch.object(dm_functions, 'CATALOG_FILE', os.path.join(self.temp_dir.name, 'domains.catalog'))
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        dm_functions.close_journal()
+        dm_functions.close_catalog()
+
+    def tearDown(self):
+        dm_functions.close_journal()
+        dm_functions.close_catalog()
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.temp_dir.cleanup()
+
+    def registry_values(self):
+        with open(self.registry_path) as registry_file:
+            return sorted(json.load(registry_file).values())
+
+    def test_add_domains_is_one_backend_call(self):
+        with patch.object(dm_functions, 'execute_powershell_script', wraps=dm_functions.execute_powershell_script) as mock_execute:
+            result = dm_functions.add_domains(['a.com', 'b.com', 'a.com'])
+        self.assertEqual(mock_execute.call_count, 1)
+        self.assertEqual(result, {'added': ['a.com', 'b.com'], 'skipped': ['a.com']})
+
+    def test_undo_and_redo_apply_inverse_batch(self):
+        dm_functions.add_domains(['a.com', 'b.com', 'c.com'], 'feed.txt')
+        dm_functions.remove_domains(['b.com'])
+        self.assertEqual(self.registry_values(), ['a.com', 'c.com'])
+
+        self.assertEqual(dm_functions.undo_action(), "Undo: b.com removed")
+        self.assertEqual(self.registry_values(), ['a.com', 'b.com', 'c.com'])
+        with patch.object(dm_functions, 'execute_powershell_script', wraps=dm_functions.execute_powershell_script) as mock_execute:
+            self.assertEqual(dm_functions.undo_action(), "Undo: 3 domains added (feed.txt)")
+        self.assertEqual(mock_execute.call_count, 1)
+        self.assertEqual(self.registry_values(), [])
+
+        self.assertEqual(dm_functions.redo_action(), "Redo: 3 domains added (feed.txt)")
+        self.assertEqual(self.registry_values(), ['a.com', 'b.com', 'c.com'])
+
+    def test_history_survives_restart(self):
+        dm_functions.add_domains(['a.com'])
+        dm_functions.add_domains(['b.com'])
+        dm_functions.undo_action()
+        dm_functions.close_journal()
+
+        journal = dm_functions.get_journal()
+        self.assertEqual([entry['domains'] for entry in journal.undo_stack], [['a.com']])
+        self.assertEqual([entry['domains'] for entry in journal.redo_stack], [['b.com']])
+        self.assertEqual(dm_functions.redo_action(), "Redo: b.com added")
+        self.assertEqual(self.registry_values(), ['a.com', 'b.com'])
+
+    def test_large_batch_is_journaled_by_reference(self):
+        domains = [f"site{i}.com" for i in range(5)]
+        with patch.object(operation_journal, 'MAX_INLINE_DOMAINS', 3):
+            dm_functions.add_domains(domains, 'feed.txt')
+        dm_functions.close_journal()
+
+        entry = dm_functions.get_journal().undo_stack[-1]
+        self.assertNotIn('domains', entry)
+        self.assertEqual(entry['count'], 5)
+        self.assertEqual(dm_functions.undo_action(), "Undo: 5 domains added (feed.txt)")
+        self.assertEqual(self.registry_values(), [])
+
+    def test_nothing_to_undo(self):
+        self.assertEqual(dm_functions.undo_action(), "No actions to undo.")
+        self.assertEqual(dm_functions.redo_action(), "No actions to redo.")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# test_domain_manager_gui_part7.py
+
+"""
+Test Suite Part 7: Resumable Bulk Jobs
+
+This test suite covers chunked bulk jobs against the simulated registry: checkpointing, resuming after an interruption, and sync jobs.
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+from unittest.mock import patch
+
+# Adjust the path to import bulk_jobs
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import bulk_jobs
+import domain_manager_functions as dm_functions
+from simulated_registry import SIMULATED_REGISTRY_ENV
+
+class TestBulkJobs(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry_path = os.path.join(self.temp_dir.name, 'registry.json')
+        self.jobs_dir = os.path.join(self.temp_dir.name, 'jobs')
+        journal_path = os.path.join(self.temp_dir.name, 'operations.journal')
+        self.patchers = [
+            patch.dict(os.environ, {SIMULATED_REGISTRY_ENV: self.registry_path}),
+            patch.object(dm_functions, 'JOURNAL_FILE', journal_path),
+            patch.object(dm_functions, 'CATALOG_FILE', os.path.join(self.temp_dir.name, 'domains.catalog'))
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        dm_functions.close_journal()
+        dm_functions.close_catalog()
+
+    def tearDown(self):
+        dm_functions.close_journal()
+        dm_functions.close_catalog()
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.temp_dir.cleanup()
+
+    def registry_values(self):
+        with open(self.registry_path) as registry_file:
+            return sorted(json.load(registry_file).values())
+
+    def test_interrupted_job_resumes_after_last_chunk(self):
+        domains = [f"site{i}.com" for i in range(5)]
+        job = bulk_jobs.create_job('add', domains, 'feed.txt', chunk_size=2, jobs_dir=self.jobs_dir)
+        real_add = dm_functions.add_domains
+        calls = []
+
+        def failing_add(step_domains, journal=True, source=None):
+            calls.append(step_domains)
+            if len(calls) == 2:
+                return "PowerShell was terminated."
+            return real_add(step_domains, journal=journal)
+
+        with patch.object(dm_functions, 'add_domains', side_effect=failing_add):
+            self.assertEqual(job.run(), "PowerShell was terminated.")
+        self.assertEqual(self.registry_values(), ['site0.com', 'site1.com'])
+
+        resumed = bulk_jobs.find_unfinished_jobs(self.jobs_dir)
+        self.assertEqual(len(resumed), 1)
+        self.assertEqual(resumed[0].committed_domains, 2)
+        with patch.object(dm_functions, 'add_domains', wraps=dm_functions.add_domains) as mock_add:
+            self.assertIsNone(resumed[0].run())
+        self.assertEqual(mock_add.call_count, 2)
+        self.assertEqual(self.registry_values(), sorted(domains))
+        self.assertEqual(bulk_jobs.find_unfinished_jobs(self.jobs_dir), [])
+        self.assertEqual(dm_functions.undo_action(), "Undo: 5 domains added (feed.txt)")
+
+    def test_sync_job_adds_and_removes_difference(self):
+        dm_functions.add_domains(['a.com', 'b.com'], journal=False)
+        job = bulk_jobs.create_sync_job(['b.com', 'c.com'], ['a.com', 'b.com'], 'list.txt', jobs_dir=self.jobs_dir)
+        self.assertIsNone(job.run())
+        self.assertEqual(self.registry_values(), ['b.com', 'c.com'])
+        self.assertEqual((job.changed_count('add'), job.unchanged_count('add')), (1, 0))
+        self.assertEqual((job.changed_count('remove'), job.unchanged_count('remove')), (1, 0))
+        self.assertEqual(dm_functions.undo_action(), "Undo: c.com added (list.txt)")
+
+    def test_sync_diff_ignores_case(self):
+        removals, additions = bulk_jobs.sync_diff(['Example.com', 'new.com', 'NEW.com'], ['example.com', 'old.com'])
+        self.assertEqual((removals, additions), (['old.com'], ['new.com']))
+
+    def test_abandoned_job_journals_committed_chunks(self):
+        job = bulk_jobs.create_job('add', ['a.com', 'b.com', 'c.com'], 'feed.txt', chunk_size=2, jobs_dir=self.jobs_dir)
+        self.assertIsNone(job.run_step(0))
+        resumed = bulk_jobs.find_unfinished_jobs(self.jobs_dir)[0]
+        resumed.abandon()
+        self.assertEqual(bulk_jobs.find_unfinished_jobs(self.jobs_dir), [])
+        self.assertEqual(dm_functions.undo_action(), "Undo: 2 domains added (feed.txt)")
+        self.assertEqual(self.registry_values(), [])
+
+if __name__ == '__main__':
+    unittest.main()
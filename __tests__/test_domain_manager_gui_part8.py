@@ -0,0 +1,129 @@
+# test_domain_manager_gui_part8.py
+
+"""
+Test Suite Part 8: Backend Executor
+
+This test suite covers running backend work on the worker thread, running read-only computations beside it, delivering results on the GUI thread, and cancelling a bulk job between chunks.
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+import threading
+from unittest.mock import patch
+from PyQt5.QtWidgets import QApplication
+
+# Adjust the path to import backend_executor
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import bulk_jobs
+import domain_manager_functions as dm_functions
+import backend_executor
+from backend_executor import BackendExecutor
+from simulated_registry import SIMULATED_REGISTRY_ENV
+
+class TestBackendExecutor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.executor = BackendExecutor()
+        self.busy_states = []
+        self.executor.busy_changed.connect(self.busy_states.append)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_task_runs_on_worker_and_reports_on_gui_thread(self):
+        threads = {}
+
+        def work(value):
+            threads['work'] = threading.get_ident()
+            return value * 2
+
+        def on_result(result):
+            threads['result'] = threading.get_ident()
+            threads['value'] = result
+
+        self.executor.submit("double", work, 21, on_result=on_result, exclusive=True)
+        self.assertTrue(self.executor.is_busy())
+        self.assertTrue(self.executor.wait_for_idle())
+        self.assertEqual(threads['value'], 42)
+        self.assertNotEqual(threads['work'], threading.get_ident())
+        self.assertEqual(threads['result'], threading.get_ident())
+        self.assertEqual(self.busy_states, [True, False])
+
+    def test_exception_is_reported_as_error_message(self):
+        results = []
+        self.executor.submit("explode", lambda: 1 / 0, on_result=results.append)
+        self.assertTrue(self.executor.wait_for_idle())
+        self.assertEqual(results, ["explode failed: division by zero"])
+        self.assertEqual(self.busy_states, [])
+
+    def test_failing_result_callback_still_retires_the_task(self):
+        def on_result(result):
+            raise RuntimeError("callback bug")
+
+        self.executor.submit("work", lambda: 1, on_result=on_result, exclusive=True)
+        with self.assertLogs(backend_executor.results_log, level='ERROR') as logs:
+            self.assertTrue(self.executor.wait_for_idle())
+        self.assertIn("Result callback of backend task work failed", logs.output[0])
+        self.assertFalse(self.executor.is_busy())
+        self.assertEqual(self.busy_states, [True, False])
+
+    def test_compute_task_runs_beside_a_running_write(self):
+        # The write only finishes once the compute task has run, which would time out on a single thread
+        computed = threading.Event()
+        results = []
+        self.executor.submit("write", computed.wait, 5, on_result=results.append)
+        self.executor.submit_compute("group domains", computed.set, on_result=lambda result: results.append("grouped"))
+        self.assertTrue(self.executor.wait_for_idle())
+        self.assertEqual(results, ["grouped", True])
+
+    def test_cancel_stops_job_between_chunks(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            patchers = [
+                patch.dict(os.environ, {SIMULATED_REGISTRY_ENV: os.path.join(temp_dir, 'registry.json')}),
+                patch.object(dm_functions, 'JOURNAL_FILE', os.path.join(temp_dir, 'operations.journal')),
+                patch.object(dm_functions, 'CATALOG_FILE', os.path.join(temp_dir, 'domains.catalog'))
+            ]
+            for patcher in patchers:
+                patcher.start()
+            dm_functions.close_journal()
+            dm_functions.close_catalog()
+            try:
+                job = bulk_jobs.create_job('add', ['a.com', 'b.com', 'c.com'], 'feed.txt', chunk_size=1, jobs_dir=temp_dir)
+                results = []
+                entered, release = threading.Event(), threading.Event()
+                real_add = dm_functions.add_domains
+
+                def gated_add(domains, journal=True, source=None):
+                    entered.set()
+                    release.wait(5)  # Holds the first chunk until the cancel has been requested
+                    return real_add(domains, journal=journal)
+
+                with patch.object(dm_functions, 'add_domains', side_effect=gated_add):
+                    self.executor.submit(
+                        "add job", job.run_steps, on_result=results.append, on_progress=lambda done, total: None,
+                        cancel=lambda: setattr(job, 'cancel_requested', True), exclusive=True
+                    )
+                    self.assertTrue(entered.wait(5))
+                    self.executor.cancel()
+                    release.set()
+                    self.assertTrue(self.executor.wait_for_idle())
+                self.assertEqual(results, ["cancelled"])
+                self.assertEqual(job.committed_domains, 1)
+                self.assertEqual(len(bulk_jobs.find_unfinished_jobs(temp_dir)), 1)
+                with open(os.path.join(temp_dir, 'registry.json')) as registry_file:
+                    self.assertEqual(len(json.load(registry_file)), job.committed_domains)
+            finally:
+                dm_functions.close_journal()
+                dm_functions.close_catalog()
+                for patcher in reversed(patchers):
+                    patcher.stop()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# test_domain_manager_gui_part9.py
+
+"""
+Test Suite Part 9: Priority Job Scheduler
+
+This test suite covers priority ordering, bulk jobs yielding to interactive edits at chunk boundaries, and coalescing of queued writes to the same domain.
+"""
+
+import unittest
+import sys
+import os
+
+# Adjust the path to import job_scheduler
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from job_scheduler import JobScheduler, ScheduledTask, INTERACTIVE, BULK, BACKGROUND
+
+class TestJobScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = JobScheduler()
+        self.log = []
+        self.results = {}
+
+    def task(self, name, priority, key=None, op=None):
+        def record_result(result):
+            self.results[name] = result
+        return ScheduledTask(name, self.log.append, (name,), priority=priority, key=key, on_done=record_result, op=op)
+
+    def run_all(self):
+        while self.scheduler.pending():
+            self.scheduler.run_next(timeout=0)
+
+    def test_priority_classes_run_in_order(self):
+        self.scheduler.submit(self.task("refresh", BACKGROUND))
+        self.scheduler.submit(self.task("import", BULK))
+        self.scheduler.submit(self.task("add one", INTERACTIVE))
+        self.scheduler.submit(self.task("add two", INTERACTIVE))
+        self.run_all()
+        self.assertEqual(self.log, ["add one", "add two", "import", "refresh"])
+
+    def test_bulk_job_yields_to_interactive_edit_at_chunk_boundary(self):
+        def bulk_job():
+            for chunk in range(3):
+                self.log.append(f"chunk {chunk}")
+                if chunk == 0:
+                    self.scheduler.submit(self.task("add one", INTERACTIVE))
+                yield
+            return "done"
+
+        self.scheduler.submit(ScheduledTask("import", bulk_job, on_done=lambda result: self.results.update(import_=result)))
+        self.scheduler.submit(self.task("later import", BULK))
+        self.run_all()
+        self.assertEqual(self.log, ["chunk 0", "add one", "chunk 1", "chunk 2", "later import"])
+        self.assertEqual(self.results['import_'], "done")
+
+    def test_queued_writes_to_same_domain_are_coalesced(self):
+        self.scheduler.submit(self.task("add example.com", INTERACTIVE, key="example.com"))
+        self.scheduler.submit(self.task("add other.com", INTERACTIVE, key="other.com"))
+        self.scheduler.submit(self.task("remove example.com", INTERACTIVE, key="example.com"))
+        self.run_all()
+        self.assertEqual(self.log, ["add other.com", "remove example.com"])
+        self.assertIn("superseded", self.results["add example.com"])
+
+    def test_opposite_queued_writes_cancel_out(self):
+        self.scheduler.submit(self.task("add example.com", INTERACTIVE, key="example.com", op='add'))
+        self.scheduler.submit(self.task("remove example.com", INTERACTIVE, key="example.com", op='remove'))
+        self.assertEqual(self.scheduler.pending(), 0)
+        self.run_all()
+        self.assertEqual(self.log, [])  # No backend call was made
+        self.assertIn("cancelled", self.results["add example.com"])
+        self.assertIn("cancelled", self.results["remove example.com"])
+
+        self.scheduler.submit(self.task("add again", INTERACTIVE, key="example.com", op='add'))
+        self.run_all()
+        self.assertEqual(self.log, ["add again"])
+
+    def test_write_not_known_to_change_the_list_is_superseded(self):
+        # Adding a domain that is already listed changes nothing, so a remove queued behind it must still run
+        self.scheduler.submit(self.task("add example.com", INTERACTIVE, key="example.com"))
+        self.scheduler.submit(self.task("remove example.com", INTERACTIVE, key="example.com", op='remove'))
+        self.run_all()
+        self.assertEqual(self.log, ["remove example.com"])
+        self.assertIn("superseded", self.results["add example.com"])
+
+    def test_exception_becomes_error_result(self):
+        self.scheduler.submit(ScheduledTask("explode", lambda: 1 / 0, on_done=lambda result: self.results.update(explode=result)))
+        self.run_all()
+        self.assertEqual(self.results['explode'], "explode failed: division by zero")
+
+    def test_close_drops_queued_work(self):
+        self.scheduler.submit(self.task("import", BULK))
+        self.scheduler.close()
+        self.assertFalse(self.scheduler.run_next(timeout=0))
+        self.assertEqual(self.log, [])
+
+if __name__ == '__main__':
+    unittest.main()
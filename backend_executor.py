@@ -0,0 +1,134 @@
+# backend_executor.py
+
+# Standard library imports
+import itertools
+
+# PyQt5 imports
+from PyQt5.QtCore import QObject, QThread, QCoreApplication, QEventLoop, QDeadlineTimer, pyqtSignal
+
+# Local imports
+import logging_pipeline
+from job_scheduler import JobScheduler, ScheduledTask, INTERACTIVE, BULK, BACKGROUND
+
+# Constants
+IDLE_POLL_MS = 20
+
+# Loggers
+results_log = logging_pipeline.get_logger("Success/Error Logs")
+
+class BackendTask(ScheduledTask):
+    _ids = itertools.count(1)
+
+    def __init__(self, name, function, args, priority, key=None, on_result=None, on_progress=None, cancel=None, exclusive=False, op=None):
+        super().__init__(name, function, args, priority=priority, key=key, op=op)
+        self.task_id = next(self._ids)
+        self.exclusive = exclusive  # Conflicting actions are disabled until exclusive tasks finish
+        self.on_result = on_result
+        self.on_progress = on_progress
+        self.cancel_callback = cancel
+
+    def cancel(self):
+        # Only tasks that work in chunks can stop early; anything else runs to completion
+        if self.cancel_callback is not None:
+            self.cancel_callback()
+
+# The worker thread is the scheduler's single writer. Everything it reports goes back through queued signals.
+class BackendWorker(QThread):
+    task_progress = pyqtSignal(object, int, int)
+    task_finished = pyqtSignal(object, object)
+
+    def __init__(self, scheduler, name="BackendThread"):
+        super().__init__()
+        self.setObjectName(name)
+        self.scheduler = scheduler
+
+    def run(self):
+        while self.scheduler.run_next():
+            pass
+
+# The BackendExecutor is owned by the GUI thread. Callbacks for progress and results are delivered back on the GUI
+# thread through queued signals, so they may touch widgets freely. Computations that never touch the registry, such as
+# grouping the block list, run on a second worker with its own queue, so they never hold up a write.
+class BackendExecutor(QObject):
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pending_tasks = []
+        self.is_shut_down = False
+
+        self.scheduler = JobScheduler()
+        self.worker = BackendWorker(self.scheduler)
+        self.compute_scheduler = JobScheduler()
+        self.compute_worker = BackendWorker(self.compute_scheduler, "ComputeThread")
+        for worker in (self.worker, self.compute_worker):
+            worker.task_progress.connect(self.on_task_progress)
+            worker.task_finished.connect(self.on_task_finished)
+            worker.start()
+
+    def submit(self, name, function, *args, priority=BULK, key=None, on_result=None, on_progress=None, cancel=None, exclusive=False, op=None,
+               compute=False):
+        was_busy = self.is_busy()
+        worker = self.compute_worker if compute else self.worker
+        task = BackendTask(name, function, args, priority, key, on_result, on_progress, cancel, exclusive, op)
+        task.on_done = lambda result: worker.task_finished.emit(task, result)
+        if on_progress is not None:
+            task.kwargs['progress'] = lambda done, total: worker.task_progress.emit(task, done, total)
+        self.pending_tasks.append(task)
+        if exclusive and not was_busy:
+            self.busy_changed.emit(True)
+        worker.scheduler.submit(task)
+        return task
+
+    def submit_interactive(self, name, function, *args, **options):
+        return self.submit(name, function, *args, priority=INTERACTIVE, **options)
+
+    def submit_background(self, name, function, *args, **options):
+        return self.submit(name, function, *args, priority=BACKGROUND, **options)
+
+    def submit_compute(self, name, function, *args, **options):
+        # Only for functions that read their arguments and nothing else; they run beside the single writer
+        return self.submit(name, function, *args, priority=INTERACTIVE, compute=True, **options)
+
+    def is_busy(self):
+        return any(task.exclusive for task in self.pending_tasks)
+
+    def cancel(self):
+        for task in self.pending_tasks:
+            task.cancel()
+
+    def on_task_progress(self, task, done, total):
+        if not self.is_shut_down and task.on_progress is not None:
+            task.on_progress(done, total)
+
+    def on_task_finished(self, task, result):
+        if self.is_shut_down:
+            return
+        # The result callback may submit follow-up work before the executor reports itself idle. A callback that
+        # raises is logged rather than re-raised, which PyQt would turn into an abort, and the task is still retired.
+        try:
+            if task.on_result is not None:
+                task.on_result(result)
+        except Exception:
+            results_log.exception("Result callback of backend task %s failed", task.name)
+        finally:
+            self.pending_tasks.remove(task)
+            if task.exclusive and not self.is_busy():
+                self.busy_changed.emit(False)
+
+    def wait_for_idle(self, timeout_ms=30000):
+        # Pumps the GUI event loop until every submitted task has delivered its result; used by tests
+        deadline = QDeadlineTimer(timeout_ms)
+        while self.pending_tasks and not deadline.hasExpired():
+            QCoreApplication.processEvents(QEventLoop.AllEvents, IDLE_POLL_MS)
+            QThread.msleep(1)
+        return not self.pending_tasks
+
+    def shutdown(self):
+        # A running bulk job stops at its next chunk boundary; results that arrive afterwards are dropped
+        if self.is_shut_down:
+            return
+        self.is_shut_down = True
+        for worker in (self.worker, self.compute_worker):
+            worker.scheduler.close()
+            worker.wait()
@@ -0,0 +1,274 @@
+# bulk_jobs.py
+
+# Standard library imports
+import glob
+import json
+import os
+import shutil
+import time
+import uuid
+
+# Local imports
+import logging_pipeline
+import domain_manager_functions as dm_functions
+
+# Constants
+JOBS_DIR = 'jobs'
+DEFAULT_CHUNK_SIZE = 500
+
+# Loggers
+results_log = logging_pipeline.get_logger("Success/Error Logs")
+
+# A BulkJob is a bulk add/remove/sync split into chunks up front and written to jobs/<id>.json.
+# Every committed chunk appends a fsynced line to jobs/<id>.progress, so a job interrupted by a crash, a logoff or
+# a killed PowerShell process resumes after its last committed chunk without rescanning the registry.
+# The job's files are removed once it finishes, and the whole job is journaled as one undoable batch per operation.
+# Only counts are kept in memory: the changed domains are streamed from the progress file into the journal, and the
+# steps of a job built from a feed diff point into a copy of the diff's files instead of listing their domains.
+class BulkJob:
+    def __init__(self, job_id, action, label, steps, created=None, jobs_dir=JOBS_DIR):
+        self.job_id = job_id
+        self.action = action
+        self.label = label
+        self.steps = steps  # [{'op': 'add' | 'remove', 'domains': [...]} or {'op', 'source', 'offset', 'count'}, ...]
+        self.created = created or time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.jobs_dir = jobs_dir
+        self.committed = {}  # step index -> how many of its domains the backend actually changed
+        self.cancel_requested = False
+
+    @property
+    def job_path(self):
+        return os.path.join(self.jobs_dir, f"{self.job_id}.json")
+
+    @property
+    def progress_path(self):
+        return os.path.join(self.jobs_dir, f"{self.job_id}.progress")
+
+    @property
+    def total_domains(self):
+        return sum(map(step_size, self.steps))
+
+    @property
+    def committed_domains(self):
+        return sum(step_size(self.steps[index]) for index in self.committed)
+
+    @property
+    def finished(self):
+        return len(self.committed) == len(self.steps)
+
+    @classmethod
+    def create(cls, action, label, steps, jobs_dir=JOBS_DIR, job_id=None):
+        job = cls(job_id or new_job_id(), action, label, steps, jobs_dir=jobs_dir)
+        job.save()
+        return job
+
+    @classmethod
+    def load(cls, job_path):
+        with open(job_path, encoding='utf-8') as job_file:
+            data = json.load(job_file)
+        job = cls(data['id'], data['action'], data['label'], data['steps'], data['created'], os.path.dirname(job_path))
+        job.load_progress()
+        return job
+
+    def save(self):
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        data = {'id': self.job_id, 'action': self.action, 'label': self.label, 'created': self.created, 'steps': self.steps}
+        temp_path = self.job_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as job_file:
+            json.dump(data, job_file, separators=(',', ':'))
+            job_file.flush()
+            os.fsync(job_file.fileno())
+        os.replace(temp_path, self.job_path)
+
+    def load_progress(self):
+        try:
+            with open(self.progress_path, encoding='utf-8') as progress_file:
+                for line in progress_file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Torn write from a crash; that chunk is simply re-applied
+                    self.committed[record['step']] = len(record['changed'])
+        except FileNotFoundError:
+            pass
+
+    def checkpoint(self, step_index, changed):
+        with open(self.progress_path, 'a', encoding='utf-8') as progress_file:
+            progress_file.write(json.dumps({'step': step_index, 'changed': changed}, separators=(',', ':')) + '\n')
+            progress_file.flush()
+            os.fsync(progress_file.fileno())
+        self.committed[step_index] = len(changed)
+
+    def pending_steps(self):
+        return [index for index in range(len(self.steps)) if index not in self.committed]
+
+    def step_domains(self, step_index):
+        step = self.steps[step_index]
+        if 'source' not in step:
+            return step['domains']
+        with open(os.path.join(self.jobs_dir, step['source']), 'rb') as source_file:
+            source_file.seek(step['offset'])
+            return [source_file.readline().decode('utf-8').rstrip('\n') for _ in range(step['count'])]
+
+    def run_step(self, step_index, on_chunk=None):
+        # Applies one chunk; returns None on success or the backend's error message
+        op = self.steps[step_index]['op']
+        domains = self.step_domains(step_index)
+        if op == 'add':
+            result = dm_functions.add_domains(domains, journal=False, source=self.label)
+            changed_key = 'added'
+        else:
+            result = dm_functions.remove_domains(domains, journal=False)
+            changed_key = 'removed'
+        if isinstance(result, str):
+            results_log.error("Job %s chunk %d failed: %s", self.job_id, step_index, result)
+            return result
+        self.checkpoint(step_index, result[changed_key])
+        if on_chunk is not None:
+            on_chunk(op, result[changed_key])
+        return None
+
+    def run(self, progress=None, on_chunk=None):
+        # progress(done_domains, total_domains) is called after every committed chunk, and on_chunk(op, changed
+        # domains) with what the chunk changed
+        steps = self.run_steps(progress, on_chunk)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+
+    def run_steps(self, progress=None, on_chunk=None):
+        # Generator form of run() that yields after every committed chunk, for the job scheduler
+        for step_index in self.pending_steps():
+            if self.cancel_requested:
+                return "cancelled"
+            error = self.run_step(step_index, on_chunk)
+            if error is not None:
+                return error
+            if progress is not None:
+                progress(self.committed_domains, self.total_domains)
+            yield
+        self.complete()
+        return None
+
+    def iter_changed(self, op):
+        # Streams the domains that the committed chunks of one operation changed, from the progress file
+        try:
+            with open(self.progress_path, encoding='utf-8') as progress_file:
+                for line in progress_file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    if self.steps[record['step']]['op'] == op:
+                        yield from record['changed']
+        except FileNotFoundError:
+            pass
+
+    def changed_count(self, op):
+        return sum(changed for index, changed in self.committed.items() if self.steps[index]['op'] == op)
+
+    def unchanged_count(self, op):
+        # Domains of committed chunks that were already present (add) or not found (remove)
+        committed = sum(step_size(self.steps[index]) for index in self.committed if self.steps[index]['op'] == op)
+        return committed - self.changed_count(op)
+
+    def ops(self):
+        return list(dict.fromkeys(step['op'] for step in self.steps))
+
+    def complete(self):
+        self.record_committed()
+        self.discard()
+
+    def abandon(self):
+        # Drops the chunks not yet applied; those already committed stay in the registry, so they are journaled
+        # and can still be undone
+        results_log.info("Job %s abandoned after %d of %d domains", self.job_id, self.committed_domains, self.total_domains)
+        self.record_committed()
+        self.discard()
+
+    def record_committed(self):
+        for op in ('remove', 'add'):
+            if self.changed_count(op):
+                dm_functions.record_batch(op, self.iter_changed(op), self.label)
+
+    def discard(self):
+        sources = {os.path.join(self.jobs_dir, step['source']) for step in self.steps if 'source' in step}
+        for path in (self.job_path, self.progress_path, *sources):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def describe(self):
+        return f"{self.action} of {self.total_domains:,} domains from {self.label} ({self.committed_domains:,} already committed)"
+
+def new_job_id():
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+def step_size(step):
+    return step['count'] if 'source' in step else len(step['domains'])
+
+def chunk_steps(op, domains, chunk_size=DEFAULT_CHUNK_SIZE):
+    domains = list(domains)
+    return [{'op': op, 'domains': domains[start:start + chunk_size]} for start in range(0, len(domains), chunk_size)]
+
+def create_job(action, domains, label, chunk_size=DEFAULT_CHUNK_SIZE, jobs_dir=JOBS_DIR):
+    if action not in ('add', 'remove'):
+        raise ValueError(f"Unsupported job action: {action}")
+    return BulkJob.create(action, label, chunk_steps(action, domains, chunk_size), jobs_dir)
+
+def sync_diff(target_domains, current_domains):
+    # Returns (removals, additions) that make current_domains match target_domains. Entries that differ only in case
+    # are the same entry, as they are to Brave.
+    current = {domain.lower() for domain in current_domains}
+    target = {}
+    for domain in target_domains:
+        target.setdefault(domain.lower(), domain)
+    removals = [domain for domain in current_domains if domain.lower() not in target]
+    additions = [domain for key, domain in target.items() if key not in current]
+    return removals, additions
+
+def create_sync_job(target_domains, current_domains, label, chunk_size=DEFAULT_CHUNK_SIZE, jobs_dir=JOBS_DIR):
+    # The diff is computed once here; resuming never needs to re-read the registry
+    return create_diff_job(*sync_diff(target_domains, current_domains), label, chunk_size, jobs_dir)
+
+def create_diff_job(removals, additions, label, chunk_size=DEFAULT_CHUNK_SIZE, jobs_dir=JOBS_DIR):
+    steps = chunk_steps('remove', removals, chunk_size) + chunk_steps('add', additions, chunk_size)
+    return BulkJob.create('sync', label, steps, jobs_dir)
+
+def file_steps(op, source, chunk_size=DEFAULT_CHUNK_SIZE, jobs_dir=JOBS_DIR):
+    # Chunks of a one-domain-per-line file, as the byte offset and line count of each; the file is scanned once
+    steps = []
+    offset = start = count = 0
+    with open(os.path.join(jobs_dir, source), 'rb') as source_file:
+        for line in source_file:
+            if count == chunk_size:
+                steps.append({'op': op, 'source': source, 'offset': start, 'count': count})
+                start, count = offset, 0
+            offset += len(line)
+            count += 1
+    if count:
+        steps.append({'op': op, 'source': source, 'offset': start, 'count': count})
+    return steps
+
+def create_feed_job(feed_diff, label, sync=False, chunk_size=DEFAULT_CHUNK_SIZE, jobs_dir=JOBS_DIR):
+    # Applies a feed_diff.FeedDiff: its additions, and for a sync its removals too. The diff's files are copied next
+    # to the job, which stays resumable after the diff is closed, and no chunk is read before it is applied.
+    job_id = new_job_id()
+    os.makedirs(jobs_dir, exist_ok=True)
+    sources = ([('remove', feed_diff.removals_path)] if sync else []) + [('add', feed_diff.additions_path)]
+    steps = []
+    for op, path in sources:
+        source = f"{job_id}-{op}.txt"
+        shutil.copyfile(path, os.path.join(jobs_dir, source))
+        steps += file_steps(op, source, chunk_size, jobs_dir)
+    return BulkJob.create('sync' if sync else 'add', label, steps, jobs_dir, job_id)
+
+def find_unfinished_jobs(jobs_dir=JOBS_DIR):
+    jobs = []
+    for job_path in sorted(glob.glob(os.path.join(jobs_dir, '*.json'))):
+        try:
+            jobs.append(BulkJob.load(job_path))
+        except (OSError, ValueError, KeyError) as e:
+            results_log.error("Could not load job %s: %s", job_path, e)
+    return jobs
@@ -0,0 +1,171 @@
+# config_service.py
+
+# Standard library imports
+import configparser
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# Local imports
+import logging_pipeline
+
+# Constants
+DEFAULT_CONFIG = {
+    'Theme': {
+        'theme': 'False',
+        'show_prompt': 'True'
+    },
+    'Logging': {
+        'logging': 'False',
+        'show_prompt': 'True',
+        'restart_for_logging': 'False'
+    },
+    'Import': {
+        'minimize_on_import': 'False'
+    }
+}
+MTIME_CHECK_INTERVAL = 1.0  # Seconds between checks for edits made outside the application
+
+# Loggers
+config_log = logging_pipeline.get_logger("Configuration Changes")
+
+# The ConfigService keeps config.ini in memory. Reads never touch the file apart from a throttled mtime check,
+# and writes made inside batch() are flushed together with one atomic temp-file-and-rename. Writes always check the
+# mtime first, and a flush re-reads a file edited in the meantime and applies the pending values on top of it, so
+# an outside edit is never overwritten with stale values.
+class ConfigService:
+    def __init__(self, config_file):
+        self.config_file = os.path.abspath(config_file)
+        self.config = configparser.ConfigParser()
+        self.lock = threading.RLock()
+        self.loaded_mtime = None
+        self.last_mtime_check = 0.0
+        self.dirty = False
+        self.pending = {}  # (section, key) -> value set since the last flush
+        self.batch_depth = 0
+        self.load()
+
+    def load(self):
+        with self.lock:
+            config = configparser.ConfigParser()
+            if os.path.exists(self.config_file):
+                config.read(self.config_file)
+                self.config = config
+                self.loaded_mtime = self.get_mtime()
+            else:
+                config.read_dict(DEFAULT_CONFIG)
+                self.config = config
+                self.dirty = True
+                self.flush()
+            self.last_mtime_check = time.monotonic()
+
+    def get_mtime(self):
+        try:
+            return os.stat(self.config_file).st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh_if_changed(self, force=False):
+        now = time.monotonic()
+        if not force and now - self.last_mtime_check < MTIME_CHECK_INTERVAL:
+            return
+        with self.lock:
+            self.last_mtime_check = now
+            if not self.dirty and self.get_mtime() != self.loaded_mtime:
+                config_log.info("%s changed on disk, reloading", self.config_file)
+                self.load()
+
+    def get(self, section, key, fallback=None):
+        self.refresh_if_changed()
+        with self.lock:
+            return self.config.get(section, key, fallback=fallback)
+
+    def getboolean(self, section, key, fallback=False):
+        self.refresh_if_changed()
+        with self.lock:
+            try:
+                return self.config.getboolean(section, key, fallback=fallback)
+            except ValueError:
+                return fallback
+
+    def get_sections(self, sections):
+        self.refresh_if_changed()
+        with self.lock:
+            return {
+                section: {key: self.config.get(section, key, fallback=default) for key, default in keys.items()}
+                for section, keys in sections.items()
+            }
+
+    def set(self, section, key, value):
+        self.refresh_if_changed(force=True)
+        with self.lock:
+            if not self.config.has_section(section):
+                self.config.add_section(section)
+            value = str(value)
+            if self.config.get(section, key, fallback=None) == value:
+                return
+            self.config.set(section, key, value)
+            self.pending[(section, key)] = value
+            self.dirty = True
+            config_log.info("Set preference [%s] %s = %s", section, key, value)
+            if not self.batch_depth:
+                self.flush()
+
+    @contextmanager
+    def batch(self):
+        self.refresh_if_changed(force=True)
+        with self.lock:
+            self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.batch_depth -= 1
+                if not self.batch_depth:
+                    self.flush()
+
+    def flush(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            if self.loaded_mtime is not None and self.get_mtime() not in (None, self.loaded_mtime):
+                self.merge_from_disk()
+            directory = os.path.dirname(self.config_file)
+            fd, temp_path = tempfile.mkstemp(prefix='.config-', suffix='.tmp', dir=directory)
+            try:
+                with os.fdopen(fd, 'w') as temp_file:
+                    self.config.write(temp_file)
+                    temp_file.flush()
+                    os.fsync(temp_file.fileno())
+                os.replace(temp_path, self.config_file)  # Readers see either the old file or the new one, never half of it
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            self.dirty = False
+            self.pending = {}
+            self.loaded_mtime = self.get_mtime()
+
+    def merge_from_disk(self):
+        # The file was edited since it was loaded: keep that edit and apply only the values set since
+        config_log.info("%s changed on disk, merging %d pending value(s) into it", self.config_file, len(self.pending))
+        config = configparser.ConfigParser()
+        config.read(self.config_file)
+        for (section, key), value in self.pending.items():
+            if not config.has_section(section):
+                config.add_section(section)
+            config.set(section, key, value)
+        self.config = config
+
+_services = {}
+_services_lock = threading.Lock()
+
+def get_config(config_file):
+    path = os.path.abspath(config_file)
+    with _services_lock:
+        service = _services.get(path)
+        if service is None:
+            service = _services[path] = ConfigService(path)
+        return service
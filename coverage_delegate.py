@@ -0,0 +1,58 @@
+# coverage_delegate.py
+
+# PyQt5 imports
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle, QToolTip
+from PyQt5.QtCore import Qt, QEvent
+from PyQt5.QtGui import QColor
+
+# Local imports
+from domain_index import STATUS_NEW, STATUS_BLOCKED, STATUS_COVERED
+
+# Constants
+BADGE_COLORS = {
+    STATUS_NEW: QColor(76, 175, 80),
+    STATUS_BLOCKED: QColor(158, 158, 158),
+    STATUS_COVERED: QColor(255, 152, 0)
+}
+BADGE_MARGIN = 6
+
+# Paints a coverage badge at the right edge of each row in the "Domains from File" list. Badges are looked up for the
+# rows being painted only (see CoverageIndex.status: a dict lookup and a short trie walk per row), so staging a large
+# file keeps no per-domain badge data and filtering the list keeps every badge.
+class CoverageBadgeDelegate(QStyledItemDelegate):
+    def __init__(self, badge, parent=None, tooltip=None):
+        super().__init__(parent)
+        self.badge = badge  # callable(domain) -> (status, covering entry), or None for no badge
+        self.tooltip = tooltip  # optional callable(domain) -> hover text, e.g. the files a domain came from
+
+    def badge_text(self, status, parent):
+        if status == STATUS_BLOCKED:
+            return "already blocked"
+        if status == STATUS_COVERED:
+            return f"covered by {parent}"
+        return "new"
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        badge = self.badge(index.data(Qt.DisplayRole))
+        if badge is None:
+            return
+
+        status, parent = badge
+        rect = option.rect.adjusted(BADGE_MARGIN, 0, -BADGE_MARGIN, 0)
+        text_width = option.fontMetrics.horizontalAdvance(index.data(Qt.DisplayRole))
+        available = max(0, rect.width() - text_width - 2 * BADGE_MARGIN)
+        text = option.fontMetrics.elidedText(self.badge_text(status, parent), Qt.ElideMiddle, available)
+
+        painter.save()
+        color = option.palette.highlightedText().color() if option.state & QStyle.State_Selected else BADGE_COLORS[status]
+        painter.setPen(color)
+        painter.drawText(rect, Qt.AlignRight | Qt.AlignVCenter, text)
+        painter.restore()
+
+    def helpEvent(self, event, view, option, index):
+        text = self.tooltip(index.data(Qt.DisplayRole)) if self.tooltip is not None and index.isValid() else ""
+        if event.type() == QEvent.ToolTip and text:
+            QToolTip.showText(event.globalPos(), text, view)
+            return True
+        return super().helpEvent(event, view, option, index)
@@ -1,9 +1,9 @@
 # custom_title_bar.py
 
 # PyQt5 imports
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QSizePolicy
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QSizePolicy, QStyle
 from PyQt5.QtCore import Qt, QPropertyAnimation, pyqtProperty, QEasingCurve
-from PyQt5.QtGui import QColor, QIcon
+from PyQt5.QtGui import QColor, QIcon, QPainter
 
 # Local imports
 from theme_manager import theme_manager
@@ -22,7 +22,8 @@ class AnimatedButton(QPushButton):
         self.fade_out_animation = QPropertyAnimation(self, b"background_color")
         self.click_animation = QPropertyAnimation(self, b"background_color")
         self.setup_animations()
-        self.update_stylesheet()
+        # The animated background is drawn in paintEvent, so the stylesheet is only set once
+        self.setStyleSheet("border: none;")
 
     def setup_animations(self):
         self.fade_in_animation.setDuration(theme_manager.FADE_IN_DURATION)
@@ -58,17 +59,22 @@ class AnimatedButton(QPushButton):
     @background_color.setter
     def background_color(self, color):
         self._current_color = color
-        self.update_stylesheet()
+        self.update()
 
-    def update_stylesheet(self):
-        self.setStyleSheet(f"background-color: {self._current_color.name()};")
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self._current_color)
+        icon_rect = QStyle.alignedRect(self.layoutDirection(), Qt.AlignCenter, self.iconSize(), self.rect())
+        mode = QIcon.Normal if self.isEnabled() else QIcon.Disabled
+        self.icon().paint(painter, icon_rect, Qt.AlignCenter, mode)
+        painter.end()
 
     def update_button_colors(self, colors):
         self.default_color = QColor(colors["default_color"])
         self.hover_color = QColor(colors["hover_color"])
         self.click_color = QColor(colors["click_color_default"])
-        self._current_color = self.default_color 
-        self.update_stylesheet()
+        self._current_color = self.default_color
+        self.update()
 
 class CustomTitleBar(QWidget):
     def __init__(self, parent=None, app_icon_path=None, title="Application"):
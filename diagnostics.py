@@ -0,0 +1,125 @@
+# diagnostics.py
+
+# Standard library imports
+import bisect
+import ctypes
+import os
+import sys
+import time
+import tracemalloc
+
+# Constants
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+TOP_ALLOCATORS = 10
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)  # Last bucket collects everything above the top bound
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def to_dict(self):
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'max_ms': self.max_ms,
+            'buckets': {label: count for label, count in zip(labels, self.counts) if count}
+        }
+
+# The RuntimeCounters are plain attribute and dict increments without locks. The GIL keeps them consistent enough
+# for monitoring, and they are cheap enough to stay on in production.
+class RuntimeCounters:
+    def __init__(self):
+        self.started_at = time.time()
+        self.powershell_spawns = 0
+        self.backend_calls = {}  # action -> LatencyHistogram
+        self.search_queries = 0
+        self.search_latency = LatencyHistogram()
+        self.row_counters = {}  # name -> callable returning the current row count
+
+    def record_backend_call(self, action, elapsed_ms):
+        histogram = self.backend_calls.get(action)
+        if histogram is None:
+            histogram = self.backend_calls[action] = LatencyHistogram()
+        histogram.record(elapsed_ms)
+
+    def record_search(self, elapsed_ms):
+        self.search_queries += 1
+        self.search_latency.record(elapsed_ms)
+
+    def register_rows(self, name, counter):
+        self.row_counters[name] = counter
+
+    def unregister_rows(self, name, counter):
+        # Only drops the counter if it is still the one registered, so a closing window leaves a newer one's alone
+        if self.row_counters.get(name) is counter:
+            del self.row_counters[name]
+
+    def row_counts(self):
+        counts = {}
+        for name, counter in self.row_counters.items():
+            try:
+                counts[name] = counter()
+            except Exception as e:
+                counts[name] = f"unavailable: {e}"
+        return counts
+
+    def snapshot(self):
+        return {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'uptime_s': round(time.time() - self.started_at, 1),
+            'powershell_spawns': self.powershell_spawns,
+            'backend_calls': {action: histogram.to_dict() for action, histogram in self.backend_calls.items()},
+            'search_queries': self.search_queries,
+            'search_latency': self.search_latency.to_dict(),
+            'rows': self.row_counts(),
+            'memory': memory_snapshot()
+        }
+
+def get_rss_bytes():
+    if sys.platform == 'win32':
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ('cb', ctypes.c_ulong), ('PageFaultCount', ctypes.c_ulong),
+                ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)
+            ]
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+def memory_snapshot():
+    memory = {'rss_bytes': get_rss_bytes(), 'tracemalloc': None}
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        top_stats = tracemalloc.take_snapshot().statistics('lineno')[:TOP_ALLOCATORS]
+        memory['tracemalloc'] = {
+            'traced_bytes': current,
+            'peak_bytes': peak,
+            'top_allocators': [
+                {'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", 'bytes': stat.size, 'blocks': stat.count}
+                for stat in top_stats
+            ]
+        }
+    return memory
+
+counters = RuntimeCounters()
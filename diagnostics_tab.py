@@ -0,0 +1,119 @@
+# diagnostics_tab.py
+
+# Standard library imports
+import json
+import time
+import tracemalloc
+
+# PyQt5 imports
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QPlainTextEdit, QCheckBox, QFileDialog, QLabel
+)
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QFontDatabase
+
+# Local imports
+from diagnostics import counters
+
+# Constants
+REFRESH_INTERVAL_MS = 1000
+
+class DiagnosticsTab(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.report_view = QPlainTextEdit()
+        self.report_view.setReadOnly(True)
+        self.report_view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        layout.addWidget(self.report_view)
+
+        button_layout = QHBoxLayout()
+        self.tracemalloc_checkbox = QCheckBox("Track allocations (tracemalloc)")
+        self.tracemalloc_checkbox.setChecked(tracemalloc.is_tracing())
+        self.tracemalloc_checkbox.toggled.connect(self.toggle_tracemalloc)
+        button_layout.addWidget(self.tracemalloc_checkbox)
+        button_layout.addStretch()
+
+        self.status_label = QLabel()
+        button_layout.addWidget(self.status_label)
+
+        self.dump_button = QPushButton("Dump Snapshot")
+        self.dump_button.clicked.connect(self.dump_snapshot)
+        button_layout.addWidget(self.dump_button)
+        layout.addLayout(button_layout)
+
+    # The report is only rebuilt while the tab is visible
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def toggle_tracemalloc(self, enabled):
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.refresh()
+
+    def refresh(self):
+        scroll_value = self.report_view.verticalScrollBar().value()
+        self.report_view.setPlainText(format_report(counters.snapshot()))
+        self.report_view.verticalScrollBar().setValue(scroll_value)
+
+    def dump_snapshot(self):
+        default_name = f"diagnostics_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Diagnostics Snapshot", default_name, "JSON Files (*.json)")
+        if not file_path:
+            return
+        with open(file_path, 'w', encoding='utf-8') as snapshot_file:
+            json.dump(counters.snapshot(), snapshot_file, indent=2)
+        self.status_label.setText(f"Snapshot saved to {file_path}")
+
+def format_bytes(size):
+    if size is None:
+        return "n/a"
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024 or unit == "GiB":
+            return f"{size:,.1f} {unit}"
+        size /= 1024
+
+def format_histogram(histogram):
+    buckets = "  ".join(f"{label}:{count}" for label, count in histogram['buckets'].items())
+    return f"n={histogram['count']:<7} mean={histogram['mean_ms']:9.2f} ms  max={histogram['max_ms']:9.2f} ms  {buckets}"
+
+def format_report(snapshot):
+    lines = [f"Uptime: {snapshot['uptime_s']:,.0f} s", f"PowerShell processes spawned: {snapshot['powershell_spawns']:,}", ""]
+
+    lines.append("Backend calls:")
+    if not snapshot['backend_calls']:
+        lines.append("  (none yet)")
+    for action, histogram in sorted(snapshot['backend_calls'].items()):
+        lines.append(f"  {action:<22} {format_histogram(histogram)}")
+
+    lines += ["", f"Search queries: {snapshot['search_queries']:,}", f"  {'latency':<22} {format_histogram(snapshot['search_latency'])}", ""]
+
+    lines.append("Rows held:")
+    for name, count in snapshot['rows'].items():
+        lines.append(f"  {name:<30} {count:>12,}" if isinstance(count, int) else f"  {name:<30} {count}")
+
+    memory = snapshot['memory']
+    lines += ["", f"Process RSS: {format_bytes(memory['rss_bytes'])}"]
+    traced = memory['tracemalloc']
+    if traced is None:
+        lines.append("Allocation tracking is off. Enable it below to see the top allocators.")
+    else:
+        lines.append(f"Traced by tracemalloc: {format_bytes(traced['traced_bytes'])} (peak {format_bytes(traced['peak_bytes'])})")
+        for allocator in traced['top_allocators']:
+            lines.append(f"  {format_bytes(allocator['bytes']):>12}  {allocator['blocks']:>9,} blocks  {allocator['location']}")
+    return "\n".join(lines)
@@ -0,0 +1,223 @@
+# domain_catalog.py
+
+# Standard library imports
+import datetime
+import re
+import shlex
+import sqlite3
+import threading
+import time
+
+# Local imports
+import logging_pipeline
+from domain_index import entry_host
+from public_suffix import get_public_suffix_list
+from url_policy import is_ip_address
+
+# Constants
+CATALOG_FILE = 'domains.catalog'
+EXTERNAL_SOURCE = 'registry'  # Source of domains first seen in the registry rather than added through this application
+QUERY_FIELDS = ('source', 'added', 'removed', 'tld', 'tag')
+QUERY_PATTERN = re.compile(r'(?:^|\s)(?:%s):' % '|'.join(QUERY_FIELDS), re.IGNORECASE)
+RELATIVE_DATE_PATTERN = re.compile(r'(\d+)([hdwm])', re.IGNORECASE)
+RELATIVE_UNITS = {'h': 3600, 'd': 86400, 'w': 7 * 86400, 'm': 30 * 86400}
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS domains (
+    domain TEXT PRIMARY KEY,
+    display TEXT NOT NULL,
+    tld TEXT NOT NULL,
+    suffix TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    added_at REAL NOT NULL,
+    removed_at REAL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS domains_source ON domains (source COLLATE NOCASE, added_at);
+CREATE INDEX IF NOT EXISTS domains_added ON domains (added_at);
+CREATE INDEX IF NOT EXISTS domains_removed ON domains (removed_at);
+CREATE INDEX IF NOT EXISTS domains_tld ON domains (tld);
+CREATE INDEX IF NOT EXISTS domains_suffix ON domains (suffix);
+CREATE TABLE IF NOT EXISTS tags (
+    tag TEXT NOT NULL COLLATE NOCASE,
+    domain TEXT NOT NULL,
+    PRIMARY KEY (tag, domain)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_domain ON tags (domain);
+"""
+
+# Loggers
+results_log = logging_pipeline.get_logger("Success/Error Logs")
+
+# The DomainCatalog mirrors the block list in SQLite and keeps what the registry cannot: where each domain came from,
+# when it was added or removed, and user tags. Removed domains keep their row (with removed_at set), so a domain that
+# comes back through undo keeps its original source. WAL mode lets the GUI and the CLI read while the other writes.
+class DomainCatalog:
+    def __init__(self, path=CATALOG_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def transaction(self, statements):
+        # statements: [(sql, parameter rows)]; all run in one transaction, so a batch is recorded entirely or not at all
+        with self.lock:
+            cursor = self.connection.cursor()
+            cursor.execute("BEGIN")
+            try:
+                for sql, rows in statements:
+                    cursor.executemany(sql, rows)
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+
+    def record(self, op, domains, source='', timestamp=None):
+        # Records one applied backend batch. Re-adding a removed domain keeps its old source unless a new one is given;
+        # adding a domain that is already listed changes nothing.
+        timestamp = time.time() if timestamp is None else timestamp
+        if op == 'add':
+            self.transaction([("""
+                INSERT INTO domains (domain, display, tld, suffix, source, added_at) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (domain) DO UPDATE SET
+                    source = CASE WHEN removed_at IS NULL OR excluded.source = '' THEN source ELSE excluded.source END,
+                    added_at = CASE WHEN removed_at IS NULL THEN added_at ELSE excluded.added_at END,
+                    removed_at = NULL
+            """, (self.row(domain, source, timestamp) for domain in domains))])
+        else:
+            self.transaction([(
+                "UPDATE domains SET removed_at = ? WHERE domain = ? AND removed_at IS NULL",
+                ((timestamp, domain.lower()) for domain in domains)
+            )])
+
+    def row(self, domain, source, timestamp):
+        # The tld and suffix come from the entry's host, so URL patterns are found by the domain they block; entries
+        # without a named host (IP addresses, "*") have neither
+        host = entry_host(domain)
+        if host is None or is_ip_address(host):
+            tld = suffix = ''
+        else:
+            tld, suffix = host.rsplit('.', 1)[-1], get_public_suffix_list().public_suffix(host)
+        return domain.lower(), domain, tld, suffix, source, timestamp
+
+    def sync(self, domains, source=EXTERNAL_SOURCE):
+        # Reconciles the catalog with a full fetch of the block list: domains the catalog has not seen (edited in
+        # elsewhere) are added under source, listed rows missing from the fetch are marked removed.
+        current = {domain.lower(): domain for domain in domains}
+        with self.lock:
+            listed = {key for key, in self.connection.execute("SELECT domain FROM domains WHERE removed_at IS NULL")}
+        added = [domain for key, domain in current.items() if key not in listed]
+        removed = [key for key in listed if key not in current]
+        if removed:
+            self.record('remove', removed)
+        if added:
+            self.record('add', added, source)
+        return len(added), len(removed)
+
+    def tag(self, domains, tags, remove=False):
+        keys = [domain.lower() for domain in domains]
+        if remove:
+            self.transaction([("DELETE FROM tags WHERE tag = ? AND domain = ?", [(tag, key) for tag in tags for key in keys])])
+        else:
+            self.transaction([("INSERT OR IGNORE INTO tags (tag, domain) VALUES (?, ?)", [(tag, key) for tag in tags for key in keys])])
+
+    def describe(self, domain):
+        # Returns the catalog's metadata for one domain, or None if it has never been recorded
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT display, source, added_at, removed_at FROM domains WHERE domain = ?", (domain.lower(),)
+            ).fetchone()
+            if row is None:
+                return None
+            tags = [tag for tag, in self.connection.execute("SELECT tag FROM tags WHERE domain = ? ORDER BY tag", (domain.lower(),))]
+        return {'domain': row[0], 'source': row[1], 'added_at': row[2], 'removed_at': row[3], 'tags': tags}
+
+    def query(self, text, limit=None):
+        # Returns the domains matching a search such as "source:feed.txt added:7d tld:com tag:ads tracker". Listed
+        # domains only, unless the search filters on removed:. Raises ValueError for malformed filters.
+        where, parameters = build_query(text)
+        sql = "SELECT display FROM domains WHERE " + " AND ".join(where) + " ORDER BY added_at, domain"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self.lock:
+            return [display for display, in self.connection.execute(sql, parameters)]
+
+def is_catalog_query(text):
+    return bool(QUERY_PATTERN.search(text))
+
+def build_query(text):
+    where, parameters = [], []
+    include_removed = False
+    try:
+        tokens = shlex.split(text)
+    except ValueError as e:
+        raise ValueError(f"Could not read the search: {e}")
+    for token in tokens:
+        field, separator, value = token.partition(':')
+        field = field.lower()
+        if not separator or field not in QUERY_FIELDS:
+            where.append("domain LIKE ? ESCAPE '\\'")
+            parameters.append('%' + escape_like(token.lower()) + '%')
+            continue
+        if not value:
+            raise ValueError(f"'{field}:' needs a value.")
+        if field == 'source':
+            where.append("source LIKE ? ESCAPE '\\'")
+            parameters.append(escape_like(value).replace('*', '%'))
+        elif field == 'tld':
+            value = value.lower().lstrip('.')
+            where.append("(tld = ? OR suffix = ?)")
+            parameters += [value, value]
+        elif field == 'tag':
+            where.append("domain IN (SELECT domain FROM tags WHERE tag = ?)")
+            parameters.append(value)
+        else:
+            start, end = parse_date_range(value)
+            column = 'added_at' if field == 'added' else 'removed_at'
+            include_removed = include_removed or field == 'removed'
+            if start is not None:
+                where.append(f"{column} >= ?")
+                parameters.append(start)
+            if end is not None:
+                where.append(f"{column} < ?")
+                parameters.append(end)
+    if not include_removed:
+        where.append("removed_at IS NULL")
+    return where, parameters
+
+def escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def parse_date_range(value, now=None):
+    # Returns (start, end) timestamps, either possibly None, for: 2024-05-01 (that day), >2024-05-01, <2024-05-01,
+    # 2024-05-01..2024-05-31 (inclusive), today, or a span back from now such as 12h, 7d, 2w, 3m
+    now = time.time() if now is None else now
+    value = value.lower()
+    if value == 'today':
+        start = day_start(datetime.date.today())
+        return start, start + 86400
+    relative = RELATIVE_DATE_PATTERN.fullmatch(value)
+    if relative:
+        return now - int(relative.group(1)) * RELATIVE_UNITS[relative.group(2)], None
+    if value.startswith('>'):
+        return day_start(parse_date(value[1:])) + 86400, None
+    if value.startswith('<'):
+        return None, day_start(parse_date(value[1:]))
+    if '..' in value:
+        first, last = value.split('..', 1)
+        return (day_start(parse_date(first)) if first else None), (day_start(parse_date(last)) + 86400 if last else None)
+    start = day_start(parse_date(value))
+    return start, start + 86400
+
+def parse_date(text):
+    try:
+        return datetime.date.fromisoformat(text)
+    except ValueError:
+        raise ValueError(f"'{text}' is not a date; use YYYY-MM-DD, today, or a span such as 7d.")
+
+def day_start(date):
+    return time.mktime(date.timetuple())  # Local midnight, matching what users mean by a date
@@ -0,0 +1,166 @@
+# domain_index.py
+
+# Local imports
+from url_policy import is_ip_address, parse_entry
+
+# Constants
+_TERMINAL = object()  # Key that marks a listed domain in a trie node; unlike a string, no label can equal it
+STATUS_NEW = 'new'
+STATUS_BLOCKED = 'blocked'
+STATUS_COVERED = 'covered'
+
+# The SuffixTrie stores domains by their labels in reverse (com -> example -> ads), so every parent of a name lies on
+# the path from the root to it. Brave's URLBlocklist also blocks the subdomains of a listed host, which makes the
+# first listed domain on that path the entry that covers the name.
+class SuffixTrie:
+    def __init__(self, domains=()):
+        self.root = {}
+        self.size = 0
+        for domain in domains:
+            self.add(domain)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, domain):
+        node = self.root
+        for label in reversed_labels(domain):
+            node = node.get(label)
+            if node is None:
+                return False
+        return _TERMINAL in node
+
+    def add(self, domain):
+        node = self.root
+        for label in reversed_labels(domain):
+            node = node.setdefault(label, {})
+        if _TERMINAL in node:
+            return False
+        node[_TERMINAL] = domain
+        self.size += 1
+        return True
+
+    def remove(self, domain):
+        # Removes the entry and prunes the branches it leaves empty
+        path = [self.root]
+        labels = reversed_labels(domain)
+        for label in labels:
+            node = path[-1].get(label)
+            if node is None:
+                return False
+            path.append(node)
+        if _TERMINAL not in path[-1]:
+            return False
+        del path[-1][_TERMINAL]
+        self.size -= 1
+        for label, parent, node in zip(reversed(labels), reversed(path[:-1]), reversed(path[1:])):
+            if node:
+                break
+            del parent[label]
+        return True
+
+    def covering_domain(self, domain):
+        # Returns the listed proper parent closest to the root, or None when no parent of the domain is listed
+        node = self.root
+        labels = reversed_labels(domain)
+        for label in labels[:-1]:
+            node = node.get(label)
+            if node is None:
+                return None
+            if _TERMINAL in node:
+                return node[_TERMINAL]
+        return None
+
+def is_host_entry(entry):
+    # Only plain host entries block their subdomains. Exact-host entries (.example.com), URL patterns with a scheme,
+    # port, path or query, and IP addresses block less than that, so they never cover other entries.
+    return not entry.startswith('.') and not any(char in entry for char in '/:?*@') and not is_ip_address(entry)
+
+def entry_host(entry):
+    # The lowercase host a block list entry applies to, or None for an entry without one (such as "*") or one that
+    # does not parse
+    key = entry.lower()
+    if is_host_entry(key):
+        return key
+    try:
+        return parse_entry(key).host
+    except ValueError:
+        return None
+
+# The CoverageIndex answers "is this already blocked?" for the current block list: a dict for exact matches and a
+# SuffixTrie for entries blocked through a listed parent. Both are updated one domain at a time as the list changes.
+class CoverageIndex:
+    def __init__(self, domains=()):
+        self.exact = {}  # lowercase -> domain as listed
+        self.trie = SuffixTrie()
+        self.apply(added=domains)
+
+    def __len__(self):
+        return len(self.exact)
+
+    def __contains__(self, domain):
+        return domain.lower() in self.exact
+
+    def apply(self, added=(), removed=()):
+        for domain in removed:
+            if self.exact.pop(domain.lower(), None) is not None and is_host_entry(domain):
+                self.trie.remove(domain)
+        for domain in added:
+            key = domain.lower()
+            if key not in self.exact:
+                self.exact[key] = key if key == domain else domain  # One string per domain when it is listed lowercase
+                if is_host_entry(domain):
+                    self.trie.add(domain)
+
+    def sync(self, domains):
+        # Brings the index in line with a freshly fetched list; returns (added, removed) counts
+        current = {domain.lower(): domain for domain in domains}
+        removed = [domain for key, domain in self.exact.items() if key not in current]
+        added = [domain for key, domain in current.items() if key not in self.exact]
+        self.apply(added, removed)
+        return len(added), len(removed)
+
+    def status(self, domain):
+        # Returns (status, covering entry); the entry is None for new domains
+        listed = self.exact.get(domain.lower())
+        if listed is not None:
+            return STATUS_BLOCKED, listed
+        parent = self.trie.covering_domain(domain)
+        return (STATUS_NEW, None) if parent is None else (STATUS_COVERED, parent)
+
+    def classify(self, domains):
+        # One pass over the domains: {domain: (status, covering entry)}
+        return {domain: self.status(domain) for domain in domains}
+
+def diff_domains(previous, current):
+    # Returns (added, removed) between two lists of domains, compared case-insensitively and kept in list order
+    previous_keys = {domain.lower() for domain in previous}
+    current_keys = {domain.lower() for domain in current}
+    added = [domain for domain in current if domain.lower() not in previous_keys]
+    removed = [domain for domain in previous if domain.lower() not in current_keys]
+    return added, removed
+
+def reversed_labels(domain):
+    return domain.lower().rstrip('.').split('.')[::-1]
+
+def minimize_domains(domains):
+    # Returns (kept, covered): kept is the minimal list in input order, covered lists (domain, covering entry) pairs.
+    # Repeats of an entry count as covered by its first occurrence; entries other than plain hosts are always kept.
+    unique = {}
+    covered = []
+    for domain in domains:
+        key = domain.lower()
+        if key in unique:
+            covered.append((domain, unique[key]))
+        else:
+            unique[key] = domain
+
+    trie = SuffixTrie(filter(is_host_entry, unique.values()))
+    kept = []
+    for domain in unique.values():
+        parent = trie.covering_domain(domain) if is_host_entry(domain) else None
+        if parent is None:
+            kept.append(domain)
+        else:
+            covered.append((domain, parent))
+    return kept, covered
@@ -0,0 +1,101 @@
+# domain_list_widget.py
+
+# Standard library imports
+from array import array
+
+# PyQt5 imports
+from PyQt5.QtWidgets import QListView, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QItemSelection, QItemSelectionModel
+
+# Local imports
+from domain_store import DomainView, domain_view
+
+# A list model over a DomainView. Rows are decoded from the shared DomainStore only when the view paints or reads
+# them, so a list of a million domains holds no per-row Python strings or list items.
+class DomainListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.domains = domain_view([])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.domains)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self.domains[index.row()]
+        return None
+
+    def set_domains(self, domains):
+        self.beginResetModel()
+        self.domains = domain_view(domains)
+        self.endResetModel()
+
+    def apply_changes(self, added=(), removed=()):
+        # Takes out the removed rows and appends the added ones without resetting the other rows. The rows array is
+        # copied first, so a view handed out earlier (such as the cached block list) is never changed underneath.
+        store = self.domains.store
+        positions = sorted({position for position in map(self.domains.position_of, removed) if position >= 0}, reverse=True)
+        self.domains = DomainView(store, array('I', self.domains.rows))
+        for position in positions:
+            self.beginRemoveRows(QModelIndex(), position, position)
+            del self.domains.rows[position]
+            self.endRemoveRows()
+        self.domains.positions = None
+
+        listed = set(self.domains.rows)
+        new_rows = [row for row in dict.fromkeys(store.extend(added)) if row not in listed]
+        if new_rows:
+            self.beginInsertRows(QModelIndex(), len(self.domains), len(self.domains) + len(new_rows) - 1)
+            self.domains.rows.extend(new_rows)
+            self.endInsertRows()
+
+# The list view behind both domain lists. Domains are located through the store's hash index, so a batch of domains
+# can be selected without scanning the list once per domain.
+class DomainListWidget(QListView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setModel(DomainListModel(self))
+        self.setUniformItemSizes(True)  # Lets the view lay out any number of rows without measuring each one
+
+    def set_domains(self, domains):
+        self.model().set_domains(domains)
+
+    def clear(self):
+        self.set_domains([])
+
+    def count(self):
+        return self.model().rowCount()
+
+    def domain(self, row):
+        return self.model().domains[row]
+
+    def domains(self):
+        return self.model().domains
+
+    def selected_domains(self):
+        return [self.domain(index.row()) for index in sorted(self.selectionModel().selectedRows(), key=QModelIndex.row)]
+
+    def row_of(self, domain):
+        return self.model().domains.position_of(domain)
+
+    def select_domains(self, domains, clear=False):
+        # Selects every listed domain with one selection change and scrolls once; returns how many were found
+        rows = sorted({row for row in map(self.row_of, domains) if row >= 0})
+        selection = QItemSelection()
+        start = previous = None
+        for row in rows + [None]:
+            if start is not None and row != previous + 1:
+                selection.select(self.model().index(start, 0), self.model().index(previous, 0))
+                start = None
+            if start is None:
+                start = row
+            previous = row
+
+        flags = QItemSelectionModel.Select | (QItemSelectionModel.Clear if clear else QItemSelectionModel.NoUpdate)
+        self.selectionModel().select(selection, flags)
+        if rows:
+            self.scrollTo(self.model().index(rows[0], 0), QAbstractItemView.PositionAtTop)
+        return len(rows)
+
+    def apply_changes(self, added=(), removed=()):
+        self.model().apply_changes(added, removed)
@@ -0,0 +1,447 @@
+# domain_manager_cli.py
+
+# Standard library imports
+import argparse
+import json
+import os
+import sys
+
+# Local imports
+import domain_manager_functions as dm_functions
+import logging_pipeline
+import bulk_jobs
+from domain_index import minimize_domains
+from feed_diff import diff_feed, DEFAULT_MEMORY_MB
+from url_policy import UrlPolicy
+from import_staging import expand_paths
+
+# Constants
+CONFIG_FILE = 'config.ini'
+EXIT_OK = 0
+EXIT_BACKEND_ERROR = 1
+EXIT_USAGE = 2  # Also what argparse exits with
+EXIT_INVALID_INPUT = 3  # Some input lines were rejected; the valid ones were still applied
+OUTPUT_FORMATS = ('json', 'ndjson', 'text')
+STDIN_SOURCE = '-'
+
+# Loggers
+activity_log = logging_pipeline.get_logger("User Activity Logs")
+
+# Headless entry point for scripts: python -m domain_manager_cli <command>. Nothing here imports Qt, and every
+# mutation is sent as one batch (one backend call per operation) however many domains the input holds.
+class CommandOutput:
+    def __init__(self, stream, output_format):
+        self.stream = stream
+        self.output_format = output_format
+
+    def document(self, document, records=(), text_lines=()):
+        # json writes the whole document, ndjson one record per line, text one plain line per record
+        if self.output_format == 'json':
+            json.dump(document, self.stream, indent=2)
+            self.stream.write('\n')
+        elif self.output_format == 'ndjson':
+            for record in records:
+                self.stream.write(json.dumps(record, separators=(',', ':')) + '\n')
+        else:
+            for line in text_lines:
+                self.stream.write(f"{line}\n")
+
+    def error(self, message):
+        self.document({'error': message}, [{'error': message}], [f"Error: {message}"])
+
+def iter_file_entries(paths, stdin):
+    # Yields (source, raw entry) pairs; files are read lazily in their own format, '-' streams stdin line by line and
+    # directories contribute every supported file in them
+    for path in expand_paths(paths):
+        if path == STDIN_SOURCE:
+            for line in stdin:
+                yield STDIN_SOURCE, line
+            continue
+        processing_function = dm_functions.get_processing_function(path) or dm_functions.process_text_file
+        yield from processing_function(path)
+
+def iter_argument_entries(args, stdin):
+    # add/remove/tag take domains as arguments, files with -f, and stdin when given '-' or nothing at all
+    domains = [domain for domain in args.domains if domain != STDIN_SOURCE]
+    for domain in domains:
+        yield 'argument', domain
+    paths = list(args.file or [])
+    if STDIN_SOURCE in args.domains or not (domains or paths):
+        paths.append(STDIN_SOURCE)
+    yield from iter_file_entries(paths, stdin)
+
+def read_domains(entries):
+    # Returns (valid domains in first-seen order, rejected entries)
+    domains, invalid = {}, []
+    for source, raw in entries:
+        raw = str(raw).strip()
+        if not raw or raw.startswith('#'):
+            continue
+        try:
+            domain = dm_functions.clean_domain(raw)
+        except ValueError:
+            invalid.append({'source': source, 'entry': raw})
+            continue
+        domains.setdefault(domain.lower(), domain)
+    return list(domains.values()), invalid
+
+def fetch_domains(output):
+    domains = dm_functions.fetch_existing_domains()
+    if isinstance(domains, str):
+        output.error(domains)
+        return None
+    return domains
+
+def apply_change(output, op, entries, label, minimize=False):
+    domains, invalid = read_domains(entries)
+    covered = []
+    if minimize:
+        domains, covered = minimize_domains(domains)
+    activity_log.info("CLI %s of %d domain(s) from %s", op, len(domains), label)
+    if op == 'add':
+        result = dm_functions.add_domains(domains, label)
+        changed_key, unchanged_key = 'added', 'skipped'
+    else:
+        result = dm_functions.remove_domains(domains, label)
+        changed_key, unchanged_key = 'removed', 'missing'
+    if isinstance(result, str):
+        output.error(result)
+        return EXIT_BACKEND_ERROR
+
+    result['invalid'] = invalid
+    records = [{'domain': domain, 'status': changed_key} for domain in result[changed_key]]
+    records += [{'domain': domain, 'status': unchanged_key} for domain in result[unchanged_key]]
+    if minimize:
+        result['covered'] = [{'domain': domain, 'covered_by': parent} for domain, parent in covered]
+        records += [{'domain': domain, 'status': 'covered', 'covered_by': parent} for domain, parent in covered]
+    records += [{'domain': entry['entry'], 'status': 'invalid', 'source': entry['source']} for entry in invalid]
+    text_lines = [f"{record['status']}\t{record['domain']}" for record in records]
+    output.document(result, records, text_lines)
+    return EXIT_INVALID_INPUT if invalid else EXIT_OK
+
+def command_list(args, output, stdin):
+    domains = fetch_domains(output)
+    if domains is None:
+        return EXIT_BACKEND_ERROR
+    if args.query:
+        # Catches up with edits made while no client was running before searching
+        for result in (dm_functions.sync_catalog(domains), dm_functions.query_catalog(args.query)):
+            if isinstance(result, str):
+                output.error(result)
+                return EXIT_BACKEND_ERROR
+        domains = result
+    output.document({'count': len(domains), 'domains': domains}, ({'domain': domain} for domain in domains), domains)
+    return EXIT_OK
+
+def command_add(args, output, stdin):
+    return apply_change(output, 'add', iter_argument_entries(args, stdin), args.label)
+
+def command_remove(args, output, stdin):
+    return apply_change(output, 'remove', iter_argument_entries(args, stdin), args.label)
+
+def command_tag(args, output, stdin):
+    domains, invalid = read_domains(iter_argument_entries(args, stdin))
+    result = dm_functions.tag_catalog(domains, args.tag, args.remove)
+    if isinstance(result, str):
+        output.error(result)
+        return EXIT_BACKEND_ERROR
+    status = 'untagged' if args.remove else 'tagged'
+    records = [{'domain': domain, 'status': status, 'tags': args.tag} for domain in domains]
+    records += [{'domain': entry['entry'], 'status': 'invalid', 'source': entry['source']} for entry in invalid]
+    output.document({status: domains, 'tags': args.tag, 'invalid': invalid}, records,
+                    [f"{record['status']}\t{record['domain']}" for record in records])
+    return EXIT_INVALID_INPUT if invalid else EXIT_OK
+
+def files_label(args):
+    return args.label or ", ".join(os.path.basename(path) for path in args.files)
+
+def diff_files(args, output, stdin):
+    current = fetch_domains(output)
+    if current is None:
+        return None
+    return diff_feed(iter_file_entries(args.files, stdin), current, args.memory_mb or DEFAULT_MEMORY_MB, args.bloom)
+
+def diff_records(diff, statuses):
+    # Streams the diff's domains from its files, so listing them never holds the feed in memory
+    if 'added' in statuses:
+        yield from ({'domain': domain, 'status': 'added'} for domain in diff.additions())
+    if 'removed' in statuses:
+        yield from ({'domain': domain, 'status': 'removed'} for domain in diff.removals())
+
+def write_diff(output, document, records):
+    # records is a callable, so the ndjson and text forms each get a fresh stream
+    output.document(document, records(), (f"{record['status']}\t{record['domain']}" for record in records()))
+
+def apply_feed(args, output, stdin, sync):
+    # The huge-feed path of import and sync: an external sort-merge diff under --memory-mb, applied as a resumable
+    # bulk job. The json document holds counts only; ndjson and text list each chunk's changes as it commits.
+    if args.minimize or (not sync and args.remove):
+        output.error("--memory-mb cannot be combined with --minimize or --remove")
+        return EXIT_USAGE
+    diff = diff_files(args, output, stdin)
+    if diff is None:
+        return EXIT_BACKEND_ERROR
+    statuses = ('added', 'removed') if sync else ('added',)
+    with diff:
+        label = files_label(args)
+        activity_log.info("CLI %s from %s: %d to add, %d to remove", 'sync' if sync else 'import', label,
+                          diff.counts['add'], diff.counts['remove'] if sync else 0)
+        document = {'counts': diff.counts, 'dry_run': args.dry_run}
+        if args.dry_run:
+            write_diff(output, document, lambda: diff_records(diff, statuses))
+            return EXIT_INVALID_INPUT if diff.counts['invalid'] else EXIT_OK
+        job = bulk_jobs.create_feed_job(diff, label, sync)
+
+    def write_chunk(op, changed):
+        status = 'added' if op == 'add' else 'removed'
+        write_diff(output, {}, lambda: ({'domain': domain, 'status': status} for domain in changed))
+
+    error = job.run(on_chunk=None if output.output_format == 'json' else write_chunk)
+    if error is not None:
+        output.error(f"{error} (job {job.job_id} resumes from its last committed chunk)")
+        return EXIT_BACKEND_ERROR
+    if output.output_format == 'json':
+        counts = {'added': job.changed_count('add'), 'removed': job.changed_count('remove')}
+        output.document({**document, **{status: counts[status] for status in statuses}})
+    return EXIT_INVALID_INPUT if diff.counts['invalid'] else EXIT_OK
+
+def command_import(args, output, stdin):
+    if args.memory_mb:
+        return apply_feed(args, output, stdin, sync=False)
+    op = 'remove' if args.remove else 'add'
+    return apply_change(output, op, iter_file_entries(args.files, stdin), files_label(args), args.minimize and op == 'add')
+
+def command_export(args, output, stdin):
+    domains = fetch_domains(output)
+    if domains is None:
+        return EXIT_BACKEND_ERROR
+    if args.path == STDIN_SOURCE:
+        _, skipped = dm_functions.write_domains(output.stream, domains, args.export_format or 'text')
+        if skipped:
+            print(f"Skipped {skipped:,} entries that are not plain hosts", file=sys.stderr)
+        return EXIT_OK
+    result = dm_functions.export_domains(domains, args.path, args.export_format, args.gzip or None)
+    if isinstance(result, str):
+        output.error(result)
+        return EXIT_BACKEND_ERROR
+    count, skipped = result
+    record = {'path': args.path, 'count': count, 'skipped': skipped}
+    output.document(record, [record], [f"Exported {count:,} domain(s) to {args.path}, skipped {skipped:,}"])
+    return EXIT_OK
+
+def command_sync(args, output, stdin):
+    if args.memory_mb:
+        return apply_feed(args, output, stdin, sync=True)
+    target, invalid = read_domains(iter_file_entries(args.files, stdin))
+    if args.minimize:
+        target, _ = minimize_domains(target)
+    current = fetch_domains(output)
+    if current is None:
+        return EXIT_BACKEND_ERROR
+    label = files_label(args)
+    current_set = {domain.lower() for domain in current}
+    target_set = {domain.lower() for domain in target}
+    removals = [domain for domain in current if domain.lower() not in target_set]
+    additions = [domain for domain in target if domain.lower() not in current_set]
+    activity_log.info("CLI sync to %s: %d to add, %d to remove", label, len(additions), len(removals))
+
+    result = {'added': additions, 'removed': removals, 'invalid': invalid, 'dry_run': args.dry_run}
+    if not args.dry_run:
+        # The same resumable job as the GUI's sync: chunked, checkpointed and journaled as one batch per operation
+        job = bulk_jobs.create_sync_job(target, current, label)
+        result['added'], result['removed'] = [], []
+        error = job.run(on_chunk=lambda op, changed: result['added' if op == 'add' else 'removed'].extend(changed))
+        if error is not None:
+            output.error(f"{error} (job {job.job_id} resumes from its last committed chunk)")
+            return EXIT_BACKEND_ERROR
+
+    records = [{'domain': domain, 'status': 'added'} for domain in result['added']]
+    records += [{'domain': domain, 'status': 'removed'} for domain in result['removed']]
+    records += [{'domain': entry['entry'], 'status': 'invalid', 'source': entry['source']} for entry in invalid]
+    output.document(result, records, [f"{record['status']}\t{record['domain']}" for record in records])
+    return EXIT_INVALID_INPUT if invalid else EXIT_OK
+
+def command_diff(args, output, stdin):
+    diff = diff_files(args, output, stdin)
+    if diff is None:
+        return EXIT_BACKEND_ERROR
+    with diff:
+        write_diff(output, {'counts': diff.counts}, lambda: diff_records(diff, ('added', 'removed')))
+    return EXIT_INVALID_INPUT if diff.counts['invalid'] else EXIT_OK
+
+def iter_urls(args, stdin):
+    # URLs from arguments and -f files (one per line, or the --column-th whitespace-separated field of log lines)
+    urls = [url for url in args.urls if url != STDIN_SOURCE]
+    paths = list(args.file or [])
+    if STDIN_SOURCE in args.urls or not (urls or paths):
+        paths.append(STDIN_SOURCE)
+    yield from urls
+    column = (args.column or 1) - 1
+    for path in paths:
+        stream = stdin if path == STDIN_SOURCE else open(path, encoding='utf-8', errors='replace')
+        try:
+            for line in stream:
+                if line.startswith('#'):
+                    continue
+                fields = line.split() if args.column else [line.strip()]
+                if len(fields) > column and fields[column]:
+                    yield fields[column]
+        finally:
+            if stream is not stdin:
+                stream.close()
+
+def check_urls(policy, urls, counts, blocked_only):
+    for url in urls:
+        counts['checked'] += 1
+        try:
+            entry = policy.match(url)
+        except ValueError:
+            counts['invalid'] += 1
+            yield {'url': url, 'status': 'invalid'}
+            continue
+        if entry is None:
+            if not blocked_only:
+                yield {'url': url, 'status': 'allowed'}
+        else:
+            counts['blocked'] += 1
+            yield {'url': url, 'status': 'blocked', 'entry': entry}
+
+def command_check(args, output, stdin):
+    # Tests URLs against the block list as Brave's URLBlocklist filters would. ndjson and text stream one line per
+    # URL, for log files of millions of URLs; json collects the results into one document.
+    domains = fetch_domains(output)
+    if domains is None:
+        return EXIT_BACKEND_ERROR
+    policy = UrlPolicy(domains)
+    counts = {'checked': 0, 'blocked': 0, 'invalid': 0}
+    records = check_urls(policy, iter_urls(args, stdin), counts, args.blocked_only)
+    activity_log.info("CLI check of URLs against %d block list entries", len(policy))
+    if output.output_format == 'json':
+        results = list(records)
+        output.document({'counts': counts, 'results': results}, results)
+    else:
+        output.document(None, records, (
+            '\t'.join(filter(None, (record['status'], record['url'], record.get('entry')))) for record in records
+        ))
+    return EXIT_INVALID_INPUT if counts['invalid'] else EXIT_OK
+
+def command_status(args, output, stdin):
+    domains = dm_functions.fetch_existing_domains()
+    can_undo, can_redo = dm_functions.get_history_state()
+    status = {
+        'brave_installed': dm_functions.check_brave_installation(),
+        'registry_path': dm_functions.check_registry_path(),
+        'domain_count': len(domains) if isinstance(domains, list) else None,
+        'can_undo': can_undo,
+        'can_redo': can_redo,
+        'unfinished_jobs': [job.describe() for job in bulk_jobs.find_unfinished_jobs()]
+    }
+    if isinstance(domains, str):
+        status['error'] = domains
+    text_lines = [f"{key}: {value}" for key, value in status.items()]
+    output.document(status, [status], text_lines)
+    return EXIT_BACKEND_ERROR if isinstance(domains, str) else EXIT_OK
+
+def build_parser():
+    # --format is accepted before or after the command
+    format_parser = argparse.ArgumentParser(add_help=False)
+    format_parser.add_argument('--format', dest='output_format', choices=OUTPUT_FORMATS, default=argparse.SUPPRESS,
+                               help="Output format (default: json)")
+
+    parser = argparse.ArgumentParser(prog='domain_manager_cli', description="Manage the Brave URLBlocklist without the GUI.")
+    parser.add_argument('--format', dest='output_format', choices=OUTPUT_FORMATS, default='json', help="Output format (default: json)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_command(name, **options):
+        return subparsers.add_parser(name, parents=[format_parser], **options)
+
+    def add_feed_options(subparser, help_suffix=""):
+        subparser.add_argument('--memory-mb', type=int, metavar='MB',
+                               help=f"Diff against the block list by external sort-merge within about MB of memory{help_suffix}")
+        subparser.add_argument('--bloom', action='store_true', help="Pre-check feed entries against a Bloom filter of the block list")
+
+    list_parser = add_command('list', help="Print the blocked domains")
+    list_parser.add_argument('--query', help="Only domains matching a catalog search, e.g. \"source:feed.txt added:7d tld:com\"")
+    list_parser.set_defaults(handler=command_list)
+
+    for name, handler, verb in (('add', command_add, "Block"), ('remove', command_remove, "Unblock")):
+        subparser = add_command(name, help=f"{verb} domains given as arguments, in files (-f) or on stdin")
+        subparser.add_argument('domains', nargs='*', help="Domains; '-' or no arguments reads one domain per line from stdin")
+        subparser.add_argument('-f', '--file', action='append', help="Read domains from a .txt, .csv or .json file")
+        subparser.add_argument('--label', default='command line', help="Label recorded in the undo history")
+        subparser.set_defaults(handler=handler)
+
+    tag_parser = add_command('tag', help="Tag domains in the catalog, for searching with tag:")
+    tag_parser.add_argument('domains', nargs='*', help="Domains; '-' or no arguments reads one domain per line from stdin")
+    tag_parser.add_argument('-f', '--file', action='append', help="Read domains from a .txt, .csv or .json file")
+    tag_parser.add_argument('-t', '--tag', action='append', required=True, help="Tag to apply (repeatable)")
+    tag_parser.add_argument('--remove', action='store_true', help="Take the tags off instead")
+    tag_parser.set_defaults(handler=command_tag)
+
+    import_parser = add_command('import', help="Block every domain in .txt, .csv or .json files")
+    import_parser.add_argument('files', nargs='+', help="Files or directories to import; '-' reads stdin")
+    import_parser.add_argument('--remove', action='store_true', help="Unblock the listed domains instead")
+    import_parser.add_argument('--minimize', action='store_true', help="Skip entries covered by a parent domain in the input")
+    import_parser.add_argument('--label', help="Label recorded in the undo history (default: the file names)")
+    add_feed_options(import_parser, ", for feeds too large to hold in memory")
+    import_parser.set_defaults(handler=command_import, dry_run=False)
+
+    export_parser = add_command('export', help="Write the blocked domains to a file")
+    export_parser.add_argument('path', nargs='?', default=STDIN_SOURCE, help="Output file; '-' or omitted writes to stdout")
+    export_parser.add_argument('--export-format', choices=tuple(dict.fromkeys(dm_functions.EXPORT_FORMATS.values())),
+                               help="File format (default: from the extension)")
+    export_parser.add_argument('--gzip', action='store_true', help="Compress the file (default: when the name ends in .gz)")
+    export_parser.set_defaults(handler=command_export)
+
+    sync_parser = add_command('sync', help="Make the block list match the given files exactly")
+    sync_parser.add_argument('files', nargs='+', help="Files or directories holding the complete block list; '-' reads stdin")
+    sync_parser.add_argument('--dry-run', action='store_true', help="Report the changes without applying them")
+    sync_parser.add_argument('--minimize', action='store_true', help="Drop entries covered by a parent domain from the target list")
+    sync_parser.add_argument('--label', help="Label recorded in the undo history (default: the file names)")
+    add_feed_options(sync_parser, ", for feeds too large to hold in memory")
+    sync_parser.set_defaults(handler=command_sync)
+
+    diff_parser = add_command('diff', help="Count (and with ndjson or text, list) what a sync to the given files would change")
+    diff_parser.add_argument('files', nargs='+', help="Files or directories holding the feed; '-' reads stdin")
+    add_feed_options(diff_parser, f" (default: {DEFAULT_MEMORY_MB})")
+    diff_parser.set_defaults(handler=command_diff)
+
+    check_parser = add_command('check', help="Report whether URLs are blocked, and by which entry")
+    check_parser.add_argument('urls', nargs='*', help="URLs; '-' or no arguments reads one URL per line from stdin")
+    check_parser.add_argument('-f', '--file', action='append', help="Read URLs from a text or log file")
+    check_parser.add_argument('--column', type=int, help="Take the URL from this whitespace-separated field (1-based) of each line")
+    check_parser.add_argument('--blocked-only', action='store_true', help="Only report blocked and invalid URLs")
+    check_parser.set_defaults(handler=command_check)
+
+    add_command('status', help="Report Brave, registry and history status").set_defaults(handler=command_status)
+    return parser
+
+def configure_logging():
+    # Follows the GUI's logging settings, but never creates config.ini on its own
+    if not os.path.exists(CONFIG_FILE):
+        return
+    preferences = dm_functions.load_preferences(CONFIG_FILE, {
+        'Logging': {'logging': 'False', **{category: 'True' for category in logging_pipeline.LOG_CATEGORIES}}
+    })['Logging']
+    logging_pipeline.start_logging(
+        preferences['logging'] == 'True',
+        {category: preferences[category] == 'True' for category in logging_pipeline.LOG_CATEGORIES}
+    )
+
+def main(argv=None, stdin=None, stdout=None):
+    args = build_parser().parse_args(argv)
+    output = CommandOutput(stdout or sys.stdout, args.output_format)
+    configure_logging()
+    try:
+        return args.handler(args, output, stdin or sys.stdin)
+    except Exception as e:
+        output.error(str(e))
+        return EXIT_BACKEND_ERROR
+    finally:
+        dm_functions.close_journal()
+        dm_functions.close_service_client()
+        dm_functions.close_catalog()
+        logging_pipeline.stop_logging()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,28 +3,82 @@
 # Standard library imports
 import subprocess
 import json
-import re
 import csv
+import gzip
+import io
 import os
-import logging
-import configparser
+import sqlite3
+import tempfile
+import threading
+import time
 
-# Initialize logging
-logging.basicConfig(filename='domain_manager.log', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-logging.info('Domain Manager Functions - Session started')
+# Local imports
+import logging_pipeline
+from perf_trace import span, traced
+from diagnostics import counters
+from config_service import get_config
+from operation_journal import OperationJournal, JOURNAL_FILE
+from domain_catalog import DomainCatalog, CATALOG_FILE, EXTERNAL_SOURCE
+from simulated_registry import get_simulated_registry
+import domain_service
+import public_suffix
+from domain_index import is_host_entry
+
+# Loggers
+registry_log = logging_pipeline.get_logger("Registry Access Logs")
+results_log = logging_pipeline.get_logger("Success/Error Logs")
+
+# Script action codes, named for logs and diagnostics
+ACTION_NAMES = {
+    "1": "fetch",
+    "2": "add",
+    "3": "remove",
+    "4": "check_brave",
+    "5": "check_registry_path",
+    "6": "add_from_file",
+    "7": "remove_from_file",
+    "8": "add_batch",
+    "9": "remove_batch"
+}
+
+# Export formats by file extension; '.gz' on top of any of them compresses the output
+EXPORT_FORMATS = {'.txt': 'text', '.csv': 'csv', '.json': 'json', '.hosts': 'hosts', '.reg': 'reg'}
+EXPORT_ENCODINGS = {'reg': 'utf-16'}  # What regedit expects for "Windows Registry Editor Version 5.00" files
+REG_FILE_KEY = r"HKEY_LOCAL_MACHINE\SOFTWARE\Policies\BraveSoftware\Brave\URLBlocklist"
+HOSTS_ADDRESS = "0.0.0.0"
+
+MANUAL_SOURCE = 'manual'  # Catalog source of domains entered one at a time
+
+_journal = None
+_journal_lock = threading.Lock()
+_catalog = None
+_catalog_lock = threading.Lock()
+_service_client = None
+_service_lock = threading.Lock()
+_change_listeners = []  # Subscribed again on every new connection to the service
 
 def execute_powershell_script(action, *args):
     script_path = "Manage-DomainsInRegistry.ps1"
     command = ["powershell.exe", "-ExecutionPolicy", "Bypass", "-File", script_path, action] + list(args)
+    action_name = ACTION_NAMES.get(action, action)
+    registry_log.info("Running registry action %s with %d argument(s)", action_name, len(args))
+    start = time.perf_counter()
     try:
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
+        with span("powershell.execute", action=action_name):
+            simulated_registry = get_simulated_registry()
+            if simulated_registry is not None:
+                return simulated_registry.run(action, *args).strip()
+            counters.powershell_spawns += 1
+            result = subprocess.run(command, capture_output=True, text=True, check=True)
         return result.stdout.strip()
     except subprocess.CalledProcessError as e:
-        logging.error(f"Error executing PowerShell script: {e.stderr.strip()}")
+        registry_log.error("Error executing PowerShell script: %s", e.stderr.strip())
         return f"Error executing PowerShell script: {e.stderr.strip()}"
     except Exception as e:
-        logging.error(f"An error occurred: {str(e)}")
+        registry_log.error("An error occurred: %s", e)
         return f"An error occurred: {str(e)}"
+    finally:
+        counters.record_backend_call(action_name, (time.perf_counter() - start) * 1000)
 
 def check_registry_path():
     result = execute_powershell_script("5")
@@ -37,39 +91,227 @@ def check_brave_installation():
     else:
         return True
 
+@traced("backend.fetch_existing_domains")
 def fetch_existing_domains():
+    if service_enabled():
+        return call_service('list_domains')
+    return fetch_registry_domains()
+
+def fetch_registry_domains():
     result = execute_powershell_script("1")
     try:
-        existing_domains = json.loads(result)
+        with span("backend.json_decode", chars=len(result)):
+            existing_domains = json.loads(result)
         return existing_domains
     except json.decoder.JSONDecodeError as e:
-        logging.error(f"Error decoding JSON: {e}\nRaw response: {result}")
+        results_log.error("Error decoding JSON: %s\nRaw response: %s", e, result)
         return f"Error decoding JSON: {e}\nRaw response: {result}"
 
 def clean_domain(domain):
-    domain_pattern = r"^([a-zA-Z0-9-]+\.)?[a-zA-Z0-9-]+\.[a-zA-Z]{2,}$"
+    # Returns the lowercase ASCII host of a domain or pasted URL; raises ValueError for names that cannot be blocked
+    return public_suffix.normalize_domain(domain)
+
+def clean_domains(domains):
+    # Batch form of clean_domain for imports: returns (valid domains, [(entry, reason), ...])
+    return public_suffix.validate_domains(domains)
 
-    cleaned_domain = re.sub(r'^(https?://)?(www\.)?', '', domain)  # Remove prefixes
-    cleaned_domain = re.sub(r'/.+', '', cleaned_domain)  # Remove path info
+@traced("backend.add_domain")
+def add_domain(domain):
+    result = add_domains([domain], label=domain, source=MANUAL_SOURCE)
+    if isinstance(result, str):
+        return result
+    if result['added']:
+        return f"Domain '{domain}' added successfully to the registry."
+    return f"Domain '{domain}' already exists in the registry."
 
-    if not re.match(domain_pattern, cleaned_domain):
-        raise ValueError(f"{domain}. Please use [subdomain].[domain].[TLD] format.")
+@traced("backend.remove_domain")
+def remove_domain(index):
+    result = remove_domains([index], label=index)
+    if isinstance(result, str):
+        return result
+    if result['removed']:
+        return f"Domain '{index}' removed successfully from the registry."
+    return f"Domain '{index}' not found in registry for removal."
 
-    return cleaned_domain
+@traced("backend.add_domains")
+def add_domains(domains, label='', journal=True, source=None):
+    # Returns {'added': [...], 'skipped': [...]} or an error string. source, recorded in the catalog, defaults to label.
+    if service_enabled():
+        result = call_service('add_domains', domains, label, journal)
+    else:
+        result = execute_batch_action("8", domains, ('added', 'skipped'))
+        if journal and not isinstance(result, str):
+            get_journal().record('add', result['added'], label)
+    if not isinstance(result, str):
+        catalog_batch('add', result['added'], label if source is None else source)
+    return result
 
-def add_domain(domain):
+@traced("backend.remove_domains")
+def remove_domains(domains, label='', journal=True):
+    # Returns {'removed': [...], 'missing': [...]} or an error string
+    if service_enabled():
+        result = call_service('remove_domains', domains, label, journal)
+    else:
+        result = execute_batch_action("9", domains, ('removed', 'missing'))
+        if journal and not isinstance(result, str):
+            get_journal().record('remove', result['removed'], label)
+    if not isinstance(result, str):
+        catalog_batch('remove', result['removed'])
+    return result
+
+def execute_batch_action(action, domains, result_keys):
+    domains = list(domains)
+    if not domains:
+        return {key: [] for key in result_keys}
+
+    # The domain list goes through a temp file, since a long list would overflow the command line
+    fd, list_path = tempfile.mkstemp(prefix='bdm-batch-', suffix='.txt')
     try:
-        result = execute_powershell_script("2", domain)
-        logging.info(f"Add domain result: {result.strip()}")
-        return result.strip()
-    except ValueError as e:
-        logging.error(f"Add domain error: {str(e)}")
-        return str(e)
+        with os.fdopen(fd, 'w', encoding='utf-8') as list_file:
+            list_file.write("\n".join(domains))
+        result = execute_powershell_script(action, list_path)
+    finally:
+        os.remove(list_path)
 
-def remove_domain(index):
-    result = execute_powershell_script("3", index)
-    logging.info(f"Remove domain result: {result.strip()}")
-    return result.strip()
+    try:
+        with span("backend.json_decode", chars=len(result)):
+            decoded = json.loads(result)
+    except json.decoder.JSONDecodeError:
+        results_log.error("%s failed: %s", ACTION_NAMES[action], result)
+        return result
+    if 'error' in decoded:
+        results_log.error("%s failed: %s", ACTION_NAMES[action], decoded['error'])
+        return decoded['error']
+
+    batch_result = {key: decoded.get(key) or [] for key in result_keys}
+    results_log.info("%s: %s", ACTION_NAMES[action], ", ".join(f"{len(batch_result[key])} {key}" for key in result_keys))
+    return batch_result
+
+def apply_batch(op, domains):
+    # Used by the journal to replay a batch or its inverse without journaling it again
+    if op == 'add':
+        return add_domains(domains, journal=False)
+    return remove_domains(domains, journal=False)
+
+def get_journal():
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = OperationJournal(JOURNAL_FILE, apply_batch)
+        return _journal
+
+def close_journal():
+    global _journal
+    with _journal_lock:
+        if _journal is not None:
+            _journal.close()
+            _journal = None
+
+def get_catalog():
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = DomainCatalog(CATALOG_FILE)
+        return _catalog
+
+def close_catalog():
+    global _catalog
+    with _catalog_lock:
+        if _catalog is not None:
+            _catalog.close()
+            _catalog = None
+
+def catalog_batch(op, domains, source=''):
+    # Records an applied batch in the catalog with one transaction. The registry write has already happened, so a
+    # catalog failure is logged rather than reported as a failed operation; the next full refresh reconciles it.
+    if not domains:
+        return
+    try:
+        get_catalog().record(op, domains, source)
+    except sqlite3.Error as e:
+        results_log.error("Could not record %d domain(s) in the catalog: %s", len(domains), e)
+
+def sync_catalog(domains):
+    # Brings the catalog in line with a full fetch; returns (added, removed) counts or an error string
+    try:
+        return get_catalog().sync(domains)
+    except sqlite3.Error as e:
+        results_log.error("Could not sync the catalog: %s", e)
+        return f"Could not sync the catalog: {e}"
+
+def mirror_catalog_changes(added, removed):
+    # Applies the difference between two fetches; domains this application wrote are already cataloged and keep
+    # their source
+    catalog_batch('remove', removed)
+    catalog_batch('add', added, EXTERNAL_SOURCE)
+
+def query_catalog(text, limit=None):
+    # Returns matching domains, or an error string; raises ValueError for a malformed search
+    try:
+        return get_catalog().query(text, limit)
+    except sqlite3.Error as e:
+        results_log.error("Catalog query failed: %s", e)
+        return f"Catalog query failed: {e}"
+
+def tag_catalog(domains, tags, remove=False):
+    try:
+        get_catalog().tag(domains, tags, remove)
+    except sqlite3.Error as e:
+        results_log.error("Could not tag domains in the catalog: %s", e)
+        return f"Could not tag domains in the catalog: {e}"
+    return len(domains)
+
+def record_batch(op, domains, label=''):
+    # Journals a batch that was applied with journal=False, such as a finished bulk job
+    if service_enabled():
+        return call_service('record', op, domains, label)
+    return get_journal().record(op, domains, label)
+
+def get_history_state():
+    # Returns (can_undo, can_redo) for whichever journal owns the history
+    if service_enabled():
+        status = call_service('status')
+        return (status['can_undo'], status['can_redo']) if isinstance(status, dict) else (False, False)
+    journal = get_journal()
+    return journal.can_undo(), journal.can_redo()
+
+def service_enabled():
+    return bool(os.environ.get(domain_service.SERVICE_ADDRESS_ENV))
+
+def get_service_client():
+    global _service_client
+    with _service_lock:
+        if _service_client is None or not _service_client.connected:
+            address = domain_service.parse_address(os.environ[domain_service.SERVICE_ADDRESS_ENV])
+            _service_client = domain_service.DomainServiceClient(address)
+            for listener in _change_listeners:
+                _service_client.subscribe(listener)
+        return _service_client
+
+def call_service(method, *args):
+    # Sends the call to the domain service, which owns the registry and the undo history
+    try:
+        client = get_service_client()
+    except Exception as e:
+        registry_log.error("Could not reach the domain service: %s", e)
+        return f"Could not reach the domain service: {e}"
+    return getattr(client, method)(*args)
+
+def subscribe_to_changes(listener):
+    # listener({'event': 'changed', 'added': [...], 'removed': [...]}) runs on the client's reader thread; it also gets
+    # {'event': 'disconnected'} when the connection drops, and is subscribed again when the next call reconnects.
+    # Waits for the service, so call it off the GUI thread.
+    if listener not in _change_listeners:
+        _change_listeners.append(listener)
+    return call_service('subscribe', listener)
+
+def close_service_client():
+    global _service_client
+    with _service_lock:
+        if _service_client is not None:
+            _service_client.close()
+            _service_client = None
+        _change_listeners.clear()
 
 def process_file(file_path, process_func):
     file_name = os.path.basename(file_path)
@@ -78,7 +320,7 @@ def process_file(file_path, process_func):
             for item in process_func(file):
                 yield file_name, item
     except Exception as e:
-        logging.error(f"Error processing file: {e}")
+        results_log.error("Error processing file: %s", e)
         raise Exception(f"Error processing file: {e}")
 
 def process_text_file(file_path):
@@ -99,54 +341,90 @@ def get_processing_function(file_path):
         return process_json_file
     return None
 
-def create_default_config(config_file):
-    config = configparser.ConfigParser()
-    config['Theme'] = {
-        'theme': 'False',
-        'show_prompt': 'True'
-    }
-    config['Logging'] = {
-        'logging': 'False',
-        'show_prompt': 'True',
-        'restart_for_logging': 'False'
-    }
-    with open(config_file, 'w') as configfile:
-        config.write(configfile)
+def export_format_for(path):
+    base, extension = os.path.splitext(path.lower())
+    if extension == '.gz':
+        base, extension = os.path.splitext(base)
+    return EXPORT_FORMATS.get(extension, 'text')
+
+def hosts_name(domain):
+    # The host a hosts file can list for a block list entry, or None for URL patterns, wildcards and IP addresses
+    name = domain[1:] if domain.startswith('.') else domain
+    return name if is_host_entry(name) else None
+
+def write_domains(stream, domains, export_format='text'):
+    # Writes domains to a text stream one entry at a time, so memory use does not grow with the list. Returns
+    # (written, skipped); only the hosts format skips entries, those it cannot express.
+    count = skipped = 0
+    if export_format == 'csv':
+        writer = csv.writer(stream, lineterminator='\n')
+        for count, domain in enumerate(domains, 1):
+            writer.writerow([domain])
+    elif export_format == 'json':
+        stream.write('[')
+        for count, domain in enumerate(domains, 1):
+            stream.write(('\n  ' if count == 1 else ',\n  ') + json.dumps(domain))
+        stream.write('\n]\n' if count else ']\n')
+    elif export_format == 'hosts':
+        stream.write("# Brave Domain Manager block list\n")
+        for domain in domains:
+            name = hosts_name(domain)
+            if name is None:
+                skipped += 1
+                continue
+            count += 1
+            stream.write(f"{HOSTS_ADDRESS} {name}\n")
+    elif export_format == 'reg':
+        # Value names follow the policy's 1..n numbering. The key is deleted first, so importing the file replaces the
+        # whole block list with the exported one instead of leaving stale entries above n.
+        stream.write(f"Windows Registry Editor Version 5.00\n\n[-{REG_FILE_KEY}]\n\n[{REG_FILE_KEY}]\n")
+        for count, domain in enumerate(domains, 1):
+            escaped = domain.replace('\\', '\\\\').replace('"', '\\"')
+            stream.write(f'"{count}"="{escaped}"\n')
+    else:
+        for count, domain in enumerate(domains, 1):
+            stream.write(f"{domain}\n")
+    return count, skipped
+
+@traced("export.domains")
+def export_domains(domains, file_path, export_format=None, compress=None):
+    # Streams domains (any iterable) to file_path and returns (written, skipped) as write_domains does, or an error
+    # string. The format and compression follow the extension unless given; the file is replaced only once the
+    # export is complete.
+    export_format = export_format or export_format_for(file_path)
+    compress = file_path.lower().endswith('.gz') if compress is None else compress
+    encoding = EXPORT_ENCODINGS.get(export_format, 'utf-8')
+    newline = '\r\n' if export_format == 'reg' else None
+    temp_path = None
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(file_path)), prefix='.export-', suffix='.tmp')
+        with os.fdopen(fd, 'wb') as raw_file:
+            binary_file = gzip.GzipFile(fileobj=raw_file, mode='wb', filename='') if compress else raw_file
+            with io.TextIOWrapper(binary_file, encoding=encoding, newline=newline) as stream:
+                count, skipped = write_domains(stream, domains, export_format)
+        os.replace(temp_path, file_path)
+    except Exception as e:
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        results_log.error("Error exporting domains to %s: %s", file_path, e)
+        return f"Error exporting domains to {file_path}: {e}"
+    results_log.info("Exported %d domain(s) to %s as %s%s, skipped %d", count, file_path, export_format,
+                     " (gzip)" if compress else "", skipped)
+    return count, skipped
 
 def save_preference(config_file, section, key, value):
-    config = configparser.ConfigParser()
-    config.read(config_file)
-    if not config.has_section(section):
-        config.add_section(section)
-    config[section][key] = str(value)
-    with open(config_file, 'w') as configfile:
-        config.write(configfile)
+    get_config(config_file).set(section, key, value)
 
 def load_preferences(config_file, sections):
-    config = configparser.ConfigParser()
-    if not os.path.exists(config_file):
-        create_default_config(config_file)
-    config.read(config_file)
-
-    preferences = {}
-    for section, keys in sections.items():
-        if not config.has_section(section):
-            config.add_section(section)
-        preferences[section] = {key: config.get(section, key, fallback=default) for key, default in keys.items()}
-    return preferences
+    return get_config(config_file).get_sections(sections)
 
 def undo_action():
-    # Call PowerShell script to perform undo action
-    try:
-        subprocess.run(["powershell.exe", "-ExecutionPolicy", "Bypass", "-File", "Manage-DomainsInRegistry.ps1", "Undo-Action"], check=True)
-    except subprocess.CalledProcessError as e:
-        logging.error(f"Error executing undo action: {e}")
-        print(f"Error executing undo action: {e}")
+    # Reverts the most recent journaled batch with a single backend call
+    result = call_service('undo') if service_enabled() else get_journal().undo()
+    results_log.info(result)
+    return result
 
 def redo_action():
-    # Call PowerShell script to perform redo action
-    try:
-        subprocess.run(["powershell.exe", "-ExecutionPolicy", "Bypass", "-File", "Manage-DomainsInRegistry.ps1", "Redo-Action"], check=True)
-    except subprocess.CalledProcessError as e:
-        logging.error(f"Error executing redo action: {e}")
-        print(f"Error executing redo action: {e}")
+    result = call_service('redo') if service_enabled() else get_journal().redo()
+    results_log.info(result)
+    return result
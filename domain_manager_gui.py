@@ -3,17 +3,17 @@
 # Standard library imports
 import sys
 import os
-import configparser
-import logging
+import time
 
 # PyQt5 imports
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QLineEdit, QPushButton, QTextEdit, QListWidget, QFileDialog,
+    QLabel, QLineEdit, QPushButton, QFileDialog,
     QSizePolicy, QDesktopWidget, QAbstractItemView, QTabWidget,
-    QMessageBox, QDialog
+    QMessageBox, QDialog, QShortcut, QComboBox, QCheckBox, QTreeView, QHeaderView
 )
-from PyQt5.QtCore import Qt, QSize, QEventLoop, QEvent, QUrl, QTimer, QProcess
+from PyQt5.QtCore import Qt, QSize, QEvent, QUrl, QTimer, QProcess, pyqtSignal
+from PyQt5.QtGui import QKeySequence
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 
 # Third-party imports
@@ -25,7 +25,25 @@ from theme_manager import theme_manager
 from custom_title_bar import CustomTitleBar
 from custom_prompt import CustomPrompt
 import domain_manager_functions as dm_functions
+import bulk_jobs
+import import_staging
+from domain_index import CoverageIndex, minimize_domains, diff_domains, STATUS_BLOCKED, STATUS_COVERED
+from coverage_delegate import CoverageBadgeDelegate
+from domain_list_widget import DomainListWidget
+from domain_store import DomainView, domain_view
+from grouped_domain_model import GroupedDomainModel, group_domains
+from backend_executor import BackendExecutor
+from job_scheduler import INTERACTIVE, BACKGROUND
+import logging_pipeline
+from config_service import get_config
+from perf_trace import tracer, span, traced
 from settings_tab import SettingsTab
+from diagnostics_tab import DiagnosticsTab
+from diagnostics import counters
+from feedback_console import FeedbackConsole
+from registry_watcher import RegistryWatcher, can_watch_registry
+from domain_catalog import is_catalog_query
+from url_policy import UrlPolicy
 
 # Constants
 APP_NAME = "Brave Domain Manager"
@@ -38,20 +56,38 @@ FILE_FORMATS = [
     ("JSON Files", "*.json"),
     ("All Files", "*.*")
 ]
+EXPORT_FILE_FORMATS = [
+    ("Text Files", "*.txt *.txt.gz"),
+    ("CSV Files", "*.csv *.csv.gz"),
+    ("JSON Files", "*.json *.json.gz"),
+    ("Hosts Files", "*.hosts *.hosts.gz"),
+    ("Registry Files - importing one replaces the block list", "*.reg")
+]
 SEARCH_THRESHOLD = 70
+DETAILED_FEEDBACK_LIMIT = 20  # Larger batches are reported as counts instead of one line per domain
+REGISTRY_REFRESH_DELAY_MS = 250
+INCREMENTAL_REFRESH_LIMIT = 1000  # Larger differences repaint the whole list
 
-# Initialize logging
-logging.basicConfig(filename='domain_manager_gui.log', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-logging.info('Session started')
+# Loggers
+startup_log = logging_pipeline.get_logger("Startup/Shutdown Logs")
+activity_log = logging_pipeline.get_logger("User Activity Logs")
+performance_log = logging_pipeline.get_logger("Performance Logs")
 
 class DomainManagerGUI(QMainWindow):
     max_button_width = 0
+    registry_changed = pyqtSignal(object)  # Change notifications from the service or the watcher, on the GUI thread
 
     def __init__(self):
         super().__init__()
 
-        self.cached_domains = []
-        self.file_cached_domains = []
+        self.cached_domains = domain_view([])  # The blocked domains, or the error string from the last fetch
+        self.staged_domains = import_staging.StagedDomains()  # Domains from every opened file, with their sources
+        self.coverage_index = CoverageIndex()  # The block list, for "already blocked" badges on file rows
+        self.grouping_task = None  # Pending regrouping of the blocked domains for the grouped view
+        self.grouped_domains = None  # The list the grouped view was last built from
+        self.url_policy = None  # The block list compiled for URL checks, and the list it was compiled from
+        self.url_policy_domains = None
+        self.url_policy_task = None  # Pending compilation for the last URL check
         self.current_list = 'existing'
         self.show_prompt = {
             'Logging': True,
@@ -59,39 +95,81 @@ class DomainManagerGUI(QMainWindow):
         }
         self.settings_tab = None
         self.is_initializing = True
+        self.backend_buttons = []
+        self.registry_watcher = None
+        self.backend_executor = BackendExecutor(self)
+        self.backend_executor.busy_changed.connect(self.on_backend_busy_changed)
 
         self.add_entry = QLineEdit()
         self.filepath_entry = QLineEdit()
 
         self.button_texts = [
-            "Submit", "Browse", "Open", "Add to Registry", 
-            "Remove from Registry", "Clear List", "Delete Selected", "Refresh List"
+            "Submit", "Browse", "Folder", "Open", "Add to Registry", 
+            "Remove from Registry", "Sync Registry", "Clear List", "Delete Selected", "Refresh List", "Optimize List", "Export List", "Check", "Cancel"
         ]
         self.max_button_width = self.calculate_max_button_width(self.button_texts)
 
         self.initialize_ui()
 
     def closeEvent(self, event):
-        logging.info('Session ended')
+        startup_log.info('Session ended')
+        self.backend_executor.shutdown()
+        if self.registry_watcher is not None:
+            self.registry_watcher.stop()
+        dm_functions.close_journal()
+        dm_functions.close_catalog()
+        dm_functions.close_service_client()
+        for name, counter in self.row_counters.items():
+            counters.unregister_rows(name, counter)
+        tracer.end_session()
         super().closeEvent(event)
 
     def initialize_ui(self):
         self.setup_window()
         self.setup_layout()
         self.load_preferences()
+        startup_log.info('Session started')
         theme_manager.apply_theme(self, "main", title_bar=self.title_bar)
         self.display_brave_status()
         self.display_registry_path()
         self.refresh_existing_domains()
+        self.watch_registry()
         QTimer.singleShot(0, self.check_logging_prompt) 
+        QTimer.singleShot(0, self.check_unfinished_jobs)
         self.is_initializing = False
 
+    def watch_registry(self):
+        # Edits made elsewhere show up without a manual refresh: from other clients through the domain service, from
+        # Group Policy or other tools through the registry watcher. Bursts, such as one notification per chunk of a
+        # bulk job, are folded into one refresh.
+        self.registry_refresh_timer = QTimer(self)
+        self.registry_refresh_timer.setSingleShot(True)
+        self.registry_refresh_timer.setInterval(REGISTRY_REFRESH_DELAY_MS)
+        self.registry_refresh_timer.timeout.connect(self.refresh_existing_domains)
+        self.registry_changed.connect(self.on_registry_changed)
+        if dm_functions.service_enabled():
+            self.backend_executor.submit_background(
+                "subscribe to changes", dm_functions.subscribe_to_changes, self.registry_changed.emit,
+                on_result=lambda result: self.update_feedback(result) if isinstance(result, str) else None
+            )
+        elif can_watch_registry():
+            self.registry_watcher = RegistryWatcher(lambda: self.registry_changed.emit({'event': 'external'}))
+            self.registry_watcher.start()
+
+    def on_registry_changed(self, event):
+        # Service events name the changed domains, so badges follow right away; the list is refreshed once they settle
+        if event.get('added') or event.get('removed'):
+            self.coverage_index.apply(event.get('added', ()), event.get('removed', ()))
+            self.update_file_badges()
+        self.registry_refresh_timer.start()
+
     def check_logging_prompt(self):
         if self.show_prompt['Logging']:
             self.prompt_for_logging()
 
     def setup_window(self):
         self.setWindowFlags(Qt.FramelessWindowHint)
+        self.setWindowTitle(APP_NAME)  # Drawn by the custom title bar, but still named in the taskbar
 
         screen = QDesktopWidget().screenGeometry()
         window_width, window_height = int(screen.width() * 0.62), int(screen.height() * 0.60)
@@ -112,6 +190,13 @@ class DomainManagerGUI(QMainWindow):
 
         self.setup_tabs()
         self.add_lower_frame()
+        self.setup_shortcuts()
+
+    def setup_shortcuts(self):
+        # Line edits keep their own text undo; these fire everywhere else in the window
+        QShortcut(QKeySequence.Undo, self, self.on_undo)
+        QShortcut(QKeySequence.Redo, self, self.on_redo)
+        QShortcut(QKeySequence("Ctrl+Shift+Z"), self, self.on_redo)
 
     def update_title_bar_geometry(self, event):
         self.title_bar.update_geometry()
@@ -120,6 +205,7 @@ class DomainManagerGUI(QMainWindow):
     def setup_tabs(self):
         self.setup_main_tab()
         self.setup_settings_tab()
+        self.setup_diagnostics_tab()
         self.setup_doc_tab()
 
     def setup_main_tab(self):
@@ -139,8 +225,7 @@ class DomainManagerGUI(QMainWindow):
         self.upper_layout.addWidget(self.right_frame)
         layout.addWidget(self.upper_frame)
 
-        self.feedback_text = QTextEdit()
-        self.feedback_text.setReadOnly(True)
+        self.feedback_text = FeedbackConsole()
         layout.addWidget(self.feedback_text)
 
         self.tab_widget.addTab(self.domain_tab, "Domain Management")
@@ -157,6 +242,7 @@ class DomainManagerGUI(QMainWindow):
     def add_widgets_to_left_frame(self, layout):
         self.add_label_and_entry(layout, "Add Domain:", self.on_submit_button_click)
         self.add_label_and_entry(layout, "Add from File:", self.on_open_button_click, browse=True)
+        self.add_url_check(layout)
 
         self.file_format_text = QLabel(
             "Supported File Formats:\nText File (.txt): One domain per line.\nCSV File (.csv): One domain per row.\nJSON File (.json): Array of domain strings."
@@ -179,9 +265,59 @@ class DomainManagerGUI(QMainWindow):
             self.filepath_entry = entry  # Keep reference to the filepath_entry field
             button_layout = QHBoxLayout()
             button_layout.addWidget(self.create_button("Browse", self.on_file_browse_button_click), alignment=Qt.AlignCenter)
+            button_layout.addWidget(self.create_button("Folder", self.on_folder_browse_button_click), alignment=Qt.AlignCenter)
             button_layout.addWidget(self.create_button("Open", submit_callback), alignment=Qt.AlignCenter)
             layout.addLayout(button_layout)
 
+    def add_url_check(self, layout):
+        layout.addWidget(QLabel("Test URL:"))
+        self.url_entry = QLineEdit()
+        self.url_entry.setPlaceholderText("Enter a URL to see whether the block list blocks it")
+        self.url_entry.returnPressed.connect(self.on_check_url_button_click)
+        layout.addWidget(self.url_entry)
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.create_button("Check", self.on_check_url_button_click), alignment=Qt.AlignCenter)
+        layout.addLayout(button_layout)
+        self.url_result_label = QLabel()
+        self.url_result_label.setWordWrap(True)
+        layout.addWidget(self.url_result_label)
+
+    def on_check_url_button_click(self):
+        url = self.url_entry.text().strip()
+        if not url:
+            return
+        activity_log.info("User checked URL: %s", url)
+        domains = self.cached_domains
+        if isinstance(domains, str):
+            self.url_result_label.setText(domains)
+        elif domains is self.url_policy_domains:
+            self.show_url_check(url)
+        else:
+            # Compiling a large list takes a moment, so it runs on the compute thread, where it never delays a write;
+            # the result is kept until the block list changes
+            def on_result(policy):
+                if task is not self.url_policy_task:
+                    return  # A newer check replaced this one
+                self.url_policy_task = None
+                if isinstance(policy, str):
+                    self.url_result_label.setText(policy)
+                    return
+                self.url_policy, self.url_policy_domains = policy, domains
+                self.show_url_check(url)
+
+            self.url_result_label.setText("Checking...")
+            task = self.url_policy_task = self.backend_executor.submit_compute(
+                "compile URL policy", UrlPolicy, domains, key="compile URL policy", on_result=on_result
+            )
+
+    def show_url_check(self, url):
+        try:
+            entry = self.url_policy.match(url)
+        except ValueError as e:
+            self.url_result_label.setText(f"Not a valid URL: {e}")
+            return
+        self.url_result_label.setText("Not blocked." if entry is None else f"Blocked by '{entry}'.")
+
     def create_right_frame(self):
         right_frame = QWidget()
         right_layout = QVBoxLayout(right_frame)
@@ -203,24 +339,38 @@ class DomainManagerGUI(QMainWindow):
         lists_layout = QHBoxLayout()  # Create a horizontal layout for the lists
 
         file_domains_layout = QVBoxLayout()
+        self.source_combo = QComboBox()
+        self.source_combo.currentIndexChanged.connect(lambda: self.reset_list('file'))
+        file_domains_layout.addWidget(self.source_combo)
+        self.update_source_combo()
         self.file_domains_list = self.create_domain_list("Domains from File:", 'file')
+        self.file_domains_list.setItemDelegate(CoverageBadgeDelegate(
+            self.coverage_index.status, self.file_domains_list, tooltip=self.describe_staged_domain
+        ))
         file_domains_layout.addWidget(self.file_domains_list)
         
         file_buttons_layout = QHBoxLayout()
-        file_buttons_layout.addWidget(self.create_button("Add to Registry", lambda: self.process_domains_from_list("Add")))
-        file_buttons_layout.addWidget(self.create_button("Remove from Registry", lambda: self.process_domains_from_list("Remove")))
+        file_buttons_layout.addWidget(self.create_button("Add to Registry", lambda: self.process_domains_from_list("Add"), backend=True))
+        file_buttons_layout.addWidget(self.create_button("Remove from Registry", lambda: self.process_domains_from_list("Remove"), backend=True))
+        file_buttons_layout.addWidget(self.create_button("Sync Registry", self.on_sync_button_click, backend=True))
         file_buttons_layout.addWidget(self.create_button("Clear List", self.on_clear_button_click))
         file_domains_layout.addLayout(file_buttons_layout)
         
         lists_layout.addLayout(file_domains_layout)
 
         existing_domains_layout = QVBoxLayout()
+        self.group_checkbox = QCheckBox("Group by site")
+        self.group_checkbox.toggled.connect(self.on_group_toggled)
+        existing_domains_layout.addWidget(self.group_checkbox)
         self.existing_domains_list = self.create_domain_list("Blocked Domains:", 'existing')
         existing_domains_layout.addWidget(self.existing_domains_list)
+        existing_domains_layout.addWidget(self.create_grouped_view())
         
         existing_buttons_layout = QHBoxLayout()
-        existing_buttons_layout.addWidget(self.create_button("Delete Selected", self.on_delete_selected_button_click))
-        existing_buttons_layout.addWidget(self.create_button("Refresh List", self.on_refresh_button_click))
+        existing_buttons_layout.addWidget(self.create_button("Delete Selected", self.on_delete_selected_button_click, backend=True))
+        existing_buttons_layout.addWidget(self.create_button("Refresh List", self.on_refresh_button_click, backend=True))
+        existing_buttons_layout.addWidget(self.create_button("Optimize List", self.on_optimize_button_click, backend=True))
+        existing_buttons_layout.addWidget(self.create_button("Export List", self.on_export_button_click))
         existing_domains_layout.addLayout(existing_buttons_layout)
         
         lists_layout.addLayout(existing_domains_layout)
@@ -230,25 +380,72 @@ class DomainManagerGUI(QMainWindow):
     def create_domain_list(self, label_text, list_type):
         layout = QVBoxLayout()
         layout.addWidget(QLabel(label_text))
-        domain_list = QListWidget()
+        domain_list = DomainListWidget()
         domain_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        domain_list.itemSelectionChanged.connect(lambda: self.set_current_list(list_type))
+        domain_list.selectionModel().selectionChanged.connect(lambda: self.set_current_list(list_type))
         domain_list.installEventFilter(self)
         layout.addWidget(domain_list)
         return domain_list
     
+    def create_grouped_view(self):
+        # Alternative to the flat blocked list: domains under their registrable domain, with rows created on expand
+        self.grouped_model = GroupedDomainModel(self)
+        self.grouped_view = QTreeView()
+        self.grouped_view.setModel(self.grouped_model)
+        self.grouped_view.setUniformRowHeights(True)
+        self.grouped_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.grouped_view.header().setStretchLastSection(False)
+        self.grouped_view.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.grouped_view.header().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        self.grouped_view.selectionModel().selectionChanged.connect(lambda: self.set_current_list('existing'))
+        self.grouped_view.installEventFilter(self)
+        self.grouped_view.hide()
+        return self.grouped_view
+
+    def on_group_toggled(self, grouped):
+        activity_log.info("User switched the blocked list to the %s view", "grouped" if grouped else "flat")
+        self.existing_domains_list.setVisible(not grouped)
+        self.grouped_view.setVisible(grouped)
+        if not grouped:
+            self.grouped_model.set_groups({})
+            self.grouped_domains = None
+        self.show_existing_domains()
+
+    def is_grouped(self):
+        return self.group_checkbox.isChecked()
+
+    def group_existing_domains(self, domains):
+        # Grouping a large list takes seconds, so it runs on the compute thread, where it never delays a write; a newer
+        # request replaces a queued one
+        def on_result(groups):
+            if task is self.grouping_task:
+                self.grouping_task = None
+            if isinstance(groups, dict) and self.is_grouped():
+                with span("gui.populate_grouped_view", groups=len(groups)):
+                    self.grouped_model.set_groups(groups)
+
+        self.grouped_domains = domains
+        task = self.grouping_task = self.backend_executor.submit_compute(
+            "group domains", group_domains, domains, key="group domains", on_result=on_result
+        )
+
+    def selected_existing_domains(self):
+        if self.is_grouped():
+            return self.grouped_model.domains_for(self.grouped_view.selectionModel().selectedIndexes())
+        return self.existing_domains_list.selected_domains()
+
+    @traced("gui.reset_list")
     def reset_list(self, list_type):
         if list_type == 'existing':
             domain_list_widget = self.existing_domains_list
             cached_domains = self.cached_domains
         elif list_type == 'file':
             domain_list_widget = self.file_domains_list
-            cached_domains = [domain for _, domain_list in self.file_cached_domains for domain in domain_list]
+            cached_domains = self.staged_domains.domains_from(self.current_source())
         else:
             return
 
-        domain_list_widget.clear()
-        domain_list_widget.addItems(cached_domains)
+        self.show_domains(domain_list_widget, cached_domains)
 
     def setup_settings_tab(self):
         self.settings_tab = SettingsTab(CONFIG_FILE, self)
@@ -260,6 +457,30 @@ class DomainManagerGUI(QMainWindow):
         if isinstance(current_widget, SettingsTab):
             current_widget.load_preferences()  # Reload preferences when switching to the settings tab
 
+    def setup_diagnostics_tab(self):
+        self.diagnostics_tab = DiagnosticsTab(self)
+        self.tab_widget.addTab(self.diagnostics_tab, "Diagnostics")
+        # Unregistered in closeEvent, so the process-wide counters never call into a closed window
+        self.row_counters = {
+            "Blocked Domains list": self.existing_domains_list.count,
+            "Domains from File list": self.file_domains_list.count,
+            "Grouped view site rows": lambda: self.grouped_model.loaded_groups,
+            "Grouped view domain rows": lambda: sum(self.grouped_model.loaded.values()),
+            "Blocked domains cache": lambda: 0 if isinstance(self.cached_domains, str) else len(self.cached_domains),
+            "Blocked domains store bytes": lambda: self.domain_store_bytes(self.cached_domains),
+            "Staged domains store bytes": lambda: self.domain_store_bytes(self.staged_domains.domains_from()),
+            "URL policy entries": lambda: 0 if self.url_policy is None else len(self.url_policy),
+            "File domains cache": lambda: len(self.staged_domains),
+            "Feedback console lines": lambda: self.feedback_text.document().blockCount()
+        }
+        for name, counter in self.row_counters.items():
+            counters.register_rows(name, counter)
+
+    def domain_store_bytes(self, domains):
+        if not isinstance(domains, DomainView):
+            return 0
+        return domains.store.nbytes() + domains.nbytes()
+
     def setup_doc_tab(self):
         self.doc_tab = QWidget()
         layout = QVBoxLayout(self.doc_tab)
@@ -289,14 +510,16 @@ class DomainManagerGUI(QMainWindow):
         spacer = QWidget()
         spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         lower_layout.addWidget(spacer)
+
+        self.cancel_button = self.create_button("Cancel", self.on_cancel_button_click)
+        self.cancel_button.hide()
+        lower_layout.addWidget(self.cancel_button)
         lower_layout.addWidget(self.theme_toggle_switch)
 
         self.main_layout.addWidget(lower_frame)
 
     def prompt_for_logging(self):
-        config = configparser.ConfigParser()
-        config.read(CONFIG_FILE)
-        logging_enabled = config.getboolean('Logging', 'logging', fallback=False)
+        logging_enabled = get_config(CONFIG_FILE).getboolean('Logging', 'logging', fallback=False)
         
         if logging_enabled:
             prompt = CustomPrompt(
@@ -329,26 +552,29 @@ class DomainManagerGUI(QMainWindow):
         self.handle_prompt_result('Theme', result, prompt.get_checkbox_state())
 
     def handle_prompt_result(self, section, result, dont_show_again, logging_enabled=False):
-        if dont_show_again:
-            dm_functions.save_preference(CONFIG_FILE, section, 'show_prompt', False)
-            self.show_prompt[section] = False
-        if result == QDialog.Accepted:
-            if section == 'Logging':
-                if logging_enabled:
-                    dm_functions.save_preference(CONFIG_FILE, 'Logging', 'logging', False)
-                else:
-                    dm_functions.save_preference(CONFIG_FILE, 'Logging', 'logging', True)
-                    dm_functions.save_preference(CONFIG_FILE, 'Logging', 'restart_for_logging', True)
-                self.restart_application()
-            elif section == 'Theme':
-                dm_functions.save_preference(CONFIG_FILE, 'Theme', 'theme', theme_manager.theme)
+        with get_config(CONFIG_FILE).batch():  # Coalesce the preference writes below into one flush
+            if dont_show_again:
+                dm_functions.save_preference(CONFIG_FILE, section, 'show_prompt', False)
+                self.show_prompt[section] = False
+            if result == QDialog.Accepted:
+                if section == 'Logging':
+                    if logging_enabled:
+                        dm_functions.save_preference(CONFIG_FILE, 'Logging', 'logging', False)
+                    else:
+                        dm_functions.save_preference(CONFIG_FILE, 'Logging', 'logging', True)
+                        dm_functions.save_preference(CONFIG_FILE, 'Logging', 'restart_for_logging', True)
+                elif section == 'Theme':
+                    dm_functions.save_preference(CONFIG_FILE, 'Theme', 'theme', theme_manager.theme)
+        if result == QDialog.Accepted and section == 'Logging':
+            self.restart_application()
 
     def on_theme_toggle(self, state):
         if self.is_initializing:
             return
 
         theme_manager.theme = state
-        theme_manager.apply_theme(self, "main", title_bar=self.title_bar)
+        elapsed_ms = theme_manager.apply_theme(self, "main", title_bar=self.title_bar)
+        performance_log.info("Theme toggled to %s in %.1f ms", 'dark' if state else 'light', elapsed_ms)
 
         if self.show_prompt['Theme']:
             self.prompt_for_theme()
@@ -357,15 +583,36 @@ class DomainManagerGUI(QMainWindow):
         padding = 20
         return max(QPushButton(text).fontMetrics().boundingRect(text).width() + padding for text in button_texts)
 
-    def create_button(self, text, callback):
+    def create_button(self, text, callback, backend=False):
         button = QPushButton(text)
         button.clicked.connect(callback)
         button.setFixedWidth(self.max_button_width)
+        if backend:
+            self.backend_buttons.append(button)  # Disabled while a backend task is running
         return button
 
+    def on_backend_busy_changed(self, busy):
+        for button in self.backend_buttons:
+            button.setEnabled(not busy)
+        self.cancel_button.setVisible(busy)
+        self.cancel_button.setEnabled(True)
+
+    def on_cancel_button_click(self):
+        activity_log.info("User cancelled the running backend task")
+        self.backend_executor.cancel()
+        self.cancel_button.setEnabled(False)
+        self.feedback_text.set_status(self.current_domain_label, "Cancelling after the current chunk...")
+
+    def backend_idle(self):
+        # Keyboard shortcuts bypass the disabled buttons, so every backend action checks this first
+        if self.backend_executor.is_busy():
+            self.update_feedback("Another operation is still running. Wait for it to finish or cancel it.")
+            return False
+        return True
+
     def eventFilter(self, source, event):
         if event.type() == QEvent.KeyPress and event.key() == Qt.Key_Return:
-            if source in (self.file_domains_list, self.existing_domains_list, self.search_entry):
+            if source in (self.file_domains_list, self.existing_domains_list, self.grouped_view, self.search_entry):
                 self.search_domains()
                 return True
         return super().eventFilter(source, event)
@@ -378,64 +625,181 @@ class DomainManagerGUI(QMainWindow):
 
         try:
             cleaned_domain = dm_functions.clean_domain(domain)
-            result = dm_functions.add_domain(cleaned_domain)
-            self.update_feedback(result)
-            self.refresh_existing_domains()
-            self.update_current_domain(cleaned_domain, "Add", single_domain=True)
-
-            self.highlight_domains_in_list([cleaned_domain])
-            self.add_entry.clear()
-            self.add_entry.setFocus()
         except ValueError as e:
             self.update_feedback(f"Invalid domain format: {e}")
+            return
+
+        activity_log.info("User submitted domain %s", cleaned_domain)
+        self.update_current_domain(cleaned_domain, "Add", single_domain=True)
+        self.add_entry.clear()
+        self.add_entry.setFocus()
+
+        def on_result(result):
+            self.update_feedback(result)
+            self.refresh_existing_domains(then=lambda: self.highlight_domains_in_list([cleaned_domain]), priority=INTERACTIVE)
+
+        # Runs ahead of the next chunk of any bulk job; a repeated submit of the same domain replaces the queued one,
+        # and a remove of it queued behind cancels both when this add is known to change the list
+        self.backend_executor.submit_interactive(
+            f"Adding '{cleaned_domain}'", dm_functions.add_domain, cleaned_domain, key=cleaned_domain.lower(),
+            op=self.known_change('add', cleaned_domain), on_result=on_result
+        )
+
+    def known_change(self, op, domain):
+        # The op is only passed to the scheduler when the write will change the block list: the list is loaded, no
+        # bulk job could touch the domain first, and the domain is listed for a remove or missing for an add
+        if isinstance(self.cached_domains, str) or self.backend_executor.is_busy():
+            return None
+        return op if (domain in self.coverage_index) == (op == 'remove') else None
 
     def highlight_domains_in_list(self, domains):
-        for domain in domains:
-            items = self.existing_domains_list.findItems(domain, Qt.MatchExactly)
-            if items:
-                item = items[0]
-                item.setSelected(True)
-                self.existing_domains_list.scrollToItem(item, QAbstractItemView.PositionAtTop)
+        if self.is_grouped():
+            return
+        with span("gui.highlight_domains", domains=len(domains)) as highlight_span:
+            highlight_span.set(found=self.existing_domains_list.select_domains(domains))
 
     def on_delete_selected_button_click(self):
-        selected_items = self.existing_domains_list.selectedItems()
-        if not selected_items:
+        domains = self.selected_existing_domains()
+        if not domains:
             self.update_feedback("No domains selected for deletion.")
             return
+        if len(domains) == 1:
+            self.remove_single_domain(domains[0])
+            return
+        if not self.backend_idle():
+            return
+
+        activity_log.info("User deleted %d selected domain(s)", len(domains))
+        self.update_current_domain(f"{len(domains):,} domains", "Remove")
+        self.run_batch('remove', domains, "selected domains", on_success=lambda: self.update_current_domain(
+            domains[0], "Remove", final_message=True
+        ))
+
+    def remove_single_domain(self, domain):
+        # Keyed like a single add, so the two coalesce while queued, or cancel out when both are known to change the list
+        activity_log.info("User deleted domain %s", domain)
+        self.update_current_domain(domain, "Remove", single_domain=True)
 
-        single_domain = len(selected_items) == 1
-        for item in selected_items:
-            domain = item.text()
-            result = dm_functions.remove_domain(domain)
+        def on_result(result):
             self.update_feedback(result)
-            self.update_current_domain(domain, "Remove", single_domain=single_domain)
-            QEventLoop().processEvents()
+            self.refresh_existing_domains(priority=INTERACTIVE)
+
+        self.backend_executor.submit_interactive(
+            f"Removing '{domain}'", dm_functions.remove_domain, domain, key=domain.lower(), op=self.known_change('remove', domain),
+            on_result=on_result
+        )
+
+    def on_undo(self):
+        if not self.backend_idle():
+            return
+        activity_log.info("User requested undo")
+        self.backend_executor.submit_interactive("undo", dm_functions.undo_action, on_result=self.on_history_result, exclusive=True)
+
+    def on_redo(self):
+        if not self.backend_idle():
+            return
+        activity_log.info("User requested redo")
+        self.backend_executor.submit_interactive("redo", dm_functions.redo_action, on_result=self.on_history_result, exclusive=True)
 
+    def on_history_result(self, message):
+        self.update_feedback(message)
         self.refresh_existing_domains()
-        self.update_current_domain(domain, "Remove", final_message=True, single_domain=single_domain)
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Delete:
             self.on_delete_key_press()
 
     def on_delete_key_press(self):
-        if self.existing_domains_list.hasFocus():
-            selected_items = self.existing_domains_list.selectedItems()
-            if selected_items:
+        if self.existing_domains_list.hasFocus() or self.grouped_view.hasFocus():
+            if self.selected_existing_domains():
                 self.on_delete_selected_button_click()
 
     def on_clear_button_click(self):
-        if not self.file_domains_list.count():
+        if not len(self.staged_domains):
             self.update_feedback("The list is already empty.")
             return
 
-        self.file_domains_list.clear()
-        self.file_cached_domains.clear()
-        self.update_feedback("The list has been cleared.")
+        # With one source chosen only that source is dropped; domains another file also lists stay staged
+        source = self.current_source()
+        if source is None:
+            self.staged_domains.clear()
+            self.update_feedback("The list has been cleared.")
+        else:
+            removed = self.staged_domains.remove_source(source)
+            self.update_feedback(f"Removed {self.staged_domains.label(source)} from the list; {len(removed):,} domain(s) no longer staged.")
+        self.update_source_combo()
+        self.reset_list('file')
+        self.update_file_badges()
 
     def on_refresh_button_click(self):
-        self.refresh_existing_domains()
-        self.update_feedback("List refreshed.")
+        if not self.backend_idle():
+            return
+        self.refresh_existing_domains(then=lambda: self.update_feedback("List refreshed."), priority=INTERACTIVE)
+
+    def on_optimize_button_click(self):
+        if not self.backend_idle():
+            return
+        if isinstance(self.cached_domains, str) or not len(self.cached_domains):
+            self.update_feedback("The block list is empty or could not be read.")
+            return
+
+        # Entries that differ only in case cannot be removed one at a time, so only parent coverage is offered
+        _, covered = minimize_domains(self.cached_domains)
+        covered = [(domain, parent) for domain, parent in covered if domain.lower() != parent.lower()]
+        if not covered:
+            self.update_feedback("The block list has no entries covered by a parent domain.")
+            return
+
+        message = (
+            f"{len(covered):,} of {len(self.cached_domains):,} blocked domains are already covered by a parent domain, "
+            "since Brave also blocks the subdomains of a listed host. Remove them?"
+        )
+        details = "\n".join(f"{domain}  (covered by {parent})" for domain, parent in covered)
+        if self.confirm_with_details("Optimize List", message, details):
+            activity_log.info("User optimized the block list, removing %d covered domain(s)", len(covered))
+            domains = [domain for domain, _ in covered]
+            self.run_batch('remove', domains, "Optimize list", on_success=lambda: self.feedback_text.set_status(
+                self.current_domain_label, f"Removed {len(covered):,} redundant domain(s) from the block list."
+            ))
+
+    def on_export_button_click(self):
+        if isinstance(self.cached_domains, str) or not len(self.cached_domains):
+            self.update_feedback("There are no blocked domains to export.")
+            return
+
+        # While a search filters the blocked list, only the matching domains are exported. These views are never changed
+        # once handed out, so the backend thread streams them without a copy.
+        if self.current_list == 'existing' and self.search_entry.text():
+            domains = self.grouped_domains if self.is_grouped() else self.existing_domains_list.domains()
+        else:
+            domains = self.cached_domains
+        filters = ";;".join(f"{name} ({ext})" for name, ext in EXPORT_FILE_FORMATS)
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Blocked Domains", "blocked_domains.txt", filters)
+        if not file_path:
+            return
+
+        activity_log.info("User exported %d domain(s) to %s", len(domains), file_path)
+        self.backend_executor.submit("export domains", dm_functions.export_domains, domains, file_path,
+                                     on_result=lambda result: self.report_export(result, file_path))
+
+    def report_export(self, result, file_path):
+        if isinstance(result, str):
+            self.update_feedback(result)
+            return
+        count, skipped = result
+        message = f"Exported {count:,} domain(s) to {file_path}."
+        if skipped:
+            message += f" Skipped {skipped:,} entries that are not plain hosts, which a hosts file cannot list."
+        if dm_functions.export_format_for(file_path) == 'reg':
+            message += " Importing this file replaces the whole block list instead of adding to it."
+        self.update_feedback(message)
+
+    def confirm_with_details(self, title, message, details):
+        # The preview goes in the expandable details pane so that long lists do not stretch the dialog
+        message_box = QMessageBox(QMessageBox.Question, title, message, QMessageBox.Yes | QMessageBox.No, self)
+        message_box.setDefaultButton(QMessageBox.No)
+        message_box.setDetailedText(details)
+        return message_box.exec_() == QMessageBox.Yes
 
     def on_file_browse_button_click(self):
         filters = ";;".join([f"{name} ({ext})" for name, ext in FILE_FORMATS])
@@ -443,19 +807,28 @@ class DomainManagerGUI(QMainWindow):
         if file_path:
             self.filepath_entry.setText(file_path)
 
+    def on_folder_browse_button_click(self):
+        directory = QFileDialog.getExistingDirectory(self, "Select Folder")
+        if directory:
+            self.filepath_entry.setText(directory)
+
     def on_open_button_click(self):
         file_path = self.filepath_entry.text()
         if not file_path:
             self.update_feedback("Please enter a file path or use the Browse button to select a file.")
             return
 
-        file_name = os.path.basename(file_path)
+        file_name = ", ".join(os.path.basename(os.path.normpath(path)) for path in import_staging.split_paths(file_path))
+        activity_log.info("User opened %s", file_path)
         self.populate_file_domains_list(file_path, file_name)
 
     def load_preferences(self):
         preferences = dm_functions.load_preferences(CONFIG_FILE, {
             'Theme': {'theme': 'False', 'show_prompt': 'True'},
-            'Logging': {'logging': 'False', 'show_prompt': 'True', 'restart_for_logging': 'False'}
+            'Logging': {
+                'logging': 'False', 'show_prompt': 'True', 'restart_for_logging': 'False',
+                **{category: 'True' for category in logging_pipeline.LOG_CATEGORIES}
+            }
         })
         theme_manager.theme = preferences['Theme']['theme'] == 'True'
         self.show_prompt['Theme'] = preferences['Theme']['show_prompt'] == 'True'
@@ -464,92 +837,256 @@ class DomainManagerGUI(QMainWindow):
         logging_enabled = preferences['Logging']['logging'] == 'True'
         self.show_prompt['Logging'] = preferences['Logging']['show_prompt'] == 'True'
         self.settings_tab.logging_enabled_checkbox.setChecked(logging_enabled)
+        logging_pipeline.configure(logging_enabled, {
+            category: preferences['Logging'][category] == 'True' for category in logging_pipeline.LOG_CATEGORIES
+        })
 
         if preferences['Logging']['restart_for_logging'] == 'True':
             self.show_prompt['Logging'] = False
             dm_functions.save_preference(CONFIG_FILE, 'Logging', 'restart_for_logging', 'False')
 
     def populate_file_domains_list(self, file_path, file_name):
+        # file_path may list several files or directories separated by ';'. They are found and parsed concurrently on
+        # the compute thread, and staged here next to the files already open.
         if not file_path:
             self.update_feedback("Please provide a file path.")
             return
 
-        processing_function = dm_functions.get_processing_function(file_path)
-        if not processing_function:
-            self.update_feedback("Unsupported file format. Please use .txt, .csv, or .json.")
+        minimize = get_config(CONFIG_FILE).getboolean('Import', 'minimize_on_import', fallback=False)
+
+        def parse():
+            paths = import_staging.expand_paths(import_staging.split_paths(file_path))
+            return list(import_staging.parse_sources(paths, minimize))
+
+        def on_result(sources):
+            if isinstance(sources, str):
+                self.update_feedback(sources)
+            elif not sources:
+                self.update_feedback(f"No .txt, .csv or .json files found in {file_name}.")
+            else:
+                self.stage_sources(sources)
+
+        self.backend_executor.submit_compute(f"parse {file_name}", parse, on_result=on_result)
+
+    def stage_sources(self, sources):
+        loaded = []
+        with self.feedback_text.batch(), span("import.stage_sources", files=len(sources)) as stage_span:
+            for source in sources:
+                if source.error:
+                    self.update_feedback(source.error)
+                    continue
+                if source.invalid:
+                    self.feedback_text.tally("invalid", "{count:,} invalid lines skipped", len(source.invalid))
+                if source.covered:
+                    self.update_feedback(f"Dropped {len(source.covered):,} entries already covered by a parent domain in {source.name}.")
+                self.staged_domains.add_source(source.path, source.domains)
+                loaded.append(source)
+            stage_span.set(loaded=len(loaded), staged=len(self.staged_domains))
+        if not loaded:
             return
 
-        self.file_domains_list.clear()
-        self.file_cached_domains.clear()
+        self.update_source_combo()
+        with span("gui.populate_file_list", rows=len(self.staged_domains)):
+            self.reset_list('file')
+        self.update_file_badges()
+        if len(loaded) == 1:
+            self.update_feedback(f"Loaded domains from {loaded[0].path}")
+        else:
+            self.update_feedback(
+                f"Loaded {sum(len(source.domains) for source in loaded):,} domains from {len(loaded)} files; "
+                f"{len(self.staged_domains):,} unique domains are staged."
+            )
 
-        domains = []
-        try:
-            for _, domain in processing_function(file_path):
-                try:
-                    cleaned_domain = dm_functions.clean_domain(domain)
-                    self.file_domains_list.addItem(cleaned_domain)
-                    domains.append(cleaned_domain)
-                except ValueError as e:
-                    self.update_feedback(f"Skipping invalid domain: {e}")
-
-            self.file_cached_domains.append((file_name, domains))
-            self.update_feedback(f"Loaded domains from {file_path}")
-        except Exception as e:
-            self.update_feedback(str(e))
+    def current_source(self):
+        # The file chosen above the list, or None for all of them
+        return self.source_combo.currentData()
+
+    def update_source_combo(self):
+        selected = self.current_source()
+        self.source_combo.blockSignals(True)
+        self.source_combo.clear()
+        self.source_combo.addItem(f"All files ({len(self.staged_domains):,} domains)", None)
+        for path in self.staged_domains.source_paths():
+            self.source_combo.addItem(f"{self.staged_domains.label(path)} ({len(self.staged_domains.sources[path]):,})", path)
+            self.source_combo.setItemData(self.source_combo.count() - 1, path, Qt.ToolTipRole)
+        self.source_combo.setCurrentIndex(max(0, self.source_combo.findData(selected)))
+        self.source_combo.blockSignals(False)
+
+    def describe_staged_domain(self, domain):
+        sources = self.staged_domains.sources_of(domain)
+        return "From " + ", ".join(sources) if sources else ""
 
     def process_domains_from_list(self, action_type):
-        selected_items = self.file_domains_list.selectedItems()
+        selected_domains = self.file_domains_list.selected_domains()
 
-        if not self.file_cached_domains:
+        if not len(self.staged_domains):
             self.update_feedback(f"No domains to {action_type.lower()}.")
             return
+        if not self.backend_idle():
+            return
 
-        file_name = self.file_cached_domains[0][0]
-        domains, message = self.get_domains_and_message(selected_items, file_name, action_type)
+        file_name = self.staged_domains.label(self.current_source())
+        domains, message = self.get_domains_and_message(selected_domains, file_name, action_type)
 
         reply = QMessageBox.question(self, 'Confirmation', message, QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
-            added_domains = []
-            for domain in domains:
-                result = self.perform_domain_action(domain, action_type)
-                self.update_feedback(result)
-                self.update_current_domain(domain, action_type, file_name=file_name)
-                if action_type == "Add":
-                    added_domains.append(domain)
-                QEventLoop().processEvents()
+            activity_log.info("User confirmed %s of %d domain(s) from %s", action_type.lower(), len(domains), file_name)
+            self.update_current_domain(f"{len(domains):,} domains", action_type, file_name=file_name)
+            self.run_batch(action_type.lower(), domains, file_name, on_success=lambda: self.update_current_domain(
+                "", action_type, final_message=True, file_name=file_name
+            ))
+
+    def on_sync_button_click(self):
+        if not len(self.staged_domains):
+            self.update_feedback("No domains to sync.")
+            return
+        if not self.backend_idle():
+            return
+        if isinstance(self.cached_domains, str):
+            self.update_feedback("The blocked domain list could not be read, so it cannot be synced.")
+            return
+
+        file_name = self.staged_domains.label(self.current_source())
+
+        # The case-insensitive diff is computed on the backend thread, and the job applies exactly what was confirmed
+        def on_result(diff):
+            removals, additions = diff
+            message = (
+                f"Make the registry match {file_name}? This adds {len(additions):,} and "
+                f"removes {len(removals):,} domain(s)."
+            )
+            reply = QMessageBox.question(self, 'Confirmation', message, QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply == QMessageBox.Yes:
+                activity_log.info("User confirmed sync of the registry to %s", file_name)
+                job = bulk_jobs.create_diff_job(removals, additions, file_name)
+                self.run_bulk_job(job, on_success=lambda: self.feedback_text.set_status(
+                    self.current_domain_label, f"The block list now matches {file_name}."
+                ))
+
+        self.backend_executor.submit_interactive(
+            "compute sync", bulk_jobs.sync_diff, self.staged_domains.domains_from(self.current_source()), self.cached_domains,
+            on_result=on_result, exclusive=True
+        )
+
+    def check_unfinished_jobs(self):
+        for job in bulk_jobs.find_unfinished_jobs():
+            reply = QMessageBox.question(
+                self, 'Resume Unfinished Job',
+                f"An interrupted job was found: {job.describe()}.\n\n"
+                "Yes resumes it from the last committed chunk, No discards it, Cancel asks again next time.",
+                QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel, QMessageBox.Yes
+            )
+            if reply == QMessageBox.Yes:
+                activity_log.info("User resumed job %s", job.job_id)
+                self.run_bulk_job(job)
+            elif reply == QMessageBox.No:
+                activity_log.info("User discarded job %s", job.job_id)
+                job.abandon()
+                self.update_feedback(f"Discarded the interrupted {job.describe()}.")
+
+    def run_batch(self, op, domains, label, on_success=None):
+        # A batch that fits in one chunk is applied and journaled in a single backend call; only larger ones become
+        # a resumable job with files on disk
+        if len(domains) > bulk_jobs.DEFAULT_CHUNK_SIZE:
+            self.run_bulk_job(bulk_jobs.create_job(op, domains, label), on_success=on_success)
+            return
+
+        def on_result(result):
+            with self.feedback_text.batch():
+                self.report_batch_result(result, "Add" if op == 'add' else "Remove")
+                if not isinstance(result, str) and on_success is not None:
+                    on_success()
+            added = result['added'] if op == 'add' and not isinstance(result, str) else []
+            self.refresh_existing_domains(then=lambda: self.highlight_domains_in_list(added))
+
+        domains = list(domains)  # Staged domains are views into the shared store
+        if op == 'add':
+            self.backend_executor.submit(f"add {label}", dm_functions.add_domains, domains, label, on_result=on_result, exclusive=True)
+        else:
+            self.backend_executor.submit(f"remove {label}", dm_functions.remove_domains, domains, label, on_result=on_result, exclusive=True)
+
+    def run_bulk_job(self, job, on_success=None):
+        # The job runs on the backend thread; cancelling stops it at the next chunk boundary
+        def report_progress(done, total):
+            self.feedback_text.set_status(self.current_domain_label, f"{job.label}: {done:,} of {total:,} domains committed.")
+
+        def on_result(error):
+            with self.feedback_text.batch():
+                for op in job.ops():
+                    self.report_job_counts(job, op)
+                if error == "cancelled":
+                    self.update_feedback(
+                        f"The {job.action} job was cancelled after {job.committed_domains:,} of {job.total_domains:,} domains. "
+                        "It will be offered for resumption on the next launch."
+                    )
+                elif error is not None:
+                    self.update_feedback(
+                        f"The {job.action} job stopped after {job.committed_domains:,} of {job.total_domains:,} domains: {error} "
+                        "It will be offered for resumption on the next launch."
+                    )
+                elif on_success is not None:
+                    on_success()
 
             self.refresh_existing_domains()
-            self.update_current_domain("", action_type, final_message=True, file_name=file_name)
-            
-            if action_type == "Add":
-                self.highlight_domains_in_list(added_domains)
-
-    def get_domains_and_message(self, selected_items, file_name, action_type):
-        if selected_items:
-            domains = [item.text() for item in selected_items]
+
+        self.backend_executor.submit(
+            f"{job.action} job", job.run_steps, on_result=on_result, on_progress=report_progress,
+            cancel=lambda: setattr(job, 'cancel_requested', True), exclusive=True
+        )
+
+    def get_domains_and_message(self, selected_domains, file_name, action_type):
+        if selected_domains:
+            domains = selected_domains
             message = f"Do you want to {action_type.lower()} the selected domains?"
         else:
-            domains = self.file_cached_domains[0][1]
+            domains = self.staged_domains.domains_from(self.current_source())
             message = f"Do you want to {action_type.lower()} all domains from {file_name}?"
+        if action_type == "Add":
+            statuses = [self.coverage_index.status(domain)[0] for domain in domains]
+            blocked, covered = statuses.count(STATUS_BLOCKED), statuses.count(STATUS_COVERED)
+            if blocked or covered:
+                message += f"\n\n{blocked:,} of them are already blocked and {covered:,} are covered by a blocked parent domain."
         return domains, message
 
-    def perform_domain_action(self, domain, action_type):
+    def report_batch_result(self, result, action_type):
+        if isinstance(result, str):
+            self.update_feedback(result)
+            return
+
         if action_type == "Add":
-            return dm_functions.add_domain(domain)
-        elif action_type == "Remove":
-            return dm_functions.remove_domain(domain)
-        return f"Unsupported action type: {action_type}"
+            changed, unchanged = result['added'], result['skipped']
+            changed_message, unchanged_message = "Domain '{}' added successfully to the registry.", "Domain '{}' already exists in the registry."
+            summary = f"{len(changed):,} domain(s) added to the registry, {len(unchanged):,} already present."
+        else:
+            changed, unchanged = result['removed'], result['missing']
+            changed_message, unchanged_message = "Domain '{}' removed successfully from the registry.", "Domain '{}' not found in registry for removal."
+            summary = f"{len(changed):,} domain(s) removed from the registry, {len(unchanged):,} not found."
+
+        if len(changed) + len(unchanged) <= DETAILED_FEEDBACK_LIMIT:
+            for domain in changed:
+                self.update_feedback(changed_message.format(domain))
+            for domain in unchanged:
+                self.update_feedback(unchanged_message.format(domain))
+        else:
+            self.update_feedback(summary)
+
+    def report_job_counts(self, job, op):
+        # A bulk job's domains stay on disk, so only its counts are reported
+        changed, unchanged = job.changed_count(op), job.unchanged_count(op)
+        if op == 'add':
+            self.update_feedback(f"{changed:,} domain(s) added to the registry, {unchanged:,} already present.")
+        else:
+            self.update_feedback(f"{changed:,} domain(s) removed from the registry, {unchanged:,} not found.")
 
     def update_current_domain(self, domain, action_type, final_message=False, single_domain=False, file_name=None):
         if len(domain) > 100:
             domain = domain[:97] + "..."
 
-        message = self.create_action_message(domain, action_type, file_name)
-        self.current_domain_label.setText(message)
-
         if final_message:
-            success_message = self.create_success_message(domain, action_type, single_domain, file_name)
-            self.current_domain_label.setText(success_message)
+            message = self.create_success_message(domain, action_type, single_domain, file_name)
+        else:
+            message = self.create_action_message(domain, action_type, file_name)
+        self.feedback_text.set_status(self.current_domain_label, message)
 
     def create_action_message(self, domain, action_type, file_name):
         if action_type == "Add":
@@ -566,25 +1103,79 @@ class DomainManagerGUI(QMainWindow):
         return "Operation completed successfully."
 
     def update_feedback(self, message):
-        self.feedback_text.append(message)
-        self.feedback_text.verticalScrollBar().setValue(self.feedback_text.verticalScrollBar().maximum())
-        logging.info(message)
+        self.feedback_text.post(message)  # Written out and logged on the console's next flush
 
     def display_brave_status(self):
-        result = dm_functions.check_brave_installation()
-        self.update_feedback("Brave is installed on this system." if result else "Brave is not installed on this system.")
+        self.backend_executor.submit_background(
+            "check Brave", dm_functions.check_brave_installation,
+            on_result=lambda result: self.update_feedback(
+                "Brave is installed on this system." if result else "Brave is not installed on this system."
+            )
+        )
 
     def display_registry_path(self):
-        path_result = dm_functions.check_registry_path()
-        self.update_feedback(path_result)
-
-    def refresh_existing_domains(self):
-        self.existing_domains_list.clear()
-        self.cached_domains = dm_functions.fetch_existing_domains()
-        if isinstance(self.cached_domains, list):
-            self.existing_domains_list.addItems(self.cached_domains)
-        else:
-            self.update_feedback(self.cached_domains)
+        self.backend_executor.submit_background("check registry path", dm_functions.check_registry_path, on_result=self.update_feedback)
+
+    def refresh_existing_domains(self, then=None, priority=BACKGROUND):
+        # then() runs once the refreshed list has been populated
+        def fetch():
+            if self.registry_watcher is not None:
+                self.registry_watcher.mark_seen()  # This fetch already includes every change made so far
+            domains = dm_functions.fetch_existing_domains()
+            # Packed into a DomainStore here, so the GUI thread never holds the fetched strings
+            return domains if isinstance(domains, str) else domain_view(domains)
+
+        def on_result(domains):
+            self.populate_existing_domains(domains)
+            if then is not None:
+                then()
+
+        self.backend_executor.submit("fetch domains", fetch, priority=priority, on_result=on_result)
+
+    @traced("gui.populate_existing_domains")
+    def populate_existing_domains(self, domains):
+        previous, self.cached_domains = self.cached_domains, domains
+        if isinstance(domains, str):
+            self.existing_domains_list.clear()
+            self.grouped_model.set_groups({})
+            self.grouped_domains = None
+            self.update_feedback(domains)
+            return
+
+        # When the list shows every domain, only the rows that changed are touched. A store that is mostly dead rows
+        # is replaced by the freshly fetched one with a full repaint instead.
+        filtered = self.current_list == 'existing' and self.search_entry.text()
+        bloated = isinstance(previous, DomainView) and previous.store.needs_compaction(len(domains))
+        if not isinstance(previous, str) and len(previous) and not filtered and not bloated:
+            added, removed = diff_domains(previous, domains)
+            if len(added) + len(removed) <= INCREMENTAL_REFRESH_LIMIT:
+                if isinstance(previous, DomainView):
+                    # Keeps the store the list already reads from; the fetched copy is dropped
+                    domains = self.cached_domains = previous.with_changes(added, removed)
+                if added or removed:
+                    with span("gui.apply_existing_diff", added=len(added), removed=len(removed)):
+                        if not self.is_grouped():
+                            self.existing_domains_list.apply_changes(added, removed)
+                        elif self.grouping_task is None:
+                            self.grouped_model.apply_changes(added, removed)
+                            self.grouped_domains = domains
+                        else:
+                            self.group_existing_domains(domains)  # The pending grouping predates this change
+                        self.coverage_index.apply(added, removed)
+                    self.update_file_badges()
+                    self.backend_executor.submit_background("update catalog", dm_functions.mirror_catalog_changes, added, removed)
+                return
+
+        with span("gui.populate_existing_list", rows=len(domains)):
+            self.show_domains(self.existing_domains_list, domains)
+        with span("gui.sync_coverage_index", rows=len(domains)):
+            self.coverage_index.sync(domains)
+        self.update_file_badges()
+        self.backend_executor.submit_background("sync catalog", dm_functions.sync_catalog, domains)
+
+    def update_file_badges(self):
+        # Badges are looked up as rows are painted, so a changed block list only needs a repaint
+        self.file_domains_list.viewport().update()
 
     def search_domains(self):
         search_text = self.search_entry.text()
@@ -602,25 +1193,77 @@ class DomainManagerGUI(QMainWindow):
         if self.current_list == 'existing':
             return self.existing_domains_list, self.cached_domains
         elif self.current_list == 'file':
-            return self.file_domains_list, [domain for _, domain_list in self.file_cached_domains for domain in domain_list]
+            return self.file_domains_list, self.staged_domains.domains_from(self.current_source())
         return None, None
 
+    @traced("gui.perform_search")
     def perform_search(self, search_text, domain_list_widget, cached_domains):
-        domain_list_widget.clear()
+        start = time.perf_counter()
+        try:
+            self.filter_domain_list(search_text, domain_list_widget, cached_domains)
+        finally:
+            counters.record_search((time.perf_counter() - start) * 1000)
+
+    def filter_domain_list(self, search_text, domain_list_widget, cached_domains):
+        if isinstance(cached_domains, str):
+            domain_list_widget.clear()
+            self.update_feedback(cached_domains)
+            return
+        cached_domains = domain_view(cached_domains)
+        if search_text and domain_list_widget is self.existing_domains_list and is_catalog_query(search_text):
+            self.filter_by_catalog(search_text, cached_domains)
+            return
         if not search_text:
-            domain_list_widget.addItems(cached_domains) if isinstance(cached_domains, list) else self.update_feedback(cached_domains)
+            self.show_domains(domain_list_widget, cached_domains)
             return
 
-        if isinstance(cached_domains, list):
-            for domain in cached_domains:
-                if fuzz.partial_ratio(search_text.lower(), domain.lower()) >= SEARCH_THRESHOLD:
-                    domain_list_widget.addItem(domain)
+        search_text = search_text.lower()
+        self.show_domains(domain_list_widget, cached_domains.filter(
+            lambda domain: fuzz.partial_ratio(search_text, domain.lower()) >= SEARCH_THRESHOLD
+        ))
+
+    def show_domains(self, domain_list_widget, domains):
+        # The blocked domains go to the grouped view instead while it is shown; the flat list then stays empty
+        if domain_list_widget is self.existing_domains_list and self.is_grouped():
+            domain_list_widget.clear()
+            if domains is not self.grouped_domains:  # Switching lists re-shows the blocked domains; they are already grouped
+                self.group_existing_domains(domains)
         else:
-            self.update_feedback(cached_domains)
+            domain_list_widget.set_domains(domains)
+
+    def show_existing_domains(self):
+        # Shows the blocked domains again in the current view, still filtered by an active search
+        search_text = self.search_entry.text() if self.current_list == 'existing' else ''
+        self.filter_domain_list(search_text, self.existing_domains_list, self.cached_domains)
+
+    def filter_by_catalog(self, search_text, cached_domains):
+        # Searches such as "source:feed.txt added:7d" are answered from the catalog's indexes on the backend thread;
+        # a newer search replaces a queued one, and a result for a search that has since changed is dropped
+        def query():
+            try:
+                with span("catalog.query"):
+                    matches = dm_functions.query_catalog(search_text)
+            except ValueError as e:
+                return f"Invalid search: {e}"
+            return matches if isinstance(matches, str) else cached_domains.select(matches)
+
+        def on_result(matches):
+            if self.current_list != 'existing' or self.search_entry.text() != search_text:
+                return
+            if isinstance(matches, str):
+                self.show_domains(self.existing_domains_list, [])
+                self.update_feedback(matches)
+                return
+            self.show_domains(self.existing_domains_list, matches)
+
+        self.backend_executor.submit_interactive("catalog search", query, key="catalog search", on_result=on_result)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    logging_pipeline.start_logging(enabled=False)  # Levels are set from config.ini when the GUI loads its preferences
     gui = DomainManagerGUI()
     gui.show()
-    logging.info('Application started')
-    sys.exit(app.exec_())
+    startup_log.info('Application started')
+    exit_code = app.exec_()
+    logging_pipeline.stop_logging()
+    sys.exit(exit_code)
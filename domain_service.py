@@ -0,0 +1,408 @@
+# domain_service.py
+
+# Standard library imports
+import argparse
+import itertools
+import json
+import os
+import queue
+import re
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Listener, Client
+
+# Local imports
+import domain_manager_functions as dm_functions
+import logging_pipeline
+from operation_journal import OperationJournal
+
+# Constants
+SERVICE_ADDRESS_ENV = 'BDM_SERVICE_ADDRESS'
+SERVICE_KEY_ENV = 'BDM_SERVICE_KEY_FILE'
+SERVICE_KEY_FILE = 'service.key'
+SERVICE_JOURNAL_FILE = 'service.journal'
+MERGE_WINDOW = 0.05  # Seconds the writer waits for more requests to merge into the same batch
+REQUEST_TIMEOUT = 300.0
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+WRITE_OPS = ('add', 'remove', 'undo', 'redo', 'record')
+REQUEST_OPS = WRITE_OPS + ('list', 'subscribe', 'status')
+BATCH_ACTIONS = {
+    'add': ("8", ('added', 'skipped')),
+    'remove': ("9", ('removed', 'missing'))
+}
+CONNECTION_LOST = "The connection to the domain service was lost."
+
+# Loggers
+registry_log = logging_pipeline.get_logger("Registry Access Logs")
+security_log = logging_pipeline.get_logger("Security Logs")
+
+def default_address():
+    if sys.platform == 'win32':
+        return r'\\.\pipe\BraveDomainManager'
+    return os.path.join(tempfile.gettempdir(), 'bdm-service.sock')
+
+def parse_address(text):
+    # "host:port" selects TCP on loopback; anything else is a named pipe or a Unix socket path
+    match = re.fullmatch(r'([\w.-]+):(\d+)', text)
+    return (match.group(1), int(match.group(2))) if match else text
+
+def read_service_key(key_file=None):
+    with open(key_file or os.environ.get(SERVICE_KEY_ENV) or SERVICE_KEY_FILE, 'rb') as key:
+        return key.read()
+
+def encode_message(message):
+    # Messages are JSON, never pickles: unpickling what an unelevated client sends would run its code in the service
+    return json.dumps(message, separators=(',', ':')).encode('utf-8')
+
+def decode_message(data):
+    message = json.loads(data.decode('utf-8'))
+    if not isinstance(message, dict):
+        raise ValueError("A service message must be a JSON object.")
+    return message
+
+def write_service_key(key_file=SERVICE_KEY_FILE):
+    # Clients prove they can read this file; keep it where only the accounts allowed to edit the block list can read
+    authkey = secrets.token_bytes(32)
+    fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as key:
+        key.write(authkey)
+    return authkey
+
+# The DomainService owns the registry and a warm copy of the block list. Reads are answered from memory; writes from
+# every client go through one writer thread, which merges the requests that arrive within MERGE_WINDOW into one
+# backend call per operation and pushes the resulting changes to every subscribed client.
+class DomainService:
+    def __init__(self, address=None, key_file=SERVICE_KEY_FILE, journal_file=SERVICE_JOURNAL_FILE):
+        self.address = address or default_address()
+        self.authkey = write_service_key(key_file)
+        self.journal_file = journal_file
+        self.lock = threading.Lock()
+        self.domains = {}  # lowercase -> domain, in registry order
+        self.write_queue = queue.Queue()
+        self.clients = {}  # client id -> ServiceConnection
+        self.client_ids = itertools.count(1)
+        self.listener = None
+        self.journal = None
+        self.write_batches = 0
+        self.stopping = threading.Event()
+
+    def start(self):
+        domains = dm_functions.fetch_registry_domains()
+        if isinstance(domains, str):
+            raise RuntimeError(domains)
+        self.domains = {domain.lower(): domain for domain in domains}
+        self.journal = OperationJournal(self.journal_file, self.apply_batch)
+        if isinstance(self.address, str) and not self.address.startswith('\\\\') and os.path.exists(self.address):
+            os.remove(self.address)  # A socket left behind by a service that did not shut down cleanly
+        self.listener = Listener(self.address, authkey=self.authkey)
+        self.address = self.listener.address
+        threading.Thread(target=self.accept_loop, name="ServiceAccept", daemon=True).start()
+        threading.Thread(target=self.writer_loop, name="ServiceWriter", daemon=True).start()
+        registry_log.info("Domain service listening on %s with %d domain(s)", self.address, len(self.domains))
+
+    def stop(self):
+        self.stopping.set()
+        self.write_queue.put(None)
+        if self.listener is not None:
+            self.listener.close()
+        for client in list(self.clients.values()):
+            client.close()
+        if self.journal is not None:
+            self.journal.close()
+
+    def accept_loop(self):
+        while not self.stopping.is_set():
+            try:
+                connection = self.listener.accept()
+            except Exception as e:
+                if self.stopping.is_set():
+                    return
+                security_log.warning("Rejected a domain service connection: %s", e)
+                continue
+            client = ServiceConnection(next(self.client_ids), connection)
+            self.clients[client.client_id] = client
+            threading.Thread(target=self.client_loop, args=(client,), name=f"ServiceClient{client.client_id}", daemon=True).start()
+
+    def client_loop(self, client):
+        try:
+            while True:
+                request = decode_message(client.connection.recv_bytes(MAX_REQUEST_BYTES))
+                op = request.get('op')
+                error = self.check_request(request)
+                if error is not None:
+                    security_log.warning("Client %d: %s", client.client_id, error)
+                    client.reply(request, error)
+                elif op in WRITE_OPS:
+                    self.write_queue.put((client, request))
+                elif op == 'list':
+                    with self.lock:
+                        client.reply(request, list(self.domains.values()))
+                elif op == 'subscribe':
+                    client.subscribed = True
+                    client.reply(request, True)
+                else:
+                    client.reply(request, self.status())
+        except (EOFError, OSError):
+            pass
+        except ValueError as e:
+            security_log.warning("Closed client %d after a malformed message: %s", client.client_id, e)
+        finally:
+            self.clients.pop(client.client_id, None)
+            client.close()
+
+    def check_request(self, request):
+        # Clients run unelevated, so nothing they send is trusted: only known operations with well-formed fields are
+        # served, and only domains that clean_domain accepts reach the registry. A removal may also name an entry
+        # that is listed as it is, such as a URL pattern set by Group Policy. Returns an error string or None.
+        op = request.get('op')
+        if op not in REQUEST_OPS:
+            return f"Unknown service request: {op}"
+        if not isinstance(request.get('id'), int) or not isinstance(request.get('label', ''), str) \
+                or not isinstance(request.get('journal', True), bool) \
+                or (op == 'record' and request.get('record_op') not in BATCH_ACTIONS):
+            return f"Malformed {op} request."
+        if op not in BATCH_ACTIONS and op != 'record':
+            return None
+        domains = request.get('domains')
+        if not isinstance(domains, list) or not all(isinstance(domain, str) for domain in domains):
+            return f"Malformed {op} request."
+        cleaned = []
+        for domain in domains:
+            with self.lock:
+                listed = self.domains.get(domain.lower())
+            if op == 'remove' and listed is not None:
+                cleaned.append(listed)
+                continue
+            try:
+                cleaned.append(dm_functions.clean_domain(domain))
+            except ValueError as e:
+                if op != 'record':
+                    return f"Rejected {op} request: {e}"
+                security_log.warning("Left %r out of a journal record: %s", domain, e)
+        request['domains'] = list(dict.fromkeys(cleaned))
+        return None
+
+    def status(self):
+        with self.lock:
+            return {
+                'address': str(self.address),
+                'domain_count': len(self.domains),
+                'clients': len(self.clients),
+                'write_batches': self.write_batches,
+                'can_undo': self.journal.can_undo(),
+                'can_redo': self.journal.can_redo()
+            }
+
+    def writer_loop(self):
+        while True:
+            first = self.write_queue.get()
+            if first is None:
+                return
+            requests = [first]
+            deadline = time.monotonic() + MERGE_WINDOW
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    pending = self.write_queue.get(timeout=remaining) if remaining > 0 else self.write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if pending is None:
+                    self.write_queue.put(None)
+                    break
+                requests.append(pending)
+            self.process_requests(requests)
+
+    def process_requests(self, requests):
+        # Consecutive requests for the same operation share one backend call; the order across operations is kept
+        for op, group in itertools.groupby(requests, key=lambda item: item[1]['op']):
+            group = list(group)
+            if op in BATCH_ACTIONS:
+                self.process_batch(op, group)
+                continue
+            for client, request in group:
+                if op == 'undo':
+                    client.reply(request, self.journal.undo())
+                elif op == 'redo':
+                    client.reply(request, self.journal.redo())
+                else:
+                    client.reply(request, self.journal.record(request['record_op'], request['domains'], request.get('label', '')) is not None)
+
+    def process_batch(self, op, group):
+        merged = list(dict.fromkeys(domain for _, request in group for domain in request['domains']))
+        result = self.apply_batch(op, merged)
+        changed_key, unchanged_key = BATCH_ACTIONS[op][1]
+        claimed = set()
+        for client, request in group:
+            if isinstance(result, str):
+                client.reply(request, result)
+                continue
+            # A domain that several clients asked for is credited, and journaled, for the first of them only
+            changed = {domain.lower() for domain in result[changed_key]}
+            own_changes = []
+            for domain in request['domains']:
+                if domain.lower() in changed and domain.lower() not in claimed:
+                    claimed.add(domain.lower())
+                    own_changes.append(domain)
+            own_set = set(own_changes)
+            if request.get('journal', True):
+                self.journal.record(op, own_changes, request.get('label', ''))
+            client.reply(request, {changed_key: own_changes, unchanged_key: [d for d in request['domains'] if d not in own_set]})
+
+    def apply_batch(self, op, domains):
+        # The only place the registry is written; also used by the journal for undo and redo
+        action, result_keys = BATCH_ACTIONS[op]
+        result = dm_functions.execute_batch_action(action, domains, result_keys)
+        if isinstance(result, str):
+            return result
+        with self.lock:
+            self.write_batches += 1
+            if op == 'add':
+                for domain in result['added']:
+                    self.domains[domain.lower()] = domain
+            else:
+                for domain in result['removed']:
+                    self.domains.pop(domain.lower(), None)
+        self.notify({'event': 'changed', 'added': result.get('added', []), 'removed': result.get('removed', [])})
+        return result
+
+    def notify(self, event):
+        if not event['added'] and not event['removed']:
+            return
+        for client in list(self.clients.values()):
+            if client.subscribed:
+                client.send(event)
+
+class ServiceConnection:
+    def __init__(self, client_id, connection):
+        self.client_id = client_id
+        self.connection = connection
+        self.subscribed = False
+        self.send_lock = threading.Lock()
+
+    def send(self, message):
+        try:
+            with self.send_lock:
+                self.connection.send_bytes(encode_message(message))
+        except (OSError, ValueError):
+            pass  # The client went away; its reader thread cleans up
+
+    def reply(self, request, result):
+        self.send({'id': request.get('id'), 'result': result})
+
+    def close(self):
+        try:
+            self.connection.close()
+        except OSError:
+            pass
+
+# The client side used by domain_manager_functions when BDM_SERVICE_ADDRESS is set. Replies are matched to requests
+# by id, so one connection can be shared by the GUI's worker thread and any other caller.
+class DomainServiceClient:
+    def __init__(self, address=None, key_file=None):
+        self.connection = Client(address or default_address(), authkey=read_service_key(key_file))
+        self.request_ids = itertools.count(1)
+        self.pending = {}  # request id -> [threading.Event, result]
+        self.pending_lock = threading.Lock()
+        self.send_lock = threading.Lock()
+        self.listeners = []
+        self.connected = True
+        threading.Thread(target=self.read_loop, name="ServiceClientReader", daemon=True).start()
+
+    def read_loop(self):
+        try:
+            while True:
+                message = decode_message(self.connection.recv_bytes())
+                if 'event' in message:
+                    for listener in list(self.listeners):
+                        listener(message)
+                    continue
+                with self.pending_lock:
+                    waiter = self.pending.pop(message['id'], None)
+                if waiter is not None:
+                    waiter[1] = message['result']
+                    waiter[0].set()
+        except (EOFError, OSError, ValueError):
+            pass
+        finally:
+            was_connected, self.connected = self.connected, False
+            with self.pending_lock:
+                for waiter in self.pending.values():
+                    waiter[1] = CONNECTION_LOST
+                    waiter[0].set()
+                self.pending.clear()
+            if was_connected:
+                # Subscribers refresh on this, which reconnects and subscribes them again
+                for listener in list(self.listeners):
+                    listener({'event': 'disconnected'})
+
+    def request(self, op, timeout=REQUEST_TIMEOUT, **fields):
+        # Returns the service's result, or an error string like every other backend call
+        if not self.connected:
+            return CONNECTION_LOST
+        request_id = next(self.request_ids)
+        waiter = [threading.Event(), None]
+        with self.pending_lock:
+            self.pending[request_id] = waiter
+        try:
+            with self.send_lock:
+                self.connection.send_bytes(encode_message({'id': request_id, 'op': op, **fields}))
+        except (OSError, ValueError):
+            return CONNECTION_LOST
+        if not waiter[0].wait(timeout):
+            return f"The domain service did not answer the {op} request within {timeout:.0f} s."
+        return waiter[1]
+
+    def list_domains(self):
+        return self.request('list')
+
+    def add_domains(self, domains, label='', journal=True):
+        return self.request('add', domains=list(domains), label=label, journal=journal)
+
+    def remove_domains(self, domains, label='', journal=True):
+        return self.request('remove', domains=list(domains), label=label, journal=journal)
+
+    def record(self, op, domains, label=''):
+        return self.request('record', record_op=op, domains=list(domains), label=label)
+
+    def undo(self):
+        return self.request('undo')
+
+    def redo(self):
+        return self.request('redo')
+
+    def status(self):
+        return self.request('status')
+
+    def subscribe(self, listener):
+        # listener(event) runs on the reader thread
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+        return self.request('subscribe')
+
+    def close(self):
+        self.connected = False
+        self.connection.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='domain_service', description="Run the Brave Domain Manager registry service.")
+    parser.add_argument('--address', help=f"Named pipe, Unix socket path or host:port (default: {default_address()})")
+    args = parser.parse_args(argv)
+
+    logging_pipeline.start_logging(enabled=True)
+    service = DomainService(parse_address(args.address) if args.address else None)
+    service.start()
+    print(f"Domain service listening on {service.address}. Press Ctrl+C to stop.")
+    try:
+        while not service.stopping.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        logging_pipeline.stop_logging()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# domain_store.py
+
+# Standard library imports
+import sys
+from array import array
+
+# Constants
+MIN_SLOTS = 16
+MAX_LOAD = 0.5  # The hash table is grown once more than half of its slots are used
+COMPACT_MIN_ROWS = 4096  # Dead rows tolerated before a store is worth rebuilding at all
+COMPACT_RATIO = 1.0  # A store is rebuilt once it holds more dead rows than live ones
+
+# The DomainStore keeps domains in one UTF-8 buffer with an offsets array, instead of one Python str per domain, plus
+# an open-addressing hash table of row numbers for case-insensitive lookups. It only grows: rows are never removed,
+# so row numbers stay valid for every DomainView over it. Its owners rebuild it instead, into a new store, once
+# needs_compaction() says most of it is dead rows. Domains are decoded on access, which for a list view means only
+# the rows being painted.
+class DomainStore:
+    def __init__(self, domains=()):
+        self.buffer = bytearray()
+        self.offsets = array('I', [0])  # Row i is buffer[offsets[i]:offsets[i + 1]]
+        self.slots = array('i', bytes(MIN_SLOTS * 4))  # row + 1, or 0 for an empty slot
+        self.extend(domains)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row):
+        return self.buffer[self.offsets[row]:self.offsets[row + 1]].decode('utf-8')
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+    def __contains__(self, domain):
+        return self.index(domain) >= 0
+
+    def find(self, key):
+        # key is lowercase; returns (row or -1, slot where it is or would go)
+        mask = len(self.slots) - 1
+        slot = hash(key) & mask
+        while True:
+            row = self.slots[slot] - 1
+            if row < 0 or self[row].lower() == key:
+                return row, slot
+            slot = (slot + 1) & mask
+
+    def index(self, domain):
+        return self.find(domain.lower())[0]
+
+    def add(self, domain):
+        # Returns the row of the domain, appending it unless a differently cased copy is already stored
+        key = domain.lower()
+        row, slot = self.find(key)
+        if row >= 0:
+            return row
+        row = len(self)
+        self.buffer += domain.encode('utf-8')
+        self.offsets.append(len(self.buffer))
+        self.slots[slot] = row + 1
+        if len(self) > len(self.slots) * MAX_LOAD:
+            self.rehash(len(self.slots) * 2)
+        return row
+
+    def extend(self, domains):
+        return array('I', map(self.add, domains))
+
+    def rehash(self, size):
+        slots = array('i', bytes(size * 4))
+        mask = size - 1
+        for row in range(len(self)):
+            slot = hash(self[row].lower()) & mask
+            while slots[slot]:
+                slot = (slot + 1) & mask
+            slots[slot] = row + 1
+        self.slots = slots
+
+    def needs_compaction(self, live_rows):
+        dead_rows = len(self) - live_rows
+        return dead_rows > COMPACT_MIN_ROWS and dead_rows > live_rows * COMPACT_RATIO
+
+    def nbytes(self):
+        return sys.getsizeof(self.buffer) + sys.getsizeof(self.offsets) + sys.getsizeof(self.slots)
+
+# A DomainView is an ordered selection of rows from a DomainStore: the blocked list, a search result, one file's
+# domains. It holds four bytes per row; views of the same store share its buffer.
+class DomainView:
+    def __init__(self, store, rows=None):
+        self.store = store
+        self.rows = array('I', range(len(store))) if rows is None else rows
+        self.positions = None  # store row -> position in this view, built on first lookup
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self.store[row] for row in self.rows[position]]
+        return self.store[self.rows[position]]
+
+    def __iter__(self):
+        store = self.store
+        for row in self.rows:
+            yield store[row]
+
+    def __contains__(self, domain):
+        return self.position_of(domain) >= 0
+
+    def position_of(self, domain):
+        row = self.store.index(domain)
+        if row < 0:
+            return -1
+        if self.positions is None:
+            self.positions = {row: position for position, row in enumerate(self.rows)}
+        return self.positions.get(row, -1)
+
+    def filter(self, predicate):
+        store = self.store
+        return DomainView(store, array('I', (row for row in self.rows if predicate(store[row]))))
+
+    def select(self, domains):
+        # The listed domains that are in this view, in the order given
+        return DomainView(self.store, array('I', (self.store.index(domain) for domain in domains if domain in self)))
+
+    def with_changes(self, added=(), removed=()):
+        # A new view without the removed domains and with the added ones at the end. The store is shared, so this
+        # costs the rows array rather than a copy of the domains.
+        removed_rows = {row for row in map(self.store.index, removed) if row >= 0}
+        rows = array('I', (row for row in self.rows if row not in removed_rows))
+        listed = set(rows)
+        for row in self.store.extend(added):
+            if row not in listed:
+                listed.add(row)
+                rows.append(row)
+        return DomainView(self.store, rows)
+
+    def nbytes(self):
+        return sys.getsizeof(self.rows)
+
+def domain_view(domains):
+    # Wraps any sequence of domains in a view over a new store; views are returned as they are
+    if isinstance(domains, DomainView):
+        return domains
+    store = DomainStore(domains)
+    return DomainView(store)
@@ -0,0 +1,219 @@
+# feed_diff.py
+
+# Standard library imports
+import heapq
+import math
+import os
+import shutil
+import tempfile
+
+# Local imports
+import domain_manager_functions as dm_functions
+from perf_trace import span
+
+# Constants
+DEFAULT_MEMORY_MB = 256
+MIN_RUN_BYTES = 1 << 20
+ENTRY_OVERHEAD = 57  # Bytes a short str costs in a list beyond its characters: object header plus the list slot
+MERGE_FAN_IN = 64  # Runs merged at once; more are first merged into longer runs
+READ_BUFFER = 1 << 16
+BLOOM_ERROR_RATE = 0.01
+
+def entry_key(line):
+    # Run lines are "key" or "key<TAB>domain as listed"; a tab sorts below every character a domain may contain,
+    # so sorting the lines sorts them by key
+    return line.partition('\t')[0]
+
+def unique_by_key(lines):
+    previous = None
+    for line in lines:
+        key = entry_key(line)
+        if key != previous:
+            previous = key
+            yield line
+
+def read_lines(path):
+    with open(path, encoding='utf-8', buffering=READ_BUFFER) as run_file:
+        for line in run_file:
+            yield line[:-1]
+
+def write_lines(path, lines):
+    count = 0
+    with open(path, 'w', encoding='utf-8', buffering=READ_BUFFER) as run_file:
+        for line in lines:
+            run_file.write(line + '\n')
+            count += 1
+    return count
+
+# A Bloom filter of the current block list. Most feed entries are not blocked yet, and the filter says so for certain,
+# so only the few it cannot rule out have to be merged against the sorted block list.
+class BloomFilter:
+    def __init__(self, capacity, error_rate=BLOOM_ERROR_RATE):
+        capacity = max(1, capacity)
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def positions(self, key):
+        # Double hashing on the two halves of one 64-bit hash; the filter only lives for one process
+        value = hash(key) & 0xFFFFFFFFFFFFFFFF
+        first, second = value & 0xFFFFFFFF, (value >> 32) | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(key))
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+# Collects lines under a memory budget: whenever the buffered lines would exceed it, they are sorted, deduplicated
+# and written to a run file. Iterating merges the runs into one sorted, unique stream; lines that never outgrew the
+# budget are sorted in memory and never touch the disk.
+class SortedRuns:
+    def __init__(self, directory, name, memory_budget):
+        self.directory = directory
+        self.name = name
+        self.budget = max(MIN_RUN_BYTES, memory_budget // 2)  # Half is kept free for sorting
+        self.buffer = []
+        self.buffer_bytes = 0
+        self.paths = []
+        self.run_count = 0
+
+    def add(self, line):
+        self.buffer.append(line)
+        self.buffer_bytes += ENTRY_OVERHEAD + len(line)
+        if self.buffer_bytes >= self.budget:
+            self.spill()
+
+    def new_path(self):
+        self.run_count += 1
+        return os.path.join(self.directory, f"{self.name}-{self.run_count}.run")
+
+    def spill(self):
+        if not self.buffer:
+            return
+        self.buffer.sort()
+        path = self.new_path()
+        with span("feed_diff.spill_run", run=self.name, lines=len(self.buffer)):
+            write_lines(path, unique_by_key(self.buffer))
+        self.paths.append(path)
+        self.buffer = []
+        self.buffer_bytes = 0
+
+    def __iter__(self):
+        if not self.paths:
+            self.buffer.sort()
+            return unique_by_key(self.buffer)
+        self.spill()
+        while len(self.paths) > MERGE_FAN_IN:
+            # Each pass merges groups of runs into longer runs, so no more than MERGE_FAN_IN files are open at once
+            groups = [self.paths[start:start + MERGE_FAN_IN] for start in range(0, len(self.paths), MERGE_FAN_IN)]
+            self.paths = []
+            for group in groups:
+                path = self.new_path()
+                write_lines(path, unique_by_key(heapq.merge(*map(read_lines, group))))
+                for merged_path in group:
+                    os.remove(merged_path)
+                self.paths.append(path)
+        return unique_by_key(heapq.merge(*map(read_lines, self.paths)))
+
+# The outcome of diff_feed(): counts, and the domains to add and to remove in sorted files, so that neither side of
+# the difference has to fit in memory. Use it as a context manager, or close() it, to delete the files.
+class FeedDiff:
+    def __init__(self, directory):
+        self.directory = directory
+        self.additions_path = os.path.join(directory, 'additions.txt')
+        self.removals_path = os.path.join(directory, 'removals.txt')
+        self.counts = {'feed': 0, 'invalid': 0, 'add': 0, 'remove': 0, 'common': 0, 'runs': 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def additions(self):
+        return read_lines(self.additions_path)
+
+    def removals(self):
+        # Domains as they are listed in the registry, which is how they have to be removed
+        return read_lines(self.removals_path)
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+def merge_join(feed_keys, current_lines, removals_file, counts):
+    # Walks both sorted streams once; yields the feed keys that are not blocked and writes the listed domains the
+    # feed does not contain
+    feed_key = next(feed_keys, None)
+    current = next(current_lines, None)
+    while feed_key is not None or current is not None:
+        current_key = entry_key(current) if current is not None else None
+        if current is None or (feed_key is not None and feed_key < current_key):
+            yield feed_key
+            feed_key = next(feed_keys, None)
+        elif feed_key is None or current_key < feed_key:
+            removals_file.write((current.partition('\t')[2] or current_key) + '\n')
+            counts['remove'] += 1
+            current = next(current_lines, None)
+        else:
+            counts['common'] += 1
+            feed_key = next(feed_keys, None)
+            current = next(current_lines, None)
+
+def diff_feed(entries, current_domains, memory_mb=DEFAULT_MEMORY_MB, bloom=False, temp_dir=None):
+    # entries are (source, raw entry) pairs as the import paths read them; current_domains is the block list.
+    # Both are spilled to sorted runs under memory_mb and merged, so a feed of tens of millions of hostnames is
+    # compared in one sequential pass. With bloom=True, feed entries the filter rules out skip the merge.
+    diff = FeedDiff(tempfile.mkdtemp(prefix='bdm-feed-', dir=temp_dir))
+    try:
+        with span("feed_diff.diff", memory_mb=memory_mb, bloom=bloom) as diff_span:
+            run_feed(diff, entries, current_domains, memory_mb * 1024 * 1024, bloom)
+            diff_span.set(**diff.counts)
+    except BaseException:
+        diff.close()
+        raise
+    return diff
+
+def run_feed(diff, entries, current_domains, memory_cap, bloom):
+    counts = diff.counts
+    filter_ = BloomFilter(len(current_domains)) if bloom else None
+    run_sets = 3 if bloom else 2
+    budget = (memory_cap - (filter_.nbytes if filter_ else 0)) // run_sets
+
+    current = SortedRuns(diff.directory, 'current', budget)
+    for domain in current_domains:
+        key = domain.lower()
+        current.add(key if key == domain else f"{key}\t{domain}")
+        if filter_ is not None:
+            filter_.add(key)
+
+    candidates = SortedRuns(diff.directory, 'feed', budget)
+    unlisted = SortedRuns(diff.directory, 'unlisted', budget) if bloom else None
+    for _, raw in entries:
+        raw = str(raw).strip()
+        if not raw or raw.startswith('#'):
+            continue
+        try:
+            key = dm_functions.clean_domain(raw)
+        except ValueError:
+            counts['invalid'] += 1
+            continue
+        counts['feed'] += 1
+        if unlisted is not None and key not in filter_:
+            unlisted.add(key)
+        else:
+            candidates.add(key)
+
+    with open(diff.removals_path, 'w', encoding='utf-8', buffering=READ_BUFFER) as removals_file:
+        additions = merge_join(iter(candidates), iter(current), removals_file, counts)
+        if unlisted is not None:
+            # A key always gets the same answer from the filter, so the two streams never hold the same domain
+            additions = heapq.merge(additions, iter(unlisted))
+        counts['add'] = write_lines(diff.additions_path, additions)
+    counts['runs'] = sum(len(runs.paths) for runs in (current, candidates, unlisted) if runs is not None)
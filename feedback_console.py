@@ -0,0 +1,92 @@
+# feedback_console.py
+
+# Standard library imports
+import logging
+from contextlib import contextmanager
+
+# PyQt5 imports
+from PyQt5.QtWidgets import QPlainTextEdit
+from PyQt5.QtCore import QTimer
+
+# Local imports
+import logging_pipeline
+
+# Constants
+MAX_LINES = 5000
+FLUSH_FPS = 30
+
+# Loggers
+results_log = logging_pipeline.get_logger("Success/Error Logs")
+
+# The FeedbackConsole coalesces feedback messages and status label updates and writes them out on a timer,
+# so a bulk operation touching thousands of domains costs a handful of widget updates per second.
+class FeedbackConsole(QPlainTextEdit):
+    def __init__(self, parent=None, max_lines=MAX_LINES, fps=FLUSH_FPS):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(max_lines)  # Oldest lines are dropped once the cap is reached
+
+        self.pending_lines = []  # [message, repeat_count] pairs waiting for the next flush
+        self.tallies = {}  # key -> [count, template], summarised when the current batch ends
+        self.pending_status = {}  # label -> text, only the latest text per label is applied
+        self.batch_depth = 0
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(max(1, 1000 // fps))
+        self.flush_timer.timeout.connect(self.flush)
+
+    def post(self, message):
+        message = str(message)
+        if self.pending_lines and self.pending_lines[-1][0] == message:
+            self.pending_lines[-1][1] += 1
+        else:
+            self.pending_lines.append([message, 1])
+        self.schedule_flush()
+
+    def tally(self, key, template, count=1):
+        # template is formatted with the total count, e.g. "{count:,} invalid lines skipped"
+        entry = self.tallies.setdefault(key, [0, template])
+        entry[0] += count
+        if not self.batch_depth:
+            self.schedule_flush()
+
+    def set_status(self, label, text):
+        self.pending_status[label] = text
+        self.schedule_flush()
+
+    @contextmanager
+    def batch(self):
+        self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.batch_depth -= 1
+            if not self.batch_depth:
+                self.schedule_flush()
+
+    def schedule_flush(self):
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        if not self.batch_depth:
+            for count, template in self.tallies.values():
+                self.pending_lines.append([template.format(count=count), 1])
+            self.tallies.clear()
+
+        lines = [message if repeats == 1 else f"{message} (x{repeats:,})" for message, repeats in self.pending_lines]
+        self.pending_lines.clear()
+
+        if lines:
+            self.appendPlainText("\n".join(lines))
+            scroll_bar = self.verticalScrollBar()
+            scroll_bar.setValue(scroll_bar.maximum())
+            if results_log.isEnabledFor(logging.INFO):
+                for line in lines:
+                    results_log.info(line)
+
+        for label, text in self.pending_status.items():
+            label.setText(text)
+        self.pending_status.clear()
+        self.flush_timer.stop()  # Tallies held by an open batch are rescheduled when the batch ends
@@ -0,0 +1,259 @@
+# grouped_domain_model.py
+
+# Standard library imports
+import bisect
+
+# PyQt5 imports
+from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+# Local imports
+from domain_index import entry_host
+from public_suffix import get_public_suffix_list
+from url_policy import is_ip_address
+
+# Constants
+FETCH_BATCH = 500  # Rows created per fetchMore(), for the group list and for each expanded group
+HEADERS = ("Site", "Domains")
+GROUP_COLUMN, COUNT_COLUMN = 0, 1
+ROOT_ID = 0  # Internal id of top-level rows; child rows carry their group's id
+
+def group_key(domain, suffix_list=None):
+    # The registrable domain (eTLD+1) of a blocked entry's host. URL patterns are grouped by their host and an IP
+    # address is its own group; entries without a host, or without a registrable domain, form their own group.
+    host = entry_host(domain)
+    if host is None:
+        return domain.lower()
+    if is_ip_address(host):
+        return host
+    return (suffix_list or get_public_suffix_list()).registrable_domain(host) or host
+
+def group_domains(domains, suffix_list=None):
+    # {group: [domain, ...]} with each group's domains sorted. Runs off the GUI thread for large lists.
+    suffix_list = suffix_list or get_public_suffix_list()
+    groups = {}
+    for domain in domains:
+        key = group_key(domain, suffix_list)
+        members = groups.get(key)
+        if members is None:
+            groups[key] = [domain]
+        else:
+            members.append(domain)
+    for members in groups.values():
+        members.sort()
+    return groups
+
+# A two-level model of the blocked domains: one row per registrable domain with its domain count, and the domains
+# under it. Rows are created only as the view asks for them (canFetchMore/fetchMore), so a list of a million
+# domains costs one batch of group rows until groups are expanded. The full lists stay in plain Python containers,
+# which is also what selecting a whole group reads from.
+class GroupedDomainModel(QAbstractItemModel):
+    def __init__(self, parent=None, fetch_batch=FETCH_BATCH):
+        super().__init__(parent)
+        self.fetch_batch = fetch_batch
+        self.suffix_list = get_public_suffix_list()
+        self.names = []  # Sorted group names; the row of a group is its position here
+        self.groups = {}  # group -> sorted [domain, ...]
+        self.loaded = {}  # group -> child rows created so far, for groups that have been expanded
+        self.loaded_groups = 0
+        self.group_ids = {}  # group -> id, stable while rows around it come and go
+        self.id_groups = {}
+        self.next_id = ROOT_ID + 1
+        self.domain_count = 0
+        self.fetching = False  # Views may ask for more rows while an insertion is being announced
+
+    def set_groups(self, groups):
+        self.beginResetModel()
+        self.groups = groups
+        self.names = sorted(groups)
+        self.loaded = {}
+        self.loaded_groups = 0
+        self.group_ids = {}
+        self.id_groups = {}
+        self.domain_count = sum(map(len, groups.values()))
+        self.endResetModel()
+
+    def set_domains(self, domains):
+        self.set_groups(group_domains(domains, self.suffix_list))
+
+    def group_id(self, name):
+        group_id = self.group_ids.get(name)
+        if group_id is None:
+            group_id = self.group_ids[name] = self.next_id
+            self.id_groups[group_id] = name
+            self.next_id += 1
+        return group_id
+
+    def group_row(self, name):
+        return bisect.bisect_left(self.names, name)
+
+    def group_of(self, index):
+        # The group name of a top-level index, or None for the root and for child rows
+        if index.isValid() and index.internalId() == ROOT_ID:
+            return self.names[index.row()]
+        return None
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, ROOT_ID)
+        return self.createIndex(row, column, self.group_id(self.names[parent.row()]))
+
+    def parent(self, index=None):
+        if index is None:
+            return super().parent()  # QObject.parent()
+        if not index.isValid() or index.internalId() == ROOT_ID:
+            return QModelIndex()
+        return self.createIndex(self.group_row(self.id_groups[index.internalId()]), 0, ROOT_ID)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return self.loaded_groups
+        name = self.group_of(parent)
+        if name is None or parent.column() != GROUP_COLUMN:
+            return 0
+        return self.loaded.get(name, 0)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(HEADERS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self.names)
+        return parent.column() == GROUP_COLUMN and self.group_of(parent) is not None
+
+    def canFetchMore(self, parent):
+        if self.fetching:
+            return False
+        if not parent.isValid():
+            return self.loaded_groups < len(self.names)
+        name = self.group_of(parent)
+        return name is not None and self.loaded.get(name, 0) < len(self.groups[name])
+
+    def fetchMore(self, parent):
+        if not parent.isValid():
+            start = self.loaded_groups
+            count = min(self.fetch_batch, len(self.names) - start)
+        else:
+            name = self.group_of(parent)
+            if name is None:
+                return
+            start = self.loaded.get(name, 0)
+            count = min(self.fetch_batch, len(self.groups[name]) - start)
+        if count <= 0:
+            return
+        self.fetching = True
+        try:
+            self.beginInsertRows(parent, start, start + count - 1)
+            if parent.isValid():
+                self.loaded[name] = start + count
+            else:
+                self.loaded_groups = start + count
+            self.endInsertRows()
+        finally:
+            self.fetching = False
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name = self.group_of(index)
+        if role == Qt.DisplayRole:
+            if name is None:
+                return self.groups[self.id_groups[index.internalId()]][index.row()] if index.column() == GROUP_COLUMN else None
+            return name if index.column() == GROUP_COLUMN else f"{len(self.groups[name]):,}"
+        if role == Qt.TextAlignmentRole and index.column() == COUNT_COLUMN:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return HEADERS[section]
+        return None
+
+    def domains(self):
+        return [domain for name in self.names for domain in self.groups[name]]
+
+    def domains_for(self, indexes):
+        # The domains behind a selection: a selected group stands for every domain in it, loaded or not
+        selected = {}
+        for index in indexes:
+            if not index.isValid() or index.column() != GROUP_COLUMN:
+                continue
+            name = self.group_of(index)
+            if name is not None:
+                selected.update(dict.fromkeys(self.groups[name]))
+            else:
+                selected[self.groups[self.id_groups[index.internalId()]][index.row()]] = None
+        return list(selected)
+
+    def apply_changes(self, added=(), removed=()):
+        # Updates the groups in place, keeping expanded groups and the selection, instead of regrouping everything
+        changed = set()
+        for domain in removed:
+            name = group_key(domain, self.suffix_list)
+            members = self.groups.get(name, [])
+            position = bisect.bisect_left(members, domain)
+            if position == len(members) or members[position] != domain:
+                continue
+            self.remove_member(name, members, position)
+            changed.add(name)
+        for domain in added:
+            name = group_key(domain, self.suffix_list)
+            if name not in self.groups:
+                self.insert_group(name)
+            members = self.groups[name]
+            position = bisect.bisect_left(members, domain)
+            if position < len(members) and members[position] == domain:
+                continue
+            loaded = self.loaded.get(name)
+            if loaded is not None and (position < loaded or loaded == len(members)):
+                self.beginInsertRows(self.index(self.group_row(name), GROUP_COLUMN), position, position)
+                members.insert(position, domain)
+                self.loaded[name] = loaded + 1
+                self.endInsertRows()
+            else:
+                members.insert(position, domain)
+            self.domain_count += 1
+            changed.add(name)
+        for name in changed:
+            row = self.group_row(name)
+            if name in self.groups and row < self.loaded_groups:
+                count_index = self.index(row, COUNT_COLUMN)
+                self.dataChanged.emit(count_index, count_index, [Qt.DisplayRole])
+
+    def remove_member(self, name, members, position):
+        loaded = self.loaded.get(name)
+        if loaded is not None and position < loaded:
+            self.beginRemoveRows(self.index(self.group_row(name), GROUP_COLUMN), position, position)
+            del members[position]
+            self.loaded[name] = loaded - 1
+            self.endRemoveRows()
+        else:
+            del members[position]
+        self.domain_count -= 1
+        if not members:
+            self.remove_group(name)
+
+    def insert_group(self, name):
+        row = self.group_row(name)
+        visible = row < self.loaded_groups
+        if visible:
+            self.beginInsertRows(QModelIndex(), row, row)
+        self.names.insert(row, name)
+        self.groups[name] = []
+        if visible:
+            self.loaded_groups += 1
+            self.endInsertRows()
+
+    def remove_group(self, name):
+        row = self.group_row(name)
+        visible = row < self.loaded_groups
+        if visible:
+            self.beginRemoveRows(QModelIndex(), row, row)
+        del self.names[row]
+        del self.groups[name]
+        self.loaded.pop(name, None)
+        if visible:
+            self.loaded_groups -= 1
+            self.endRemoveRows()
+        self.id_groups.pop(self.group_ids.pop(name, None), None)
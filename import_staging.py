@@ -0,0 +1,154 @@
+# import_staging.py
+
+# Standard library imports
+import os
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+# Local imports
+import domain_manager_functions as dm_functions
+from domain_index import minimize_domains
+from domain_store import DomainStore, DomainView
+from perf_trace import span
+
+# Constants
+SUPPORTED_EXTENSIONS = ('.txt', '.csv', '.json')
+PATH_SEPARATOR = ';'  # Several files or directories can be entered in one path field
+PARSE_WORKERS = min(8, (os.cpu_count() or 1) + 2)
+
+class ParsedSource:
+    def __init__(self, path, domains=(), invalid=(), covered=(), error=None):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.domains = list(domains)
+        self.invalid = list(invalid)  # (entry, reason) pairs
+        self.covered = list(covered)  # (domain, covering entry) pairs dropped by minimize
+        self.error = error
+
+def split_paths(text):
+    return [path.strip() for path in text.split(PATH_SEPARATOR) if path.strip()]
+
+def expand_paths(paths):
+    # Directories contribute their supported files, recursively and in name order; files are kept as given
+    expanded = []
+    for path in paths:
+        if not os.path.isdir(path):
+            expanded.append(path)
+            continue
+        for root, directories, files in os.walk(path):
+            directories.sort()
+            expanded.extend(os.path.join(root, name) for name in sorted(files) if name.lower().endswith(SUPPORTED_EXTENSIONS))
+    return list(dict.fromkeys(expanded))
+
+def parse_source(path, minimize=False):
+    processing_function = dm_functions.get_processing_function(path)
+    if not processing_function:
+        return ParsedSource(path, error=f"Unsupported file format for {os.path.basename(path)}. Please use .txt, .csv, or .json.")
+    try:
+        with span("validate.clean_domain_batch", file=os.path.basename(path)) as batch_span:
+            domains, invalid = dm_functions.clean_domains(domain for _, domain in processing_function(path))
+            batch_span.set(valid=len(domains), invalid=len(invalid))
+    except Exception as e:
+        return ParsedSource(path, error=str(e))
+    covered = []
+    if minimize:
+        domains, covered = minimize_domains(domains)
+    return ParsedSource(path, domains, invalid, covered)
+
+def parse_sources(paths, minimize=False, workers=PARSE_WORKERS):
+    # Yields a ParsedSource per path, in path order so the merged list does not depend on timing. Reading and
+    # validating files are independent, so they run on a thread pool; one file is parsed on the calling thread.
+    if len(paths) <= 1:
+        for path in paths:
+            yield parse_source(path, minimize)
+        return
+    with ThreadPoolExecutor(max_workers=min(workers, len(paths)), thread_name_prefix="ImportParse") as pool:
+        futures = [pool.submit(parse_source, path, minimize) for path in paths]
+        for future in futures:
+            yield future.result()
+
+# StagedDomains holds the domains loaded from every source in one DomainStore and remembers, for each domain, the
+# sources it came from. Taking everything from one source, or dropping a source, works on arrays of store rows
+# without reading the files again. Dropped domains stay in the store until it is mostly dead rows; then it is rebuilt
+# from the domains still staged.
+class StagedDomains:
+    def __init__(self):
+        self.store = DomainStore()
+        self.sources = {}  # source path -> array of store rows, in file order
+        self.domain_sources = {}  # store row -> source path, or a list of them when several, in staging order
+
+    def __len__(self):
+        return len(self.domain_sources)
+
+    def add_source(self, path, domains):
+        # Returns how many domains were not staged before; loading a path again replaces its earlier contents
+        if path in self.sources:
+            self.remove_source(path)
+        rows = self.sources[path] = array('I')
+        seen = set()
+        new_count = 0
+        for row in self.store.extend(domains):
+            if row in seen:
+                continue
+            seen.add(row)
+            rows.append(row)
+            sources = self.domain_sources.get(row)
+            if sources is None:
+                self.domain_sources[row] = path
+                new_count += 1
+            elif isinstance(sources, list):
+                sources.append(path)
+            else:
+                self.domain_sources[row] = [sources, path]
+        return new_count
+
+    def remove_source(self, path):
+        # Returns the domains that no other source provides, which leave the staging set
+        removed = []
+        for row in self.sources.pop(path, ()):
+            sources = self.domain_sources[row]
+            if not isinstance(sources, list):
+                del self.domain_sources[row]
+                removed.append(self.store[row])
+                continue
+            sources.remove(path)
+            if len(sources) == 1:
+                self.domain_sources[row] = sources[0]
+        if self.store.needs_compaction(len(self.domain_sources)):
+            self.compact()
+        return removed
+
+    def compact(self):
+        # Views handed out earlier keep the old store, so they stay valid
+        store = DomainStore()
+        new_rows = {row: store.add(self.store[row]) for row in self.domain_sources}
+        self.domain_sources = {new_rows[row]: sources for row, sources in self.domain_sources.items()}
+        self.sources = {path: array('I', (new_rows[row] for row in rows)) for path, rows in self.sources.items()}
+        self.store = store
+
+    def clear(self):
+        self.store = DomainStore()
+        self.sources.clear()
+        self.domain_sources.clear()
+
+    def source_paths(self):
+        return list(self.sources)
+
+    def domains_from(self, path=None):
+        # A view of every staged domain, or only those from one source
+        if path is None:
+            return DomainView(self.store, array('I', self.domain_sources))
+        return DomainView(self.store, self.sources.get(path, array('I')))
+
+    def sources_of(self, domain):
+        sources = self.domain_sources.get(self.store.index(domain))
+        if sources is None:
+            return []
+        return list(sources) if isinstance(sources, list) else [sources]
+
+    def label(self, path=None):
+        # Describes a source, or all of them, in feedback and the undo history
+        if path is not None:
+            return os.path.basename(path)
+        names = [os.path.basename(path) for path in self.sources]
+        return names[0] if len(names) == 1 else f"{len(names)} files"
@@ -0,0 +1,135 @@
+# job_scheduler.py
+
+# Standard library imports
+import heapq
+import inspect
+import itertools
+import threading
+
+# Local imports
+import logging_pipeline
+
+# Constants
+INTERACTIVE = 0  # Single edits from the Add Domain box, undo and redo
+BULK = 1  # Chunked imports, deletes and syncs
+BACKGROUND = 2  # List refreshes and startup checks
+OPPOSITE_OPS = {'add': 'remove', 'remove': 'add'}
+
+# Loggers
+results_log = logging_pipeline.get_logger("Success/Error Logs")
+
+class ScheduledTask:
+    def __init__(self, name, function, args=(), kwargs=None, priority=BULK, key=None, on_done=None, op=None):
+        self.name = name
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.priority = priority
+        self.key = key  # Writes to the same domain share a key; a newer queued write supersedes an older one
+        self.op = op  # 'add' or 'remove', given only when the write is known to change the block list
+        self.on_done = on_done
+        self.sequence = None
+        self.entry = None
+        self.generator = None
+
+    @property
+    def started(self):
+        return self.generator is not None
+
+    def finish(self, result):
+        if self.on_done is not None:
+            self.on_done(result)
+
+# The JobScheduler is the single writer in front of the backend: one thread calls run_next() in a loop and nothing
+# else touches the registry. Lower priority values run first and equal priorities run in submission order.
+# A task whose function returns a generator runs one step per run_next() call and goes back into the queue in
+# between, so a bulk job yields at every chunk boundary and a queued interactive edit runs before its next chunk.
+class JobScheduler:
+    def __init__(self):
+        self.queue = []
+        self.queued_by_key = {}
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.closed = False
+
+    def submit(self, task):
+        with self.condition:
+            if self.closed:
+                return None
+            superseded = self.queued_by_key.pop(task.key, None) if task.key is not None else None
+            if superseded is not None:
+                self.queue.remove(superseded.entry)
+                heapq.heapify(self.queue)
+            # A queued write that is known to change the list and a newer opposite one cancel each other out. Without
+            # that knowledge the older one might be a no-op (adding a domain already listed), so the newer one wins.
+            cancelled = superseded is not None and task.op is not None and OPPOSITE_OPS.get(superseded.op) == task.op
+            if not cancelled:
+                task.sequence = next(self.sequence)
+                self.push(task)
+                if task.key is not None:
+                    self.queued_by_key[task.key] = task
+                self.condition.notify()
+        if cancelled:
+            results_log.info("%s and %s cancelled each other out", superseded.name, task.name)
+            message = f"{superseded.name} was cancelled by {task.name} before it ran; the block list is unchanged."
+            superseded.finish(message)
+            task.finish(message)
+        elif superseded is not None:
+            results_log.info("%s superseded by %s", superseded.name, task.name)
+            superseded.finish(f"{superseded.name} was superseded by a later request for the same domain.")
+        return task
+
+    def push(self, task):
+        task.entry = (task.priority, task.sequence, task)
+        heapq.heappush(self.queue, task.entry)
+
+    def next_task(self, timeout=None):
+        # Blocks until a task is queued; returns None once the scheduler is closed or the timeout expires
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.queue or self.closed, timeout) or self.closed:
+                return None
+            task = heapq.heappop(self.queue)[2]
+            if task.key is not None and self.queued_by_key.get(task.key) is task:
+                del self.queued_by_key[task.key]
+            return task
+
+    def requeue(self, task):
+        # A yielding task keeps its original sequence number, so it resumes ahead of later work of the same priority
+        with self.condition:
+            if not self.closed:
+                self.push(task)
+                self.condition.notify()
+
+    def run_next(self, timeout=None):
+        # Runs one task, or one step of a generator task; returns False once the scheduler is closed
+        task = self.next_task(timeout)
+        if task is None:
+            return not self.closed
+        try:
+            if not task.started:
+                result = task.function(*task.args, **task.kwargs)
+                if inspect.isgenerator(result):
+                    task.generator = result
+            if task.started:
+                next(task.generator)
+                self.requeue(task)
+                return True
+        except StopIteration as stop:
+            result = stop.value
+        except Exception as e:
+            results_log.exception("Backend task %s failed", task.name)
+            result = f"{task.name} failed: {e}"
+        task.finish(result)
+        return True
+
+    def pending(self):
+        with self.condition:
+            return len(self.queue)
+
+    def close(self):
+        # Queued work is dropped; a bulk job that was interrupted this way stays on disk and can be resumed
+        with self.condition:
+            self.closed = True
+            self.queue.clear()
+            self.queued_by_key.clear()
+            self.condition.notify_all()
@@ -0,0 +1,99 @@
+# logging_pipeline.py
+
+# Standard library imports
+import logging
+import logging.handlers
+import queue
+
+# Constants
+LOG_FILE = 'domain_manager.log'
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 5
+APP_LOGGER_NAME = 'domain_manager'
+DISABLED_LEVEL = logging.CRITICAL + 1
+
+# Settings tab option -> (logger name, level used while the category is enabled)
+LOG_CATEGORIES = {
+    "Startup/Shutdown Logs": ("domain_manager.startup", logging.INFO),
+    "Registry Access Logs": ("domain_manager.registry", logging.INFO),
+    "Success/Error Logs": ("domain_manager.results", logging.INFO),
+    "User Activity Logs": ("domain_manager.activity", logging.INFO),
+    "Configuration Changes": ("domain_manager.config", logging.INFO),
+    "Audit Logs": ("domain_manager.audit", logging.WARNING),
+    "Performance Logs": ("domain_manager.performance", logging.INFO),
+    "Security Logs": ("domain_manager.security", logging.WARNING)
+}
+
+# Nothing is written until start_logging is called; until then records are dropped without touching disk
+logging.getLogger(APP_LOGGER_NAME).addHandler(logging.NullHandler())
+
+_listener = None
+_queue_handler = None
+_logging_enabled = False
+_category_enabled = {category: True for category in LOG_CATEGORIES}
+_level_listeners = []
+
+def get_logger(category):
+    return logging.getLogger(LOG_CATEGORIES[category][0])
+
+def start_logging(enabled=True, categories=None, log_file=LOG_FILE):
+    global _listener, _queue_handler
+    if _listener is None:
+        # The GUI thread only enqueues records; a background thread formats them and writes the rotated files
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8', delay=True
+        )
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        log_queue = queue.SimpleQueue()
+        _queue_handler = logging.handlers.QueueHandler(log_queue)
+        app_logger = logging.getLogger(APP_LOGGER_NAME)
+        app_logger.addHandler(_queue_handler)
+        app_logger.propagate = False
+        _listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _listener.start()
+    configure(enabled, categories)
+
+def stop_logging():
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()  # Drains the queue before the writer thread exits
+        for handler in _listener.handlers:
+            handler.close()
+        logging.getLogger(APP_LOGGER_NAME).removeHandler(_queue_handler)
+        _listener = None
+        _queue_handler = None
+
+def configure(enabled, categories=None):
+    global _logging_enabled
+    _logging_enabled = bool(enabled)
+    if categories:
+        for category, category_enabled in categories.items():
+            if category in _category_enabled:
+                _category_enabled[category] = bool(category_enabled)
+    apply_levels()
+
+def set_logging_enabled(enabled):
+    configure(enabled)
+
+def set_category_enabled(category, enabled):
+    _category_enabled[category] = bool(enabled)
+    apply_levels()
+
+def add_level_listener(callback):
+    # Called now and after every level change, for features gated on a category (e.g. performance tracing)
+    _level_listeners.append(callback)
+    callback()
+
+def is_category_enabled(category):
+    return _logging_enabled and _category_enabled.get(category, False)
+
+def apply_levels():
+    # Disabled loggers get a level above CRITICAL, so logger calls in hot paths return after a cached level check
+    logging.getLogger(APP_LOGGER_NAME).setLevel(logging.INFO if _logging_enabled else DISABLED_LEVEL)
+    for category, (logger_name, level) in LOG_CATEGORIES.items():
+        logging.getLogger(logger_name).setLevel(level if is_category_enabled(category) else DISABLED_LEVEL)
+    for callback in _level_listeners:
+        callback()
+
+apply_levels()
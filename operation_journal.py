@@ -0,0 +1,207 @@
+# operation_journal.py
+
+# Standard library imports
+import itertools
+import json
+import os
+import threading
+import time
+
+# Local imports
+import logging_pipeline
+
+# Constants
+JOURNAL_FILE = 'operations.journal'
+FSYNC_EVERY_RECORDS = 16
+FSYNC_INTERVAL = 1.0  # Seconds; records are flushed to the OS immediately and fsynced in batches
+MAX_HISTORY = 100  # Undoable batches kept when the journal is compacted
+INVERSE_OPS = {'add': 'remove', 'remove': 'add'}
+MAX_INLINE_DOMAINS = 1000  # Larger batches are kept in a file of their own and read back only for undo and redo
+
+# Loggers
+audit_log = logging_pipeline.get_logger("Audit Logs")
+
+# The OperationJournal is an append-only JSON-lines file with one record per applied batch and one per undo/redo.
+# Replaying it on startup rebuilds the undo and redo stacks, so history survives restarts. Undo and redo hand the
+# whole inverse batch to apply_batch(op, domains), which issues a single backend call.
+# A batch larger than MAX_INLINE_DOMAINS is streamed to <journal>.batches/<id>.txt, one domain per line, and its
+# record and history entry carry only the file name and the count.
+class OperationJournal:
+    def __init__(self, path, apply_batch):
+        self.path = path
+        self.batch_dir = os.path.splitext(path)[0] + '.batches'
+        self.apply_batch = apply_batch
+        self.lock = threading.RLock()
+        self.undo_stack = []
+        self.redo_stack = []
+        self.next_id = 1
+        self.unsynced_records = 0
+        self.last_fsync = time.monotonic()
+        record_count = self.replay()
+        if record_count > MAX_HISTORY * 4:
+            self.compact()
+        self.journal_file = open(self.path, 'a', encoding='utf-8')
+
+    def replay(self):
+        record_count = 0
+        entries = {}
+        try:
+            with open(self.path, encoding='utf-8') as journal_file:
+                for line in journal_file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # A torn final line from a crash; everything before it is intact
+                    record_count += 1
+                    self.replay_record(record, entries)
+        except FileNotFoundError:
+            pass
+        return record_count
+
+    def replay_record(self, record, entries):
+        record_type = record.get('type')
+        if record_type == 'apply':
+            entry = {key: record[key] for key in ('id', 'op', 'domains', 'source', 'count') if key in record}
+            entry['label'] = record.get('label', '')
+            entries[entry['id']] = entry
+            self.undo_stack.append(entry)
+            self.redo_stack.clear()
+            self.next_id = max(self.next_id, entry['id'] + 1)
+        elif record_type == 'undo' and self.undo_stack and self.undo_stack[-1]['id'] == record['id']:
+            self.redo_stack.append(self.undo_stack.pop())
+        elif record_type == 'redo' and self.redo_stack and self.redo_stack[-1]['id'] == record['id']:
+            self.undo_stack.append(self.redo_stack.pop())
+
+    def compact(self):
+        # Rewrite the journal with only the history that is still reachable, oldest first
+        self.undo_stack = self.undo_stack[-MAX_HISTORY:]
+        self.redo_stack = self.redo_stack[-MAX_HISTORY:]
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as temp_file:
+            for entry in self.undo_stack:
+                temp_file.write(json.dumps(self.apply_record(entry)) + '\n')
+            for entry in reversed(self.redo_stack):
+                temp_file.write(json.dumps(self.apply_record(entry)) + '\n')
+            for entry in self.redo_stack:
+                temp_file.write(json.dumps({'type': 'undo', 'id': entry['id']}) + '\n')
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_path, self.path)
+        kept = {entry['source'] for entry in self.undo_stack + self.redo_stack if 'source' in entry}
+        if os.path.isdir(self.batch_dir):
+            for name in os.listdir(self.batch_dir):
+                if name not in kept:
+                    os.remove(os.path.join(self.batch_dir, name))
+
+    def apply_record(self, entry):
+        return {'type': 'apply', **entry}
+
+    def append(self, record):
+        record['ts'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.journal_file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self.journal_file.flush()
+        self.unsynced_records += 1
+        now = time.monotonic()
+        if self.unsynced_records >= FSYNC_EVERY_RECORDS or now - self.last_fsync >= FSYNC_INTERVAL:
+            self.sync()
+
+    def sync(self):
+        with self.lock:
+            if self.unsynced_records:
+                os.fsync(self.journal_file.fileno())
+                self.unsynced_records = 0
+                self.last_fsync = time.monotonic()
+
+    def record(self, op, domains, label=''):
+        # domains may be any iterable, such as a bulk job's changed domains read back from its progress file
+        with self.lock:
+            entry = {'id': self.next_id, 'op': op}
+            domains = iter(domains)
+            inline = list(itertools.islice(domains, MAX_INLINE_DOMAINS + 1))
+            if not inline:
+                return None
+            if len(inline) <= MAX_INLINE_DOMAINS:
+                entry['domains'] = inline
+            else:
+                entry['source'] = f"{entry['id']}.txt"
+                entry['count'] = self.write_batch(entry['source'], itertools.chain(inline, domains))
+            entry['label'] = label
+            self.next_id += 1
+            self.append(self.apply_record(entry))
+            self.undo_stack.append(entry)
+            self.redo_stack.clear()
+            audit_log.warning("Journaled %s of %d domain(s) as batch %d", op, entry_count(entry), entry['id'])
+            return entry
+
+    def write_batch(self, source, domains):
+        os.makedirs(self.batch_dir, exist_ok=True)
+        count = 0
+        with open(os.path.join(self.batch_dir, source), 'w', encoding='utf-8') as batch_file:
+            for domain in domains:
+                batch_file.write(domain + '\n')
+                count += 1
+            batch_file.flush()
+            os.fsync(batch_file.fileno())
+        return count
+
+    def entry_domains(self, entry):
+        if 'source' not in entry:
+            return entry['domains']
+        with open(os.path.join(self.batch_dir, entry['source']), encoding='utf-8') as batch_file:
+            return [line.rstrip('\n') for line in batch_file]
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def undo(self):
+        with self.lock:
+            if not self.undo_stack:
+                return "No actions to undo."
+            entry = self.undo_stack[-1]
+            try:
+                domains = self.entry_domains(entry)
+            except OSError as e:
+                return f"Undo failed: the domains of batch {entry['id']} could not be read: {e}"
+            result = self.apply_batch(INVERSE_OPS[entry['op']], domains)
+            if isinstance(result, str):
+                return f"Undo failed: {result}"
+            self.undo_stack.pop()
+            self.redo_stack.append(entry)
+            self.append({'type': 'undo', 'id': entry['id']})
+            audit_log.warning("Undid batch %d (%s of %d domain(s))", entry['id'], entry['op'], len(domains))
+            return f"Undo: {describe(entry, domains)}"
+
+    def redo(self):
+        with self.lock:
+            if not self.redo_stack:
+                return "No actions to redo."
+            entry = self.redo_stack[-1]
+            try:
+                domains = self.entry_domains(entry)
+            except OSError as e:
+                return f"Redo failed: the domains of batch {entry['id']} could not be read: {e}"
+            result = self.apply_batch(entry['op'], domains)
+            if isinstance(result, str):
+                return f"Redo failed: {result}"
+            self.redo_stack.pop()
+            self.undo_stack.append(entry)
+            self.append({'type': 'redo', 'id': entry['id']})
+            audit_log.warning("Redid batch %d (%s of %d domain(s))", entry['id'], entry['op'], len(domains))
+            return f"Redo: {describe(entry, domains)}"
+
+    def close(self):
+        with self.lock:
+            self.sync()
+            self.journal_file.close()
+
+def entry_count(entry):
+    return entry['count'] if 'source' in entry else len(entry['domains'])
+
+def describe(entry, domains):
+    verb = "added" if entry['op'] == 'add' else "removed"
+    count = len(domains)
+    subject = domains[0] if count == 1 else f"{count:,} domains"
+    return f"{subject} {verb}" + (f" ({entry['label']})" if entry['label'] else "")
@@ -0,0 +1,158 @@
+# perf_trace.py
+
+# Standard library imports
+import functools
+import json
+import math
+import os
+import threading
+import time
+
+# Local imports
+import logging_pipeline
+
+# Constants
+TRACE_DIR = 'traces'
+MAX_TRACE_EVENTS = 1_000_000  # Roughly 100 MB of trace JSON; later spans are counted but not kept
+
+# Loggers
+performance_log = logging_pipeline.get_logger("Performance Logs")
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set(self, **args):
+        pass
+
+NULL_SPAN = NullSpan()
+
+class Span:
+    __slots__ = ('tracer', 'name', 'args', 'start_ns')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer.record(self.name, self.start_ns, time.perf_counter_ns(), self.args)
+        return False
+
+    def set(self, **args):
+        self.args.update(args)
+
+# The Tracer records timing spans as Chrome trace events (chrome://tracing, Perfetto) while "Performance Logs" is enabled.
+# With tracing off, span() returns a shared no-op object, so instrumented code pays one attribute check per call.
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.dropped_events = 0
+        self.origin_ns = time.perf_counter_ns()
+        self.session_start = time.strftime('%Y%m%d_%H%M%S')
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def traced(self, name):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, name, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name, start_ns, end_ns, args):
+        if len(self.events) >= MAX_TRACE_EVENTS:
+            self.dropped_events += 1
+            return
+        # list.append is atomic, so worker threads can record without a lock
+        self.events.append((name, start_ns, end_ns, threading.get_ident(), args))
+
+    def summary(self):
+        durations = {}
+        for name, start_ns, end_ns, _, _ in self.events:
+            durations.setdefault(name, []).append((end_ns - start_ns) / 1e6)
+
+        summary = {}
+        for name, values in durations.items():
+            values.sort()
+            summary[name] = {
+                'count': len(values),
+                'p50_ms': percentile(values, 50),
+                'p95_ms': percentile(values, 95),
+                'max_ms': values[-1]
+            }
+        return summary
+
+    def to_chrome_trace(self):
+        pid = os.getpid()
+        trace_events = []
+        for name, start_ns, end_ns, thread_id, args in self.events:
+            event = {
+                'name': name,
+                'ph': 'X',
+                'ts': (start_ns - self.origin_ns) / 1000,
+                'dur': (end_ns - start_ns) / 1000,
+                'pid': pid,
+                'tid': thread_id
+            }
+            if args:
+                event['args'] = args
+            trace_events.append(event)
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def write_trace(self, path=None):
+        if path is None:
+            os.makedirs(TRACE_DIR, exist_ok=True)
+            path = os.path.join(TRACE_DIR, f"trace_{self.session_start}.json")
+        with open(path, 'w', encoding='utf-8') as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file, default=str)
+        return path
+
+    def end_session(self):
+        if not self.events:
+            return None
+        path = self.write_trace()
+        for name, stats in sorted(self.summary().items()):
+            performance_log.info(
+                "%s: n=%d p50=%.2f ms p95=%.2f ms max=%.2f ms",
+                name, stats['count'], stats['p50_ms'], stats['p95_ms'], stats['max_ms']
+            )
+        if self.dropped_events:
+            performance_log.warning("%d trace events were dropped after reaching the %d event limit", self.dropped_events, MAX_TRACE_EVENTS)
+        performance_log.info("Trace written to %s", path)
+        self.events = []
+        self.dropped_events = 0
+        return path
+
+def percentile(sorted_values, percent):
+    # Nearest-rank percentile over an already sorted list
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
+
+logging_pipeline.add_level_listener(lambda: tracer.set_enabled(logging_pipeline.is_category_enabled("Performance Logs")))
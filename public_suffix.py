@@ -0,0 +1,144 @@
+# public_suffix.py
+
+# Standard library imports
+import os
+import re
+import threading
+
+# Constants
+PSL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'public_suffix_list.dat')
+RULE = ''  # Key marking a node that ends a normal rule; no real label is empty
+EXCEPTION = '!'  # Key marking a node that ends an exception rule
+WILDCARD = '*'
+MAX_DOMAIN_LENGTH = 253
+LABEL = r'[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?'
+DOMAIN_PATTERN = re.compile(rf'(?:{LABEL}\.)+{LABEL}')
+PREFIX_PATTERN = re.compile(r'^(?:[a-zA-Z][a-zA-Z0-9+.-]*://)?(?:[^@/]*@)?(?:www\.)?')
+SUFFIX_PATTERN = re.compile(r'[/?#:].*$', re.DOTALL)
+
+# The PublicSuffixList compiles the rules of a Public Suffix List snapshot into a trie keyed by reversed labels.
+# Finding the public suffix of a name is one walk down that trie, O(labels). Only the ICANN section is used by
+# default: private suffixes such as blogspot.com are whole services that users may legitimately want to block.
+class PublicSuffixList:
+    def __init__(self, rules, include_private=False):
+        self.root = {}
+        self.rule_count = 0
+        in_private_section = False
+        for line in rules:
+            line = line.strip()
+            if line.startswith('// ===BEGIN PRIVATE DOMAINS==='):
+                in_private_section = True
+            if not line or line.startswith('//') or (in_private_section and not include_private):
+                continue
+            self.add_rule(line.split()[0])
+
+    @classmethod
+    def load(cls, path=PSL_FILE, include_private=False):
+        with open(path, encoding='utf-8') as rules_file:
+            return cls(rules_file, include_private)
+
+    def add_rule(self, rule):
+        exception = rule.startswith('!')
+        labels = [to_ascii_label(label) for label in rule.lstrip('!').lower().split('.')]
+        node = self.root
+        for label in reversed(labels):
+            node = node.setdefault(label, {})
+        node[EXCEPTION if exception else RULE] = True
+        self.rule_count += 1
+
+    def suffix_length(self, labels):
+        # labels are reversed (TLD first). Returns how many of them form the public suffix; unknown TLDs count as one.
+        node = self.root
+        length = 1
+        for index, label in enumerate(labels):
+            wildcard = node.get(WILDCARD)
+            if wildcard is not None and RULE in wildcard:
+                length = max(length, index + 1)
+            node = node.get(label)
+            if node is None:
+                break
+            if EXCEPTION in node:
+                return index  # An exception rule's suffix is the rule without its leftmost label
+            if RULE in node:
+                length = index + 1
+        return length
+
+    def is_known_tld(self, tld):
+        return tld in self.root
+
+    def public_suffix(self, domain):
+        labels = domain.lower().split('.')[::-1]
+        return '.'.join(reversed(labels[:self.suffix_length(labels)]))
+
+    def registrable_domain(self, domain):
+        # eTLD+1: the public suffix plus one label, or None when the name is itself a public suffix
+        labels = domain.lower().split('.')[::-1]
+        length = self.suffix_length(labels)
+        if len(labels) <= length:
+            return None
+        return '.'.join(reversed(labels[:length + 1]))
+
+    def is_public_suffix(self, domain):
+        labels = domain.lower().split('.')[::-1]
+        return len(labels) <= self.suffix_length(labels)
+
+def to_ascii_label(label):
+    # IDN labels are stored and compared in their punycode (xn--) form, as browsers canonicalize hosts
+    if label.isascii():
+        return label
+    return label.encode('idna').decode('ascii')
+
+def to_ascii_domain(domain):
+    if domain.isascii():
+        return domain.lower()
+    try:
+        return domain.encode('idna').decode('ascii').lower()
+    except UnicodeError as e:
+        raise ValueError(f"{domain} is not a valid internationalized domain name ({e})")
+
+def strip_url(value):
+    # Accepts pasted URLs: drops the scheme, credentials, a leading www., the port, path, query and fragment
+    value = PREFIX_PATTERN.sub('', value.strip(), count=1)
+    return SUFFIX_PATTERN.sub('', value).rstrip('.')
+
+def normalize_domain(value, suffix_list=None):
+    # Returns the lowercase ASCII form of a blockable host or raises ValueError explaining why it is not one
+    suffix_list = suffix_list or get_public_suffix_list()
+    host = strip_url(value)
+    if not host:
+        raise ValueError(f"{value}. No domain name found.")
+    domain = to_ascii_domain(host)
+    if len(domain) > MAX_DOMAIN_LENGTH:
+        raise ValueError(f"{value}. Domain names are limited to {MAX_DOMAIN_LENGTH} characters.")
+
+    if not DOMAIN_PATTERN.fullmatch(domain):
+        raise ValueError(f"{value}. Please use [subdomain.]domain.tld with letters, digits and inner hyphens.")
+    labels = domain.split('.')[::-1]
+    if not suffix_list.is_known_tld(labels[0]):
+        raise ValueError(f"{value}. '.{labels[0]}' is not a known top-level domain.")
+    if len(labels) <= suffix_list.suffix_length(labels):
+        raise ValueError(f"{value}. '{domain}' is a public suffix; blocking it would block every site registered under it.")
+    return domain
+
+def validate_domains(values, suffix_list=None):
+    # Batch form of normalize_domain: returns (valid domains, [(value, reason), ...]) with the list loaded once
+    suffix_list = suffix_list or get_public_suffix_list()
+    valid, invalid = [], []
+    for value in values:
+        try:
+            valid.append(normalize_domain(value, suffix_list))
+        except ValueError as e:
+            invalid.append((value, str(e)))
+    return valid, invalid
+
+_suffix_list = None
+_suffix_list_lock = threading.Lock()
+
+def get_public_suffix_list():
+    # The snapshot is compiled on first use and shared afterwards
+    global _suffix_list
+    if _suffix_list is None:
+        with _suffix_list_lock:
+            if _suffix_list is None:
+                _suffix_list = PublicSuffixList.load()
+    return _suffix_list
@@ -0,0 +1,114 @@
+# registry_watcher.py
+
+# Standard library imports
+import sys
+import threading
+
+# Local imports
+import logging_pipeline
+from simulated_registry import get_simulated_registry
+
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+    import winreg
+else:
+    winreg = None
+
+# Constants
+REGISTRY_KEY = r"SOFTWARE\Policies\BraveSoftware\Brave\URLBlocklist"
+POLL_INTERVAL = 2.0  # Seconds between fingerprint checks when change notifications are unavailable
+REG_NOTIFY_CHANGE_NAME = 0x1
+REG_NOTIFY_CHANGE_LAST_SET = 0x4
+WAIT_OBJECT_0 = 0
+
+# Loggers
+registry_log = logging_pipeline.get_logger("Registry Access Logs")
+
+def registry_fingerprint():
+    # A cheap summary of the URLBlocklist key that changes whenever a value is written: (value count, last write
+    # time). None when the key does not exist or cannot be read on this platform.
+    simulated_registry = get_simulated_registry()
+    if simulated_registry is not None:
+        return simulated_registry.fingerprint()
+    if winreg is None:
+        return None
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, REGISTRY_KEY) as key:
+            _, value_count, last_write = winreg.QueryInfoKey(key)
+    except OSError:
+        return None
+    return value_count, last_write
+
+def can_watch_registry():
+    return winreg is not None or get_simulated_registry() is not None
+
+# The RegistryWatcher notices edits made outside this process, such as Group Policy, another administrator or a second
+# instance, and calls on_change() from its own thread. On Windows it waits on RegNotifyChangeKeyValue; elsewhere, for
+# the simulated registry, or if the key cannot be watched, it polls registry_fingerprint(). A change is reported only
+# when the fingerprint differs from the last one seen, so callers can mark their own writes as seen.
+class RegistryWatcher:
+    def __init__(self, on_change, poll_interval=POLL_INTERVAL, use_notifications=None):
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        if use_notifications is None:
+            use_notifications = winreg is not None and get_simulated_registry() is None
+        self.use_notifications = use_notifications
+        self.fingerprint = None
+        self.stopping = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.fingerprint = registry_fingerprint()
+        self.thread = threading.Thread(target=self.run, name="RegistryWatcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join(self.poll_interval + 1)
+
+    def mark_seen(self):
+        # Called before fetching the list, so changes already included in that fetch are not reported again
+        self.fingerprint = registry_fingerprint()
+
+    def check(self):
+        fingerprint = registry_fingerprint()
+        if fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            registry_log.info("URLBlocklist changed outside the application")
+            self.on_change()
+
+    def run(self):
+        if self.use_notifications:
+            try:
+                self.notification_loop()
+            except OSError as e:
+                registry_log.warning("Registry change notifications unavailable, polling instead: %s", e)
+        self.poll_loop()
+
+    def poll_loop(self):
+        while not self.stopping.wait(self.poll_interval):
+            self.check()
+
+    def notification_loop(self):
+        # Returns when notifications stop working (the key is missing or was deleted); run() then falls back to polling
+        advapi32, kernel32 = ctypes.windll.advapi32, ctypes.windll.kernel32
+        advapi32.RegNotifyChangeKeyValue.argtypes = [wintypes.HANDLE, wintypes.BOOL, wintypes.DWORD, wintypes.HANDLE, wintypes.BOOL]
+        kernel32.CreateEventW.restype = wintypes.HANDLE
+        kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        event = kernel32.CreateEventW(None, False, False, None)
+        try:
+            # The key stays open while watching: closing it signals the event
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, REGISTRY_KEY, 0, winreg.KEY_NOTIFY | winreg.KEY_QUERY_VALUE) as key:
+                while not self.stopping.is_set():
+                    # Each registration reports one change and has to be renewed
+                    status = advapi32.RegNotifyChangeKeyValue(key.handle, False, REG_NOTIFY_CHANGE_NAME | REG_NOTIFY_CHANGE_LAST_SET, event, True)
+                    if status != 0:
+                        raise OSError(f"RegNotifyChangeKeyValue failed with error {status}")
+                    while kernel32.WaitForSingleObject(event, int(self.poll_interval * 1000)) != WAIT_OBJECT_0:
+                        if self.stopping.is_set():
+                            return
+                    self.check()
+        finally:
+            kernel32.CloseHandle(event)
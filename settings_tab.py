@@ -1,9 +1,5 @@
 # settings_tab.py
 
-# Standard library imports
-import configparser
-import logging
-
 # PyQt5 imports
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QCheckBox, QPushButton, QLabel, QGroupBox,
@@ -14,6 +10,8 @@ from PyQt5.QtGui import QIcon
 
 # Local imports
 from theme_manager import theme_manager
+import logging_pipeline
+from config_service import get_config
 
 # Constants
 ICON_SIZE = 25
@@ -21,10 +19,14 @@ FONT_SIZE = 12
 INFO_ICON_PATH = "icons/info-circle.svg"
 MESSAGE = "Press the apply changes button to save your changes."
 
+# Loggers
+config_log = logging_pipeline.get_logger("Configuration Changes")
+
 class SettingsTab(QWidget):
     def __init__(self, config_file, parent=None):
         super().__init__(parent)
         self.config_file = config_file
+        self.config = get_config(config_file)
         self.feedback_label = None  # Label for feedback message
         self.animated_once = False # Track if feedback has been animated
         self.setup_ui()
@@ -66,23 +68,14 @@ class SettingsTab(QWidget):
 
         self.logging_enabled_checkbox = QCheckBox("Enable Logging")
         self.logging_enabled_checkbox.setChecked(False)
-        self.logging_enabled_checkbox.stateChanged.connect(self.on_user_interaction)
+        self.logging_enabled_checkbox.stateChanged.connect(self.toggle_logging)
         logging_layout.addWidget(self.logging_enabled_checkbox)
 
-        self.log_options = {
-            "Startup/Shutdown Logs": QCheckBox("Startup/Shutdown Logs"),
-            "Registry Access Logs": QCheckBox("Registry Access Logs"),
-            "Success/Error Logs": QCheckBox("Success/Error Logs"),
-            "User Activity Logs": QCheckBox("User Activity Logs"),
-            "Configuration Changes": QCheckBox("Configuration Changes"),
-            "Audit Logs": QCheckBox("Audit Logs"),
-            "Performance Logs": QCheckBox("Performance Logs"),
-            "Security Logs": QCheckBox("Security Logs")
-        }
+        self.log_options = {key: QCheckBox(key) for key in logging_pipeline.LOG_CATEGORIES}
 
         for key, checkbox in self.log_options.items():
             checkbox.setChecked(False)
-            checkbox.stateChanged.connect(self.on_user_interaction)
+            checkbox.stateChanged.connect(lambda state, key=key: self.change_log_type(state, key))
             logging_layout.addWidget(checkbox)
 
         group_box_container_layout.addWidget(logging_group_box)
@@ -106,6 +99,17 @@ class SettingsTab(QWidget):
 
         group_box_container_layout.addWidget(theme_group_box)
 
+        # GroupBox for Import options
+        import_group_box = QGroupBox("Import")
+        import_group_box.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
+        import_layout = QVBoxLayout(import_group_box)
+
+        self.minimize_on_import_checkbox = QCheckBox("Drop entries already covered by a parent domain when loading a file")
+        self.minimize_on_import_checkbox.stateChanged.connect(self.on_user_interaction)
+        import_layout.addWidget(self.minimize_on_import_checkbox)
+
+        group_box_container_layout.addWidget(import_group_box)
+
         # Apply Changes button
         self.apply_changes_button = QPushButton("Apply Changes")
         self.apply_changes_button.clicked.connect(self.apply_changes)
@@ -154,30 +158,18 @@ class SettingsTab(QWidget):
 
     def apply_changes(self):
         selected_theme = self.dark_theme_checkbox.isChecked()
-        config = configparser.ConfigParser()
-        config.read(self.config_file)
-        
-        if not config.has_section('Theme'):
-            config.add_section('Theme')
-        
-        config.set('Theme', 'theme', str(selected_theme))
-
-        if not config.has_section('Logging'):
-            config.add_section('Logging')
-
-        config.set('Logging', 'logging', str(self.logging_enabled_checkbox.isChecked()))
-        for key, checkbox in self.log_options.items():
-            config.set('Logging', key, str(checkbox.isChecked()))
-
-        with open(self.config_file, 'w') as configfile:
-            config.write(configfile)
-        
-        logging.info(f"Settings have been saved.")
+        with self.config.batch():  # All settings are written with a single flush
+            self.config.set('Theme', 'theme', selected_theme)
+            self.config.set('Logging', 'logging', self.logging_enabled_checkbox.isChecked())
+            for key, checkbox in self.log_options.items():
+                self.config.set('Logging', key, checkbox.isChecked())
+            self.config.set('Import', 'minimize_on_import', self.minimize_on_import_checkbox.isChecked())
+
+        config_log.info("Settings have been saved.")
         self.load_preferences()  # Update the UI to reflect changes
 
     def load_preferences(self):
-        config = configparser.ConfigParser()
-        config.read(self.config_file)
+        config = self.config
 
         # Load theme preference from config
         theme = config.getboolean('Theme', 'theme', fallback=False)
@@ -190,10 +182,12 @@ class SettingsTab(QWidget):
         logging_enabled = config.getboolean('Logging', 'logging', fallback=False)
         self.logging_enabled_checkbox.setChecked(logging_enabled)
         for key, checkbox in self.log_options.items():
-            enabled = config.getboolean('Logging', key, fallback=False)
+            enabled = config.getboolean('Logging', key, fallback=True)
             checkbox.setChecked(enabled)
             checkbox.setEnabled(logging_enabled)
 
+        self.minimize_on_import_checkbox.setChecked(config.getboolean('Import', 'minimize_on_import', fallback=False))
+
         self.feedback_container.setVisible(False)  # Ensure feedback is hidden initially
         self.animated_once = False  # Reset the animation flag
 
@@ -203,28 +197,18 @@ class SettingsTab(QWidget):
             checkbox.setEnabled(enable)
 
         if enable:
-            logging.disable(logging.NOTSET)
-            logging.info('Logging enabled')
+            logging_pipeline.set_logging_enabled(True)
+            config_log.info('Logging enabled')
         else:
-            logging.disable(logging.CRITICAL)
-            logging.info('Logging disabled')
+            config_log.info('Logging disabled')
+            logging_pipeline.set_logging_enabled(False)
+        self.on_user_interaction()
 
     def change_log_type(self, state, key):
-        log_types = {
-            "Startup/Shutdown Logs": logging.INFO,
-            "Registry Access Logs": logging.INFO,
-            "Success/Error Logs": logging.INFO,
-            "User Activity Logs": logging.INFO,
-            "Configuration Changes": logging.INFO,
-            "Audit Logs": logging.WARNING,
-            "Performance Logs": logging.INFO,
-            "Security Logs": logging.WARNING
-        }
-
         if state == Qt.Checked:
-            logging.getLogger(key).setLevel(log_types[key])
-            logging.info(f'{key} logging enabled')
+            logging_pipeline.set_category_enabled(key, True)
+            config_log.info('%s logging enabled', key)
         else:
-            logging.getLogger(key).setLevel(logging.CRITICAL + 1)
-            logging.info(f'{key} logging disabled')
+            config_log.info('%s logging disabled', key)
+            logging_pipeline.set_category_enabled(key, False)
         self.on_user_interaction()
\ No newline at end of file
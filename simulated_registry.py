@@ -0,0 +1,152 @@
+# simulated_registry.py
+
+# Standard library imports
+import json
+import os
+import tempfile
+import threading
+
+# Constants
+SIMULATED_REGISTRY_ENV = 'BDM_SIMULATED_REGISTRY'
+REGISTRY_PATH = r"HKLM:\SOFTWARE\Policies\BraveSoftware\Brave\URLBlocklist"
+
+# The SimulatedRegistry stands in for Manage-DomainsInRegistry.ps1 when BDM_SIMULATED_REGISTRY points to a JSON file.
+# It keeps the URLBlocklist values as {"name": "domain"} and answers each action with the same output as the script,
+# so the application and its tests can run on machines without PowerShell or HKLM access.
+class SimulatedRegistry:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as registry_file:
+                return json.load(registry_file)
+        except FileNotFoundError:
+            return {}
+
+    def save(self, values):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(prefix='.registry-', suffix='.tmp', dir=directory)
+        with os.fdopen(fd, 'w', encoding='utf-8') as temp_file:
+            json.dump(values, temp_file)
+        os.replace(temp_path, self.path)
+
+    def fingerprint(self):
+        # Stands in for the key's value count and last write time: every save replaces the file
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+    def run(self, action, *args):
+        with self.lock:
+            handler = self.ACTIONS.get(action)
+            if handler is None:
+                return "Invalid action parameter. Please provide a valid action."
+            return handler(self, *args)
+
+    def fetch(self, output_format="values"):
+        values = self.load()
+        return json.dumps(list(values.values()), separators=(',', ':'))
+
+    def add(self, domain=None):
+        if not domain:
+            return ""
+        values = self.load()
+        if domain.lower() in (value.lower() for value in values.values()):
+            return f"Domain '{domain}' already exists in the registry."
+        values[next_available_name(values)] = domain
+        self.save(values)
+        return f"Adding domain '{domain}' to the registry...\nDomain '{domain}' added successfully to the registry."
+
+    def remove(self, domain=None):
+        if not domain:
+            return "No index provided to remove domain."
+        values = self.load()
+        for name, value in values.items():
+            if value == domain:
+                del values[name]
+                self.save(values)
+                return f"Domain '{domain}' removed successfully from the registry."
+        return f"Domain '{domain}' not found in registry for removal."
+
+    def check_brave(self):
+        return "Brave is installed on this system."
+
+    def check_registry_path(self):
+        if os.path.exists(self.path):
+            return f"Registry path found: {REGISTRY_PATH} (simulated by {self.path})"
+        return "Registry path not found. You can add the directory to the registry by adding a domain using the interface."
+
+    def add_batch(self, list_path):
+        values = self.load()
+        existing = {value.lower() for value in values.values()}
+        used_names = {int(name) for name in values if name.isdigit()}
+        added, skipped = [], []
+        next_name = 1
+        for domain in read_domain_list(list_path):
+            if domain.lower() in existing:
+                skipped.append(domain)
+                continue
+            while next_name in used_names:
+                next_name += 1
+            values[str(next_name)] = domain
+            used_names.add(next_name)
+            existing.add(domain.lower())
+            added.append(domain)
+        if added:
+            self.save(values)
+        return json.dumps({'added': added, 'skipped': skipped}, separators=(',', ':'))
+
+    def remove_batch(self, list_path):
+        values = self.load()
+        names_by_value = {}
+        for name, value in values.items():
+            names_by_value.setdefault(value.lower(), []).append(name)
+        removed, missing = [], []
+        for domain in read_domain_list(list_path):
+            names = names_by_value.pop(domain.lower(), None)
+            if names is None:
+                missing.append(domain)
+                continue
+            for name in names:
+                del values[name]
+            removed.append(domain)
+        if removed:
+            self.save(values)
+        return json.dumps({'removed': removed, 'missing': missing}, separators=(',', ':'))
+
+    ACTIONS = {
+        "1": fetch,
+        "2": add,
+        "3": remove,
+        "4": check_brave,
+        "5": check_registry_path,
+        "8": add_batch,
+        "9": remove_batch
+    }
+
+def next_available_name(values):
+    used_names = {int(name) for name in values if name.isdigit()}
+    name = 1
+    while name in used_names:
+        name += 1
+    return str(name)
+
+def read_domain_list(list_path):
+    with open(list_path, encoding='utf-8-sig') as list_file:
+        return [line.strip() for line in list_file if line.strip()]
+
+_registries = {}
+
+def get_simulated_registry():
+    # Returns None unless the simulated backend has been selected through the environment
+    path = os.environ.get(SIMULATED_REGISTRY_ENV)
+    if not path:
+        return None
+    registry = _registries.get(path)
+    if registry is None:
+        registry = _registries[path] = SimulatedRegistry(path)
+    return registry
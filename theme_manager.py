@@ -1,7 +1,10 @@
 # theme_manager.py
 
+# Standard library imports
+import time
+
 # PyQt5 imports
-from PyQt5.QtGui import QColor, QIcon, QPixmap, QPainter, QFont
+from PyQt5.QtGui import QColor, QIcon, QPixmap, QPainter, QFont, QGuiApplication
 from PyQt5.QtCore import QSize, Qt
 from PyQt5.QtSvg import QSvgRenderer
 
@@ -20,30 +23,55 @@ class ThemeManager:
     FADE_OUT_DURATION = 200
     CLICK_DURATION = 100
 
+    STYLESHEET_BUILDERS = {
+        "main": "get_main_stylesheet",
+        "prompt": "get_prompt_stylesheet",
+        "title_bar": "get_title_bar_stylesheet",
+        "overlay": "get_overlay_stylesheet"
+    }
+
     def __init__(self):
         self.theme = False  # Default theme is light
         self.stylesheets = {}
+        self.applied_theme = None  # Theme last passed to qdarktheme, None until the first apply
+        self.last_apply_ms = 0.0
+        self._stylesheet_cache = {}  # (theme, key) -> stylesheet string
+        self._icon_cache = {}  # (path, color, width, height, device_pixel_ratio) -> QPixmap
 
     def apply_theme(self, widget=None, stylesheet_key="main", theme=None, title_bar=None):
+        start = time.perf_counter()
         if theme is not None:
             self.theme = theme
-        qdarktheme.setup_theme("dark" if self.theme else "light")
+        if self.applied_theme != self.theme:
+            qdarktheme.setup_theme("dark" if self.theme else "light")
+            self.applied_theme = self.theme
         self.generate_stylesheets()
 
         if widget is not None:
-            widget.setStyleSheet(self.stylesheets[stylesheet_key])
+            self.set_stylesheet(widget, self.stylesheets[stylesheet_key])
 
         if title_bar is not None:
-            title_bar.setStyleSheet(self.stylesheets["title_bar"])
+            self.set_stylesheet(title_bar, self.stylesheets["title_bar"])
             self.update_title_bar_buttons(title_bar)
 
+        self.last_apply_ms = (time.perf_counter() - start) * 1000
+        return self.last_apply_ms
+
     def generate_stylesheets(self):
-        self.stylesheets = {
-            "main": self.get_main_stylesheet(),
-            "prompt": self.get_prompt_stylesheet(),
-            "title_bar": self.get_title_bar_stylesheet(),
-            "overlay": self.get_overlay_stylesheet()
-        }
+        self.stylesheets = {key: self.get_stylesheet(key) for key in self.STYLESHEET_BUILDERS}
+
+    def set_stylesheet(self, widget, stylesheet):
+        # setStyleSheet re-polishes the widget tree even when the text is unchanged
+        if widget.styleSheet() != stylesheet:
+            widget.setStyleSheet(stylesheet)
+
+    def get_stylesheet(self, key):
+        cache_key = (self.theme, key)
+        stylesheet = self._stylesheet_cache.get(cache_key)
+        if stylesheet is None:
+            stylesheet = getattr(self, self.STYLESHEET_BUILDERS[key])()
+            self._stylesheet_cache[cache_key] = stylesheet
+        return stylesheet
 
     def get_main_stylesheet(self):
         placeholder_color = "#CCCCCC" if self.theme else "#666666"
@@ -152,23 +180,39 @@ class ThemeManager:
     def get_icon_fill_color(self):
         return "#FFFFFF" if self.theme else "#000000"
 
-    def update_icon(self, icon_path):
+    def get_device_pixel_ratio(self):
+        app = QGuiApplication.instance()
+        return app.devicePixelRatio() if app is not None else 1.0
+
+    def render_icon_pixmap(self, icon_path, fill_color, size, device_pixel_ratio):
+        cache_key = (icon_path, fill_color, size.width(), size.height(), device_pixel_ratio)
+        image = self._icon_cache.get(cache_key)
+        if image is None:
+            # Rasterise at device resolution so the icon stays sharp on high-DPI screens
+            renderer = QSvgRenderer(icon_path)
+            image = QPixmap(size * device_pixel_ratio)
+            image.setDevicePixelRatio(device_pixel_ratio)
+            image.fill(Qt.transparent)
+            painter = QPainter(image)
+            renderer.render(painter)
+            painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
+            painter.fillRect(image.rect(), QColor(fill_color))
+            painter.end()
+            self._icon_cache[cache_key] = image
+        return image
+
+    def update_icon(self, icon_path, device_pixel_ratio=None):
+        if device_pixel_ratio is None:
+            device_pixel_ratio = self.get_device_pixel_ratio()
         fill_color = self.get_icon_fill_color()
-        renderer = QSvgRenderer(icon_path)
-        image = QPixmap(self.ICON_SIZE)
-        image.fill(Qt.transparent)
-        painter = QPainter(image)
-        renderer.render(painter)
-        painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
-        painter.fillRect(image.rect(), QColor(fill_color))
-        painter.end()
-        return QIcon(image)
+        return QIcon(self.render_icon_pixmap(icon_path, fill_color, self.ICON_SIZE, device_pixel_ratio))
 
     def update_title_bar_buttons(self, title_bar):
-        title_bar.btn_minimize.setIcon(self.update_icon('icons/dash-lg.svg'))
-        title_bar.btn_maximize.setIcon(self.update_icon('icons/fullscreen.svg'))
-        title_bar.btn_restore.setIcon(self.update_icon('icons/fullscreen-exit.svg'))
-        title_bar.btn_close.setIcon(self.update_icon('icons/x-lg.svg'))
+        device_pixel_ratio = title_bar.devicePixelRatioF()
+        title_bar.btn_minimize.setIcon(self.update_icon('icons/dash-lg.svg', device_pixel_ratio))
+        title_bar.btn_maximize.setIcon(self.update_icon('icons/fullscreen.svg', device_pixel_ratio))
+        title_bar.btn_restore.setIcon(self.update_icon('icons/fullscreen-exit.svg', device_pixel_ratio))
+        title_bar.btn_close.setIcon(self.update_icon('icons/x-lg.svg', device_pixel_ratio))
 
         colors = self.get_title_bar_colors()
         title_bar.btn_minimize.update_button_colors(colors)
@@ -0,0 +1,203 @@
+# url_policy.py
+
+# Standard library imports
+import re
+from functools import lru_cache
+from urllib.parse import parse_qsl
+
+# Local imports
+from public_suffix import to_ascii_domain
+
+# Constants
+WILDCARD = '*'
+DEFAULT_PORTS = {'http': 80, 'https': 443, 'ws': 80, 'wss': 443, 'ftp': 21}
+HOST_CACHE_SIZE = 65536  # Hosts whose trie walk is remembered; logs repeat the same hosts over and over
+URL_PATTERN = re.compile(r'([a-zA-Z][a-zA-Z0-9+.-]*)://([^/?#]*)([^?#]*)(?:\?([^#]*))?')
+HOST_RULES = object()  # Key of the PathTable in a trie node, which no label can equal
+IP_ADDRESS_PATTERN = re.compile(r'^(\d{1,3}(\.\d{1,3}){3}|[0-9a-f:.]*:[0-9a-f:.]*)$')
+
+# One URLBlocklist entry, parsed from Brave's filter format [scheme://][.]host[:port][/path][?query]. A scheme, port
+# or query left out (or given as *) matches any; the path matches as a prefix; a leading dot on the host turns off
+# the subdomain matching every other host entry gets.
+class PolicyRule:
+    __slots__ = ('entry', 'scheme', 'host', 'port', 'path', 'query', 'exact')
+
+    def __init__(self, entry, scheme, host, port, path, query, exact):
+        self.entry = entry
+        self.scheme = scheme
+        self.host = host  # None for entries that match every host
+        self.port = port
+        self.path = path
+        self.query = query  # ((key, value or None for any value), ...)
+        self.exact = exact
+
+    @property
+    def specificity(self):
+        return (self.scheme is not None) + (self.port is not None) + len(self.query)
+
+    def applies(self, scheme, port, query):
+        # The host and path were matched by the trie walk and the path table
+        if self.scheme is not None and self.scheme != scheme:
+            return False
+        if self.port is not None and self.port != port:
+            return False
+        if self.query:
+            pairs = parse_qsl(query, keep_blank_values=True)
+            return all(any(key == rule_key and value in (None, pair_value) for key, pair_value in pairs) for rule_key, value in self.query)
+        return True
+
+# The rules listed for one host, keyed by path prefix. A lookup probes one dict per distinct prefix length, longest
+# first, instead of testing every rule against the path.
+class PathTable:
+    def __init__(self):
+        self.rules = {}  # path prefix -> [PolicyRule, ...], most specific first
+        self.lengths = []  # distinct prefix lengths, longest first
+
+    def add(self, rule):
+        rules = self.rules.setdefault(rule.path, [])
+        rules.append(rule)
+        rules.sort(key=lambda listed: -listed.specificity)
+        if len(rule.path) not in self.lengths:
+            self.lengths = sorted(self.lengths + [len(rule.path)], reverse=True)
+
+    def lookup(self, path):
+        for length in self.lengths:
+            if length <= len(path):
+                yield from self.rules.get(path[:length], ())
+
+def is_ip_address(host):
+    return bool(IP_ADDRESS_PATTERN.match(host))
+
+def host_labels(host):
+    # IP addresses are a single label: they are never matched by subdomain
+    return [host] if is_ip_address(host) else host.split('.')[::-1]
+
+def normalize_host(host):
+    host = host.lower().rstrip('.')
+    if host.startswith('[') and host.endswith(']'):
+        host = host[1:-1]
+    return host if is_ip_address(host) else to_ascii_domain(host)
+
+def split_host_port(text):
+    # Returns (host, port text); IPv6 hosts keep their brackets
+    if text.startswith('['):
+        host, _, port_text = text.partition(']')
+        return host + ']', port_text[1:]
+    host, _, port_text = text.partition(':')
+    return host, port_text
+
+def parse_port(port_text, value):
+    if port_text.isdigit() and 0 < int(port_text) < 65536:
+        return int(port_text)
+    raise ValueError(f"{value}. '{port_text}' is not a port.")
+
+def parse_entry(entry):
+    # Returns the PolicyRule for a block list entry or raises ValueError
+    text = entry.strip()
+    scheme = None
+    if '://' in text:
+        scheme, text = text.split('://', 1)
+        scheme = None if scheme == WILDCARD else scheme.lower()
+    text, _, query_text = text.partition('?')
+    host, slash, path = text.partition('/')
+    path = (slash + path).rstrip(WILDCARD)
+
+    exact = host.startswith('.')
+    host, port_text = split_host_port(host[1:] if exact else host)
+    port = None if port_text in ('', WILDCARD) else parse_port(port_text, entry)
+    if host == WILDCARD or (not host and scheme):
+        host = None
+    elif not host:
+        raise ValueError(f"{entry}. No host found.")
+    else:
+        host = normalize_host(host)
+        if WILDCARD in host:
+            raise ValueError(f"{entry}. '*' is only supported as the whole host.")
+        if '' in host.split('.'):
+            raise ValueError(f"{entry}. The host has an empty label.")
+
+    query = tuple(
+        (key, value if separator and value != WILDCARD else None)
+        for key, separator, value in (part.partition('=') for part in query_text.split('&') if part)
+    )
+    return PolicyRule(entry, scheme, host, port, path, query, exact)
+
+@lru_cache(maxsize=HOST_CACHE_SIZE)
+def parse_authority(scheme, authority):
+    # Returns (host, port) of a URL's user@host:port part; cached, since a log names the same few hosts many times
+    host, port_text = split_host_port(authority.rpartition('@')[2])
+    host = normalize_host(host)
+    if not host and scheme != 'file':
+        raise ValueError(f"{scheme}://{authority}. No host found.")
+    return host, parse_port(port_text, authority) if port_text else DEFAULT_PORTS.get(scheme)
+
+def split_url(url):
+    # Returns (scheme, host, port, path, query) of a URL; one without a scheme is taken as http. This is a plain
+    # split rather than urllib's, which made up most of the time of a batch check.
+    url = url.strip()
+    scheme, authority, path, query = (URL_PATTERN.match(url) or URL_PATTERN.match('http://' + url)).groups()
+    scheme = scheme.lower()
+    host, port = parse_authority(scheme, authority)
+    return scheme, host, port, path or '/', query or ''
+
+# The UrlPolicy answers "is this URL blocked, and by which entry?" for a compiled block list. Host entries sit in a
+# trie of reversed labels, like domain_index.SuffixTrie, with a PathTable at each listed host. As in Chromium's
+# URLBlocklist, the entry with the longest matching host wins, then the one with the longest path.
+class UrlPolicy:
+    def __init__(self, entries=()):
+        self.root = {}
+        self.any_host = PathTable()  # Entries such as * or https://*
+        self.size = 0
+        self.invalid = []  # (entry, reason) for entries that are not valid filters
+        self.host_cache = {}
+        for entry in entries:
+            self.add(entry)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, entry):
+        try:
+            rule = parse_entry(entry)
+        except ValueError as e:
+            self.invalid.append((entry, str(e)))
+            return False
+        if rule.host is None:
+            self.any_host.add(rule)
+        else:
+            node = self.root
+            for label in host_labels(rule.host):
+                node = node.setdefault(label, {})
+            node.setdefault(HOST_RULES, PathTable()).add(rule)
+        self.size += 1
+        self.host_cache.clear()
+        return True
+
+    def host_tables(self, host):
+        # Returns [(PathTable, whether it is the host itself), ...] from the longest listed host to the wildcard entries
+        tables = self.host_cache.get(host)
+        if tables is None:
+            tables = []
+            node = self.root
+            labels = host_labels(host) if host else []
+            for depth, label in enumerate(labels, 1):
+                node = node.get(label)
+                if node is None:
+                    break
+                if HOST_RULES in node:
+                    tables.append((node[HOST_RULES], depth == len(labels)))
+            tables.reverse()
+            tables.append((self.any_host, True))
+            if len(self.host_cache) >= HOST_CACHE_SIZE:
+                self.host_cache.clear()
+            self.host_cache[host] = tables
+        return tables
+
+    def match(self, url):
+        # Returns the entry that blocks the URL, or None; raises ValueError for something that is not a URL
+        scheme, host, port, path, query = split_url(url)
+        for table, is_host in self.host_tables(host):
+            for rule in table.lookup(path):
+                if (is_host or not rule.exact) and rule.applies(scheme, port, query):
+                    return rule.entry
+        return None